@@ -0,0 +1,57 @@
+"""Add split_matrix column
+
+Revision ID: 7c3e91d0a4b2
+Revises: f25af9eab8c3
+Create Date: 2026-10-18 11:30:12.408153
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from src.database.split_matrix import encode_split_matrix
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e91d0a4b2'
+down_revision: Union[str, None] = 'f25af9eab8c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 100
+
+events = sa.table(
+    'events',
+    sa.column('id', sa.UUID()),
+    sa.column('splits', postgresql.JSONB()),
+    sa.column('results', postgresql.JSONB()),
+    sa.column('split_matrix', postgresql.BYTEA()),
+)
+
+
+def upgrade() -> None:
+    op.add_column('events', sa.Column('split_matrix', postgresql.BYTEA(), nullable=True))
+
+    # Backfill existing events in batches of BATCH_SIZE rows, walking the primary key
+    connection = op.get_bind()
+    last_id = None
+    while True:
+        stmt = sa.select(events.c.id, events.c.splits, events.c.results) \
+            .where(events.c.split_matrix.is_(None)) \
+            .order_by(events.c.id) \
+            .limit(BATCH_SIZE)
+        if last_id is not None:
+            stmt = stmt.where(events.c.id > last_id)
+        rows = connection.execute(stmt).all()
+        if not rows:
+            break
+        connection.execute(
+            events.update().where(events.c.id == sa.bindparam('event_id')),
+            [{'event_id': row.id, 'split_matrix': encode_split_matrix(row.splits, row.results)} for row in rows],
+        )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    op.drop_column('events', 'split_matrix')
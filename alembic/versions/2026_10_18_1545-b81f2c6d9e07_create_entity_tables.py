@@ -0,0 +1,120 @@
+"""Create groups, courses, legs, runners and splits tables
+
+Revision ID: b81f2c6d9e07
+Revises: 7c3e91d0a4b2
+Create Date: 2026-10-18 15:45:37.120664
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from src.database.event_entities import event_entity_rows, ENTITY_TABLES
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81f2c6d9e07'
+down_revision: Union[str, None] = '7c3e91d0a4b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 20
+
+events = sa.table(
+    'events',
+    sa.column('id', sa.UUID()),
+    sa.column('splits', postgresql.JSONB()),
+    sa.column('results', postgresql.JSONB()),
+    sa.column('courses', postgresql.JSONB()),
+    sa.column('groups', postgresql.JSONB()),
+    sa.column('runners', postgresql.JSONB()),
+    sa.column('legs', postgresql.JSONB()),
+)
+
+
+def upgrade() -> None:
+    tables = {}
+    tables['groups'] = op.create_table('groups',
+    sa.Column('event', sa.UUID(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.ForeignKeyConstraint(['event'], ['events.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_groups_event', 'groups', ['event'], unique=False)
+    tables['courses'] = op.create_table('courses',
+    sa.Column('event', sa.UUID(), nullable=False),
+    sa.Column('points', postgresql.JSONB(astext_type=sa.Text()), server_default='{}', nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.ForeignKeyConstraint(['event'], ['events.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_courses_event', 'courses', ['event'], unique=False)
+    tables['legs'] = op.create_table('legs',
+    sa.Column('event', sa.UUID(), nullable=False),
+    sa.Column('start', sa.Integer(), nullable=False),
+    sa.Column('end', sa.Integer(), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.ForeignKeyConstraint(['event'], ['events.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_legs_event', 'legs', ['event'], unique=False)
+    tables['runners'] = op.create_table('runners',
+    sa.Column('event', sa.UUID(), nullable=False),
+    sa.Column('group', sa.UUID(), nullable=False),
+    sa.Column('course', sa.UUID(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('result', sa.Integer(), nullable=True),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.ForeignKeyConstraint(['event'], ['events.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['group'], ['groups.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['course'], ['courses.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_runners_event_group', 'runners', ['event', 'group'], unique=False)
+    op.create_index('ix_runners_event_course', 'runners', ['event', 'course'], unique=False)
+    tables['splits'] = op.create_table('splits',
+    sa.Column('runner', sa.UUID(), nullable=False),
+    sa.Column('leg', sa.UUID(), nullable=False),
+    sa.Column('time', sa.Integer(), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.ForeignKeyConstraint(['runner'], ['runners.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['leg'], ['legs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_splits_leg_time', 'splits', ['leg', 'time'], unique=False)
+    op.create_index('ix_splits_runner', 'splits', ['runner'], unique=False)
+
+    # Backfill the tables from the JSON columns, BATCH_SIZE events at a time
+    connection = op.get_bind()
+    last_id = None
+    while True:
+        stmt = sa.select(events).order_by(events.c.id).limit(BATCH_SIZE)
+        if last_id is not None:
+            stmt = stmt.where(events.c.id > last_id)
+        rows = connection.execute(stmt).all()
+        if not rows:
+            break
+        for row in rows:
+            entities = event_entity_rows(row.id, row.splits, row.results, row.courses, row.groups, row.runners,
+                                         row.legs)
+            for table in ENTITY_TABLES:
+                if entities[table]:
+                    connection.execute(tables[table].insert(), entities[table])
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    op.drop_index('ix_splits_runner', table_name='splits')
+    op.drop_index('ix_splits_leg_time', table_name='splits')
+    op.drop_table('splits')
+    op.drop_index('ix_runners_event_course', table_name='runners')
+    op.drop_index('ix_runners_event_group', table_name='runners')
+    op.drop_table('runners')
+    op.drop_index('ix_legs_event', table_name='legs')
+    op.drop_table('legs')
+    op.drop_index('ix_courses_event', table_name='courses')
+    op.drop_table('courses')
+    op.drop_index('ix_groups_event', table_name='groups')
+    op.drop_table('groups')
@@ -0,0 +1,26 @@
+"""Add events date index
+
+Revision ID: d4a07e5b3c19
+Revises: b81f2c6d9e07
+Create Date: 2026-10-18 17:10:05.631482
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a07e5b3c19'
+down_revision: Union[str, None] = 'b81f2c6d9e07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_events_date_id', 'events', ['date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_events_date_id', table_name='events')
@@ -0,0 +1,56 @@
+"""Add events source unique index
+
+Revision ID: 5e2b8f47a1c6
+Revises: d4a07e5b3c19
+Create Date: 2026-10-18 18:40:51.274019
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2b8f47a1c6'
+down_revision: Union[str, None] = 'd4a07e5b3c19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Duplicate imports of a source: every event but the first one imported.
+# Sources are normalized first (see normalize_source), so `url#a` and `url#b` are one source.
+DUPLICATES = """
+    SELECT id, first_value(id) OVER (PARTITION BY source ORDER BY date, id) AS keep
+    FROM events
+"""
+
+
+def upgrade() -> None:
+    # Events were stored with the source as given, the fragment included
+    op.execute(sa.text("UPDATE events SET source = split_part(source, '#', 1) WHERE source LIKE '%#%'"))
+    # Tracks of duplicates move to the runner of the kept event with the same group and runner name
+    op.execute(sa.text(f"""
+        UPDATE tracks SET event = duplicates.keep, runner = kept.id
+        FROM ({DUPLICATES}) AS duplicates,
+             runners AS old JOIN groups AS old_group ON old_group.id = old."group",
+             runners AS kept JOIN groups AS kept_group ON kept_group.id = kept."group"
+        WHERE tracks.event = duplicates.id AND duplicates.id <> duplicates.keep
+          AND old.id = tracks.runner
+          AND kept.event = duplicates.keep AND kept.name = old.name AND kept_group.name = old_group.name
+    """))
+    # Tracks that match no runner of the kept event are dropped, then the duplicates with their entities
+    op.execute(sa.text(f"""
+        DELETE FROM tracks
+        USING ({DUPLICATES}) AS duplicates
+        WHERE tracks.event = duplicates.id AND duplicates.id <> duplicates.keep
+    """))
+    op.execute(sa.text(f"""
+        DELETE FROM events
+        USING ({DUPLICATES}) AS duplicates
+        WHERE events.id = duplicates.id AND duplicates.id <> duplicates.keep
+    """))
+    op.create_index('ux_events_source', 'events', ['source'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ux_events_source', table_name='events')
@@ -0,0 +1,90 @@
+"""Encode track points
+
+Revision ID: 9a6d3f1e8b24
+Revises: 5e2b8f47a1c6
+Create Date: 2026-10-18 20:15:44.902318
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import numpy as np
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from src.database.track_points import encode_track_points, decode_track_points
+
+# revision identifiers, used by Alembic.
+revision: str = '9a6d3f1e8b24'
+down_revision: Union[str, None] = '5e2b8f47a1c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 20
+TIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+tracks = sa.table(
+    'tracks',
+    sa.column('id', sa.UUID()),
+    sa.column('points', postgresql.JSONB()),
+    sa.column('points_data', postgresql.BYTEA()),
+)
+
+
+def batches(connection, *columns):
+    # Walks the tracks by primary key, BATCH_SIZE rows at a time
+    last_id = None
+    while True:
+        stmt = sa.select(tracks.c.id, *columns).order_by(tracks.c.id).limit(BATCH_SIZE)
+        if last_id is not None:
+            stmt = stmt.where(tracks.c.id > last_id)
+        rows = connection.execute(stmt).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1].id
+
+
+def encode(points: list) -> bytes:
+    # Stored points are evenly spaced, one per second since GPXTransformer.interp_points
+    if not points:
+        return encode_track_points(datetime(1970, 1, 1), 1, [], [], [])
+    start = datetime.strptime(points[0]['time'], TIME_FORMAT)
+    interval = 1
+    if len(points) > 1:
+        interval = int((datetime.strptime(points[1]['time'], TIME_FORMAT) - start).total_seconds())
+    values = np.array([[p['lat'], p['lon'], p['ele']] for p in points], dtype=np.float64)
+    return encode_track_points(start, interval, values[:, 0], values[:, 1], values[:, 2])
+
+
+def decode(data: bytes) -> list:
+    points = decode_track_points(data)
+    times = np.datetime_as_string(points.times(), unit='s')
+    return [{"time": f"{t}Z", "lat": lat, "lon": lon, "ele": ele}
+            for t, lat, lon, ele in zip(times, points.lat.tolist(), points.lon.tolist(), points.ele.tolist())]
+
+
+def upgrade() -> None:
+    op.add_column('tracks', sa.Column('points_data', postgresql.BYTEA(), nullable=True))
+    connection = op.get_bind()
+    for rows in batches(connection, tracks.c.points):
+        connection.execute(
+            tracks.update().where(tracks.c.id == sa.bindparam('track_id')),
+            [{'track_id': row.id, 'points_data': encode(row.points)} for row in rows],
+        )
+    op.drop_column('tracks', 'points')
+    op.alter_column('tracks', 'points_data', new_column_name='points', nullable=False)
+
+
+def downgrade() -> None:
+    op.alter_column('tracks', 'points', new_column_name='points_data', nullable=True)
+    op.add_column('tracks', sa.Column('points', postgresql.JSONB(astext_type=sa.Text()), server_default='{}',
+                                      nullable=False))
+    connection = op.get_bind()
+    for rows in batches(connection, tracks.c.points_data):
+        connection.execute(
+            tracks.update().where(tracks.c.id == sa.bindparam('track_id')),
+            [{'track_id': row.id, 'points': decode(row.points_data)} for row in rows],
+        )
+    op.drop_column('tracks', 'points_data')
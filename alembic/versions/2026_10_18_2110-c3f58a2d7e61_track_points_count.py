@@ -0,0 +1,41 @@
+"""Add tracks points_count and unique event runner index
+
+Revision ID: c3f58a2d7e61
+Revises: 9a6d3f1e8b24
+Create Date: 2026-10-18 21:10:27.584190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f58a2d7e61'
+down_revision: Union[str, None] = '9a6d3f1e8b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tracks', sa.Column('points_count', sa.Integer(), nullable=True))
+    # The count is the little endian uint32 at bytes 16-19 of the header, see src.database.track_points
+    op.execute(
+        "UPDATE tracks SET points_count = get_byte(points, 16) + (get_byte(points, 17) << 8)"
+        " + (get_byte(points, 18) << 16) + (get_byte(points, 19)::bigint << 24)"
+    )
+    op.alter_column('tracks', 'points_count', nullable=False)
+    # Keep one track per event and runner
+    op.execute(
+        "DELETE FROM tracks WHERE id IN ("
+        " SELECT id FROM ("
+        "  SELECT id, row_number() OVER (PARTITION BY event, runner ORDER BY id) AS n FROM tracks"
+        " ) AS t WHERE n > 1)"
+    )
+    op.create_index('ux_tracks_event_runner', 'tracks', ['event', 'runner'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ux_tracks_event_runner', table_name='tracks')
+    op.drop_column('tracks', 'points_count')
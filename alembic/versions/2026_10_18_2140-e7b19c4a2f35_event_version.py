@@ -0,0 +1,26 @@
+"""Add events version
+
+Revision ID: e7b19c4a2f35
+Revises: c3f58a2d7e61
+Create Date: 2026-10-18 21:40:12.305871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b19c4a2f35'
+down_revision: Union[str, None] = 'c3f58a2d7e61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('events', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('events', 'version')
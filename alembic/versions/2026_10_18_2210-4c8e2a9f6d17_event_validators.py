@@ -0,0 +1,66 @@
+"""Add events checksum and updated
+
+Revision ID: 4c8e2a9f6d17
+Revises: e7b19c4a2f35
+Create Date: 2026-10-18 22:10:51.473092
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from src.database.event_checksum import event_checksum, CHECKSUM_FIELDS
+
+# revision identifiers, used by Alembic.
+revision: str = '4c8e2a9f6d17'
+down_revision: Union[str, None] = 'e7b19c4a2f35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 20
+
+events = sa.table(
+    'events',
+    sa.column('id', sa.UUID()),
+    sa.column('title', sa.String()),
+    sa.column('source', sa.String()),
+    sa.column('date', sa.DateTime()),
+    sa.column('count', sa.Integer()),
+    sa.column('status', sa.Boolean()),
+    sa.column('splits', postgresql.JSONB()),
+    sa.column('results', postgresql.JSONB()),
+    sa.column('courses', postgresql.JSONB()),
+    sa.column('groups', postgresql.JSONB()),
+    sa.column('runners', postgresql.JSONB()),
+    sa.column('legs', postgresql.JSONB()),
+    sa.column('checksum', sa.String()),
+)
+
+
+def upgrade() -> None:
+    op.add_column('events', sa.Column('checksum', sa.String(length=64), nullable=True))
+    op.add_column('events', sa.Column('updated', sa.DateTime(), server_default=sa.text('now()'), nullable=False))
+
+    # Backfill the checksums, BATCH_SIZE events at a time
+    connection = op.get_bind()
+    columns = [events.c[field] for field in CHECKSUM_FIELDS]
+    last_id = None
+    while True:
+        stmt = sa.select(events.c.id, *columns).order_by(events.c.id).limit(BATCH_SIZE)
+        if last_id is not None:
+            stmt = stmt.where(events.c.id > last_id)
+        rows = connection.execute(stmt).all()
+        if not rows:
+            break
+        connection.execute(
+            events.update().where(events.c.id == sa.bindparam('event_id')),
+            [{'event_id': row.id, 'checksum': event_checksum(row)} for row in rows],
+        )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    op.drop_column('events', 'updated')
+    op.drop_column('events', 'checksum')
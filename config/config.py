@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -22,8 +23,41 @@ class DbSettings(BaseModel):
         return f"postgresql+asyncpg://{self.username}:{self.password}@{self.host}/{self.name}"
 
 
+class FetchSettings(BaseModel):
+    timeout: float = float(os.getenv("FETCH_TIMEOUT", 30))
+    connect_timeout: float = float(os.getenv("FETCH_CONNECT_TIMEOUT", 10))
+    max_size: int = int(os.getenv("FETCH_MAX_SIZE", 50 * 1024 * 1024))
+    max_connections: int = int(os.getenv("FETCH_MAX_CONNECTIONS", 20))
+    per_host: int = int(os.getenv("FETCH_PER_HOST", 4))
+
+
+class ParserSettings(BaseModel):
+    workers: int = int(os.getenv("PARSER_WORKERS", os.cpu_count() or 1))
+    max_queue: int = int(os.getenv("PARSER_MAX_QUEUE", 16))
+
+
+class CacheSettings(BaseModel):
+    path: Path = Path(os.getenv("PROTOCOL_CACHE_DIR", BASE_DIR / ".protocol_cache"))
+    max_size: int = int(os.getenv("PROTOCOL_CACHE_MAX_SIZE", 1024 * 1024 * 1024))
+
+
+class UploadSettings(BaseModel):
+    chunk_size: int = int(os.getenv("UPLOAD_CHUNK_SIZE", 1024 * 1024))
+    max_size: int = int(os.getenv("UPLOAD_MAX_SIZE", 200 * 1024 * 1024))
+    dir: Path = Path(os.getenv("UPLOAD_DIR", tempfile.gettempdir()))
+
+
+class EventCacheSettings(BaseModel):
+    max_size: int = int(os.getenv("EVENT_CACHE_MAX_SIZE", 512 * 1024 * 1024))
+
+
 class Settings(BaseSettings):
     db: DbSettings = DbSettings()
+    fetch: FetchSettings = FetchSettings()
+    parser: ParserSettings = ParserSettings()
+    cache: CacheSettings = CacheSettings()
+    upload: UploadSettings = UploadSettings()
+    event_cache: EventCacheSettings = EventCacheSettings()
 
 
 settings = Settings()
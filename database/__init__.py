@@ -2,8 +2,13 @@ from src.database.base import Base
 from src.database.db_helper import db_helper
 from src.database.models.event.event import Event
 from src.database.models.track.track import Track
+from src.database.models.group.group import Group
+from src.database.models.course.course import Course
+from src.database.models.leg.leg import Leg
+from src.database.models.runner.runner import Runner
+from src.database.models.split.split import Split
 
 
 
 
-__all__ = [Base, db_helper, Event, Track]
+__all__ = [Base, db_helper, Event, Track, Group, Course, Leg, Runner, Split]
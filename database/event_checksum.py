@@ -0,0 +1,20 @@
+import hashlib
+import json
+
+# Everything the event data and statistics endpoints are built from
+CHECKSUM_FIELDS = ("title", "source", "date", "count", "status", "splits", "results", "courses", "groups", "runners",
+                   "legs")
+
+
+def event_checksum(event) -> str:
+    """
+    SHA-256 of the content of the event, its strong ETag.
+
+    Args:
+        event: Anything with the CHECKSUM_FIELDS attributes: an event schema, model or row.
+
+    Returns:
+        str: Hex digest.
+    """
+    content = [getattr(event, field) for field in CHECKSUM_FIELDS]
+    return hashlib.sha256(json.dumps(content, ensure_ascii=False, default=str).encode()).hexdigest()
@@ -0,0 +1,54 @@
+import json
+from typing import Dict, List, Union
+from uuid import UUID, uuid4
+
+from src.database.split_matrix import NANOSECONDS_IN_SECOND
+
+ENTITY_TABLES = ['groups', 'courses', 'legs', 'runners', 'splits']  # in insert order
+
+
+def _load(data: Union[str, dict]) -> dict:
+    return json.loads(data) if isinstance(data, str) else data
+
+
+def _seconds(nanoseconds):
+    return None if nanoseconds is None else int(nanoseconds) // NANOSECONDS_IN_SECOND
+
+
+def event_entity_rows(event_id: UUID, splits: Union[str, dict], results: Union[str, dict],
+                      courses: Union[str, dict], groups: Union[str, dict], runners: Union[str, dict],
+                      legs: Union[str, dict]) -> Dict[str, List[dict]]:
+    """
+    Turns the JSON entities of an event into rows of the normalized tables. Entities keep their IDs,
+    times are converted from nanoseconds to seconds and missing splits get no row.
+
+    Returns:
+        Dict[str, List[dict]]: Rows by table name, see ENTITY_TABLES for the insert order.
+    """
+    splits, results, runners = _load(splits), _load(results), _load(runners)
+    rows = {
+        'groups': [{'id': UUID(_id), 'event': event_id, 'name': group['name']}
+                   for _id, group in _load(groups).items()],
+        'courses': [{'id': UUID(_id), 'event': event_id, 'points': points}
+                    for _id, points in _load(courses).items()],
+        'legs': [{'id': UUID(_id), 'event': event_id, 'start': leg['start'], 'end': leg['end']}
+                 for _id, leg in _load(legs).items()],
+        'runners': [],
+        'splits': [],
+    }
+    for _id, runner in runners.items():
+        result = results.get(_id) or {}
+        rows['runners'].append({
+            'id': UUID(_id),
+            'event': event_id,
+            'group': UUID(runner['group']),
+            'course': UUID(runner['course']),
+            'name': runner['name'],
+            'result': _seconds(next(iter(result.values()), None)),
+        })
+    for leg, times in splits.items():
+        rows['splits'].extend(
+            {'id': uuid4(), 'runner': UUID(runner), 'leg': UUID(leg), 'time': _seconds(time)}
+            for runner, time in times.items() if time is not None and runner in runners
+        )
+    return rows
@@ -0,0 +1,16 @@
+from uuid import UUID as uuid_1
+
+from sqlalchemy import ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database.base import Base
+
+
+class Course(Base):
+    event: Mapped[uuid_1] = mapped_column(ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    points: Mapped[dict] = mapped_column(JSONB, nullable=False, server_default="{}")  # {position: leg id}
+
+    __table_args__ = (
+        Index("ix_courses_event", "event"),
+    )
@@ -1,8 +1,8 @@
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import String, Integer, Boolean, func, DateTime
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import String, Integer, Boolean, func, DateTime, Index
+from sqlalchemy.dialects.postgresql import JSONB, BYTEA
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database.base import Base
@@ -22,7 +22,19 @@ class Event(Base):
     groups: Mapped[str] = mapped_column(JSONB, nullable=False, server_default="{}", default="{}")
     runners: Mapped[str] = mapped_column(JSONB, nullable=False, server_default="{}", default="{}")
     legs: Mapped[str] = mapped_column(JSONB, nullable=False, server_default="{}", default="{}")
+    # splits and results packed for reading, see src.database.split_matrix
+    split_matrix: Mapped[Optional[bytes]] = mapped_column(BYTEA, nullable=True)
+    # Incremented on every change of the event, see EventDataCache
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1", default=1)
     date: Mapped[datetime] = mapped_column(
         DateTime(timezone=False), server_default=func.now())
+    # Validators of the event endpoints, see src.database.event_checksum
+    checksum: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    updated: Mapped[datetime] = mapped_column(DateTime(timezone=False), server_default=func.now(), onupdate=func.now())
 
     tracks: Mapped[list["Track"]] = relationship(back_populates="event_rel")
+
+    __table_args__ = (
+        Index("ix_events_date_id", "date", "id"),  # listing by date, see EventRepository.get_page
+        Index("ux_events_source", "source", unique=True),
+    )
@@ -0,0 +1,15 @@
+from uuid import UUID as uuid_1
+
+from sqlalchemy import String, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database.base import Base
+
+
+class Group(Base):
+    event: Mapped[uuid_1] = mapped_column(ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+
+    __table_args__ = (
+        Index("ix_groups_event", "event"),
+    )
@@ -0,0 +1,16 @@
+from uuid import UUID as uuid_1
+
+from sqlalchemy import Integer, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database.base import Base
+
+
+class Leg(Base):
+    event: Mapped[uuid_1] = mapped_column(ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    start: Mapped[int] = mapped_column(Integer, nullable=False)
+    end: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_legs_event", "event"),
+    )
@@ -0,0 +1,20 @@
+from typing import Optional
+from uuid import UUID as uuid_1
+
+from sqlalchemy import String, Integer, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database.base import Base
+
+
+class Runner(Base):
+    event: Mapped[uuid_1] = mapped_column(ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    group: Mapped[uuid_1] = mapped_column(ForeignKey("groups.id", ondelete="CASCADE"), nullable=False)
+    course: Mapped[uuid_1] = mapped_column(ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    result: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # seconds, NULL if not classified
+
+    __table_args__ = (
+        Index("ix_runners_event_group", "event", "group"),
+        Index("ix_runners_event_course", "event", "course"),
+    )
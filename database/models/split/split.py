@@ -0,0 +1,17 @@
+from uuid import UUID as uuid_1
+
+from sqlalchemy import Integer, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database.base import Base
+
+
+class Split(Base):
+    runner: Mapped[uuid_1] = mapped_column(ForeignKey("runners.id", ondelete="CASCADE"), nullable=False)
+    leg: Mapped[uuid_1] = mapped_column(ForeignKey("legs.id", ondelete="CASCADE"), nullable=False)
+    time: Mapped[int] = mapped_column(Integer, nullable=False)  # seconds, missing splits have no row
+
+    __table_args__ = (
+        Index("ix_splits_leg_time", "leg", "time"),
+        Index("ix_splits_runner", "runner"),
+    )
@@ -1,7 +1,7 @@
 from uuid import UUID as uuid_1
 
-from sqlalchemy import Float, UUID, ForeignKey
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Float, Integer, UUID, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import BYTEA
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database.base import Base
@@ -13,7 +13,13 @@ class Track(Base):
     distance: Mapped[float] = mapped_column(Float, nullable=False)
     elevation: Mapped[float] = mapped_column(Float, nullable=False)
     duration: Mapped[float] = mapped_column(Float, nullable=False)
-    points: Mapped[dict] = mapped_column(JSONB, nullable=False, server_default="{}")
+    # Deferred: only loaded by queries that need the points, see TrackRepository
+    points: Mapped[bytes] = mapped_column(BYTEA, nullable=False, deferred=True)  # see src.database.track_points
+    points_count: Mapped[int] = mapped_column(Integer, nullable=False)
 
     event: Mapped[uuid_1] = mapped_column(ForeignKey("events.id"), nullable=False)
-    event_rel: Mapped["Event"] = relationship(back_populates="tracks")
\ No newline at end of file
+    event_rel: Mapped["Event"] = relationship(back_populates="tracks")
+
+    __table_args__ = (
+        Index("ux_tracks_event_runner", "event", "runner", unique=True),
+    )
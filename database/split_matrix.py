@@ -0,0 +1,111 @@
+import json
+import struct
+from typing import NamedTuple, List, Union
+from uuid import UUID
+
+import numpy as np
+import pandas as pd
+
+# Binary layout (little endian):
+#   header   MAGIC, runners count, legs count
+#   runners  16-byte UUID per runner
+#   legs     16-byte UUID per leg
+#   splits   int32 seconds, runners x legs, row by row
+#   results  int32 seconds per runner
+# Every section starts at a multiple of 4 bytes, so the int32 sections are read in place.
+MAGIC = b'SPM1'
+HEADER = struct.Struct('<4sII')
+ID_SIZE = 16
+SECONDS = np.dtype('<i4')
+MISSING = -1  # missing split or result
+NANOSECONDS_IN_SECOND = 10 ** 9
+
+
+class SplitMatrix(NamedTuple):
+    runners: List[str]
+    legs: List[str]
+    splits: np.ndarray  # int32 seconds (runners x legs), MISSING where there is no split
+    results: np.ndarray  # int32 seconds per runner, MISSING where there is no result
+
+
+def _load(data: Union[str, dict]) -> dict:
+    return json.loads(data) if isinstance(data, str) else data
+
+
+def _seconds(nanoseconds) -> int:
+    return MISSING if nanoseconds is None else int(nanoseconds) // NANOSECONDS_IN_SECOND
+
+
+def encode_split_matrix(splits: Union[str, dict], results: Union[str, dict]) -> bytes:
+    """
+    Packs the splits and results of an event into the binary split matrix.
+
+    Args:
+        splits (Union[str, dict]): Splits in nanoseconds, {leg_id: {runner_id: ns}}, as stored in Event.splits.
+        results (Union[str, dict]): Results in nanoseconds, {runner_id: {key: ns}}, as stored in Event.results.
+
+    Returns:
+        bytes: The encoded matrix.
+    """
+    splits, results = _load(splits), _load(results)
+    runners = {runner: n for n, runner in enumerate(results)}
+    for times in splits.values():
+        for runner in times:
+            runners.setdefault(runner, len(runners))
+    legs = list(splits)
+
+    matrix = np.full((len(runners), len(legs)), MISSING, dtype=SECONDS)
+    for column, times in enumerate(splits.values()):
+        rows = [runners[runner] for runner in times]
+        matrix[rows, column] = [_seconds(t) for t in times.values()]
+    result_seconds = np.full(len(runners), MISSING, dtype=SECONDS)
+    for runner, result in results.items():
+        result_seconds[runners[runner]] = _seconds(next(iter(result.values()), None) if result else None)
+
+    return b''.join([
+        HEADER.pack(MAGIC, len(runners), len(legs)),
+        *(UUID(runner).bytes for runner in runners),
+        *(UUID(leg).bytes for leg in legs),
+        matrix.tobytes(),
+        result_seconds.tobytes(),
+    ])
+
+
+def _ids(data: bytes, offset: int, count: int) -> List[str]:
+    return [str(UUID(bytes=data[i:i + ID_SIZE])) for i in range(offset, offset + count * ID_SIZE, ID_SIZE)]
+
+
+def decode_split_matrix(data: bytes) -> SplitMatrix:
+    """
+    Reads the binary split matrix. The splits and results arrays are read-only views of data, not copies.
+    """
+    magic, runners_count, legs_count = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a split matrix")
+    offset = HEADER.size
+    runners = _ids(data, offset, runners_count)
+    offset += runners_count * ID_SIZE
+    legs = _ids(data, offset, legs_count)
+    offset += legs_count * ID_SIZE
+    splits = np.frombuffer(data, dtype=SECONDS, count=runners_count * legs_count, offset=offset)
+    offset += splits.nbytes
+    results = np.frombuffer(data, dtype=SECONDS, count=runners_count, offset=offset)
+    return SplitMatrix(runners, legs, splits.reshape(runners_count, legs_count), results)
+
+
+def to_nullable(values: np.ndarray) -> pd.arrays.IntegerArray:
+    """
+    Nullable Int32 seconds over the int32 values without copying them, MISSING values are masked.
+    """
+    return pd.arrays.IntegerArray(values, values == MISSING)
+
+
+def seconds_frames(matrix: SplitMatrix) -> (pd.DataFrame, pd.Series):
+    """
+    Splits (runners x legs) and results in nullable Int32 seconds, as used by the statistics.
+    Every column is a view of the decoded matrix, only the masks of missing values are allocated.
+    """
+    splits = pd.DataFrame({leg: to_nullable(matrix.splits[:, n]) for n, leg in enumerate(matrix.legs)},
+                          index=matrix.runners, columns=matrix.legs, copy=False)
+    results = pd.Series(to_nullable(matrix.results), index=matrix.runners, copy=False)
+    return splits, results
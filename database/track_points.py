@@ -0,0 +1,77 @@
+import struct
+from datetime import datetime, timezone
+from typing import NamedTuple
+
+import numpy as np
+
+# Binary layout (little endian):
+#   header  MAGIC, start (unix seconds), interval (seconds), points count
+#   lat     int32 deltas of the latitude in 1e-7 degrees, the first one from 0
+#   lon     int32 deltas of the longitude in 1e-7 degrees
+#   ele     int32 deltas of the elevation in centimetres
+MAGIC = b'TRK1'
+HEADER = struct.Struct('<4sqII')
+DELTA = np.dtype('<i4')
+DEGREE_SCALE = 10 ** 7
+ELEVATION_SCALE = 100
+
+
+class TrackPoints(NamedTuple):
+    start: datetime  # UTC
+    interval: int  # seconds between points
+    lat: np.ndarray
+    lon: np.ndarray
+    ele: np.ndarray
+
+    def times(self) -> np.ndarray:
+        """
+        Time of every point, datetime64[s] in UTC.
+        """
+        start = np.datetime64(self.start.replace(tzinfo=None), 's')
+        return start + np.arange(len(self.lat)) * np.timedelta64(self.interval, 's')
+
+
+def _deltas(values, scale: int) -> bytes:
+    fixed = np.round(np.asarray(values, dtype=np.float64) * scale).astype(np.int64)
+    return np.diff(fixed, prepend=0).astype(DELTA).tobytes()
+
+
+def encode_track_points(start: datetime, interval: int, lat, lon, ele) -> bytes:
+    """
+    Packs evenly spaced track points.
+
+    Args:
+        start (datetime): Time of the first point, UTC (naive datetimes are taken as UTC).
+        interval (int): Seconds between points.
+        lat, lon, ele: Latitudes, longitudes (degrees) and elevations (metres) of the points.
+
+    Returns:
+        bytes: The encoded points.
+    """
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    return b''.join([
+        HEADER.pack(MAGIC, int(start.timestamp()), interval, len(lat)),
+        _deltas(lat, DEGREE_SCALE),
+        _deltas(lon, DEGREE_SCALE),
+        _deltas(ele, ELEVATION_SCALE),
+    ])
+
+
+def track_points_count(data: bytes) -> int:
+    return HEADER.unpack_from(data)[3]
+
+
+def decode_track_points(data: bytes) -> TrackPoints:
+    magic, start, interval, count = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a track points encoding")
+    deltas = np.frombuffer(data, dtype=DELTA, count=3 * count, offset=HEADER.size).reshape(3, count)
+    lat, lon, ele = np.cumsum(deltas, axis=1, dtype=np.int64)
+    return TrackPoints(
+        start=datetime.fromtimestamp(start, tz=timezone.utc),
+        interval=interval,
+        lat=lat / DEGREE_SCALE,
+        lon=lon / DEGREE_SCALE,
+        ele=ele / ELEVATION_SCALE,
+    )
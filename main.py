@@ -1,7 +1,24 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 # Initialize FastAPI application
 from src.routers import router
+from src.services.event.subservices.parser.parser_pool import parser_pool
+from src.services.event.subservices.parser.src.web_fetch import close_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan: pre-warms the parser workers on startup and releases
+    the parser pool and the pooled HTTP client on shutdown.
+    """
+    await parser_pool.start()
+    yield
+    parser_pool.shutdown()
+    await close_client()
+
 
 app = FastAPI(
     title="Event Data API",
@@ -9,6 +26,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",  # URL for the Swagger UI documentation
     redoc_url="/redoc",  # URL for ReDoc documentation
+    lifespan=lifespan,
 )
 
 # Connect the router to the FastAPI app
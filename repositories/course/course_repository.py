@@ -0,0 +1,71 @@
+from typing import List, Optional, Type, Dict
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models.course.course import Course
+from src.database.models.runner.runner import Runner
+from src.schemas.course.course_schema import CourseInput, CourseInDB
+
+
+class CourseRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @staticmethod
+    def values(data: CourseInput, **kwargs) -> dict:
+        # points are stored as in the event JSON: {"position": "leg id"}
+        values = data.model_dump(**kwargs)
+        if values.get("points") is not None:
+            values["points"] = {str(n): str(leg) for n, leg in values["points"].items()}
+        return values
+
+    async def create(self, data: CourseInput) -> CourseInDB:
+        course = Course(**self.values(data, exclude_unset=True))
+        self.session.add(course)
+        await self.session.commit()
+        await self.session.refresh(course)
+        return CourseInDB(**course.__dict__)
+
+    async def get_all(self) -> List[Optional[CourseInDB]]:
+        stmt = select(Course).order_by(Course.id)
+        result = await self.session.execute(stmt)
+        entities = result.scalars().all()
+        return [CourseInDB(**course.__dict__) for course in entities]
+
+    async def get_course(self, _id: UUID) -> CourseInDB:
+        course = await self.session.get(Course, _id)
+        return CourseInDB(**course.__dict__)
+
+    async def get_by_id(self, _id: UUID) -> Optional[Course]:
+        return await self.session.get(Course, _id)
+
+    async def get_leaderboard(self, event_id: UUID, course_id: UUID, group_id: UUID = None,
+                              limit: int = None) -> Dict[UUID, int]:
+        """
+        Results of the classified runners of the course, optionally of one group only, fastest first.
+        Served by the (event, course) index of runners.
+
+        Returns:
+            Dict[UUID, int]: Result in seconds by runner ID.
+        """
+        stmt = select(Runner.id, Runner.result) \
+            .where(Runner.event == event_id, Runner.course == course_id, Runner.result.is_not(None))
+        if group_id:
+            stmt = stmt.where(Runner.group == group_id)
+        stmt = stmt.order_by(Runner.result, Runner.id).limit(limit)
+        result = await self.session.execute(stmt)
+        return {row.id: row.result for row in result}
+
+    async def update(self, course: Type[Course], data: CourseInput) -> CourseInDB:
+        for key, value in self.values(data, exclude_none=True).items():
+            setattr(course, key, value)
+        await self.session.commit()
+        await self.session.refresh(course)
+        return CourseInDB(**course.__dict__)
+
+    async def delete(self, course: Type[Course]) -> bool:
+        await self.session.delete(course)
+        await self.session.commit()
+        return True
@@ -1,20 +1,94 @@
+import base64
+import hashlib
 import json
-from typing import List, Optional, Type
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Type, Dict, Tuple
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, insert, delete, tuple_, func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from src.database.event_entities import event_entity_rows, ENTITY_TABLES
+from src.database.models.course.course import Course
 from src.database.models.event.event import Event
-from src.schemas.event.event_schema import EventInput, EventInDB, EventUpdate
+from src.database.models.group.group import Group
+from src.database.models.leg.leg import Leg
+from src.database.models.runner.runner import Runner
+from src.database.models.split.split import Split
+from src.database.split_matrix import encode_split_matrix
+from src.schemas.event.event_schema import EventInput, EventInDB, EventUpdate, EventResponse, EventValidators
+
+BATCH_SIZE = 50
+PAGE_SIZE = 50
+SOURCE_INDEX = "ux_events_source"
+ENTITY_MODELS = {'groups': Group, 'courses': Course, 'legs': Leg, 'runners': Runner, 'splits': Split}
+
+
+def normalize_source(link: str) -> str:
+    if "#" in link:
+        link = link[:link.index("#")]
+    return link
+
+
+def source_lock_key(link: str) -> int:  # Postgres advisory lock key (signed bigint) of a normalized source
+    return int.from_bytes(hashlib.sha256(link.encode()).digest()[:8], 'big', signed=True)
+
+
+def is_source_conflict(error: IntegrityError) -> bool:  # The source is already imported, other violations are errors
+    return SOURCE_INDEX in str(error.orig)
+
+
+def encode_cursor(event: EventResponse) -> str:
+    key = json.dumps([event.date.isoformat(), str(event.id)])
+    return base64.urlsafe_b64encode(key.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        event_date, _id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(event_date), UUID(_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor {cursor}") from e
 
 
 class EventRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    async def lock_source(self, link: str):
+        """
+        Takes the advisory lock of the source for the current transaction, waiting while another
+        worker stores it. The lock is released when the transaction ends: on the commit that stores
+        the event, or on rollback (see release).
+        """
+        await self.session.execute(select(func.pg_advisory_xact_lock(source_lock_key(normalize_source(link)))))
+
+    async def release(self):
+        """
+        Ends the current read transaction, returning its connection to the pool and releasing
+        the advisory locks it holds, e.g. before fetching a source.
+        """
+        await self.session.rollback()
+
+    async def add_events(self, data: List[EventInput]) -> List[Event]:
+        for i in data:
+            i.split_matrix = encode_split_matrix(i.splits, i.results)
+        events = [Event(**i.model_dump(exclude_unset=True)) for i in data]
+        self.session.add_all(events)
+        await self.session.flush()
+        for event, i in zip(events, data):
+            await self.add_entities(event.id, i)
+        return events
+
     async def create(self, data: EventInput) -> EventInDB:
-        event = Event(**data.model_dump(exclude_unset=True))
-        self.session.add(event)
+        try:
+            event, = await self.add_events([data])
+        except IntegrityError as e:
+            await self.session.rollback()
+            if not is_source_conflict(e):
+                raise
+            # Imported in the meantime by a request that did not take the source lock
+            return await self.get_by_source_link(data.source)
         await self.session.commit()
         await self.session.refresh(event)
         return EventInDB(
@@ -23,12 +97,74 @@ class EventRepository:
             **data.model_dump(exclude={"title"})
         )
 
+    async def create_many(self, data: List[EventInput], batch_size: int = BATCH_SIZE) -> List[Optional[EventInDB]]:
+        """
+        Inserts events in batches of batch_size, one transaction per batch. When a batch hits an
+        already stored source, its events are inserted one by one and the conflicting ones are skipped;
+        any other integrity error is raised.
+
+        Returns:
+            List[Optional[EventInDB]]: Created events in input order, None for the skipped ones.
+        """
+        created = []
+        for start in range(0, len(data), batch_size):
+            batch = data[start:start + batch_size]
+            try:
+                events = await self.add_events(batch)
+            except IntegrityError:
+                await self.session.rollback()
+                events = []
+                for i in batch:
+                    try:
+                        async with self.session.begin_nested():
+                            events.extend(await self.add_events([i]))
+                    except IntegrityError as e:
+                        if not is_source_conflict(e):
+                            await self.session.rollback()
+                            raise
+                        events.append(None)
+            await self.session.commit()
+            created.extend(
+                EventInDB(id=event.id, title=event.title, **i.model_dump(exclude={"title"})) if event else None
+                for event, i in zip(events, batch)
+            )
+        return created
+
     async def get_all(self) -> List[Optional[EventInDB]]:
         stmt = select(Event).order_by(Event.id)
         result = await self.session.execute(stmt)
         entities = result.scalars().all()
         return [EventInDB(**event.__dict__) for event in entities]
 
+    async def get_page(self, limit: int = PAGE_SIZE, cursor: str = None, date_from: date = None,
+                       date_to: date = None) -> Tuple[List[EventResponse], Optional[str]]:
+        """
+        Lists events, newest first, reading only the metadata columns.
+        Pages are keyed by (date, id), so every page is an index range scan of ix_events_date_id.
+
+        Args:
+            limit (int): Page size.
+            cursor (str, optional): next_cursor of the previous page.
+            date_from (date, optional): First event date to include.
+            date_to (date, optional): Last event date to include.
+
+        Returns:
+            Tuple[List[EventResponse], Optional[str]]: The events and the cursor of the next page, None on the last page.
+        """
+        stmt = select(Event.id, Event.title, Event.source, Event.count, Event.status, Event.date)
+        if cursor:
+            stmt = stmt.where(tuple_(Event.date, Event.id) < decode_cursor(cursor))
+        if date_from:
+            stmt = stmt.where(Event.date >= datetime.combine(date_from, time.min))
+        if date_to:
+            stmt = stmt.where(Event.date < datetime.combine(date_to + timedelta(days=1), time.min))
+        stmt = stmt.order_by(Event.date.desc(), Event.id.desc()).limit(limit + 1)
+        result = await self.session.execute(stmt)
+        events = [EventResponse(**row._asdict()) for row in result]
+        if len(events) > limit:
+            return events[:limit], encode_cursor(events[limit - 1])
+        return events, None
+
     async def get_event(self, _id: UUID) -> EventInDB:
         event = await self.session.get(Event, _id)
         return EventInDB(**event.__dict__)
@@ -36,20 +172,58 @@ class EventRepository:
     async def get_by_id(self, _id: UUID) -> Optional[Event]:
         return await self.session.get(Event, _id)
 
+    async def get_validators(self, _id: UUID) -> Optional[EventValidators]:
+        stmt = select(Event.version, Event.checksum, Event.updated).where(Event.id == _id)
+        row = (await self.session.execute(stmt)).first()
+        if row:
+            return EventValidators(**row._asdict())
+
     async def get_by_source_link(self, link: str) -> Optional[EventInDB]:
-        if "#" in link:
-            link = link[:link.index("#")]
+        link = normalize_source(link)
         event = await self.session.scalar(select(Event).where(Event.source == link))
         if event:
             return EventInDB(**event.__dict__)
 
-    async def update(self, event: Type[Event], data: EventUpdate) -> EventInDB:
+    async def get_by_source_links(self, links: List[str]) -> Dict[str, EventResponse]:
+        links = list({normalize_source(link) for link in links})
+        stmt = select(Event.id, Event.title, Event.source, Event.count, Event.status, Event.date) \
+            .where(Event.source.in_(links))
+        result = await self.session.execute(stmt)
+        return {row.source: EventResponse(**row._asdict()) for row in result}
+
+    async def update(self, event: Type[Event], data: EventUpdate, checksum: str = None) -> EventInDB:
         for key, value in data.model_dump(exclude_none=True).items():
             setattr(event, key, value)
+        event.checksum = checksum
+        event.version = Event.version + 1
         await self.session.commit()
         await self.session.refresh(event)
         return EventInDB(**event.__dict__)
 
+    async def update_entities(self, event: Type[Event], data: EventInput) -> EventInDB:
+        data.split_matrix = encode_split_matrix(data.splits, data.results)
+        for key, value in data.model_dump(include={"count", "splits", "results", "courses", "groups", "runners",
+                                                   "legs", "split_matrix", "checksum"}).items():
+            setattr(event, key, value)
+        event.version = Event.version + 1
+        # Entities are replaced as a whole, runners and splits go with their groups, courses and legs
+        for model in (Group, Course, Leg):
+            await self.session.execute(delete(model).where(model.event == event.id))
+        await self.add_entities(event.id, data)
+        await self.session.commit()
+        await self.session.refresh(event)
+        return EventInDB(**event.__dict__)
+
+    async def add_entities(self, event_id: UUID, data: EventInput):
+        """
+        Inserts the groups, courses, legs, runners and splits of the event into their tables.
+        """
+        rows = event_entity_rows(event_id, data.splits, data.results, data.courses, data.groups, data.runners,
+                                 data.legs)
+        for table in ENTITY_TABLES:
+            if rows[table]:
+                await self.session.execute(insert(ENTITY_MODELS[table]), rows[table])
+
     async def delete(self, event: Type[Event]) -> bool:
         await self.session.delete(event)
         await self.session.commit()
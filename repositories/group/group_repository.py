@@ -0,0 +1,66 @@
+from typing import List, Optional, Type, Dict
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models.group.group import Group
+from src.database.models.runner.runner import Runner
+from src.schemas.group.group_schema import GroupInput, GroupInDB
+
+
+class GroupRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, data: GroupInput) -> GroupInDB:
+        group = Group(**data.model_dump(exclude_unset=True))
+        self.session.add(group)
+        await self.session.commit()
+        await self.session.refresh(group)
+        return GroupInDB(**group.__dict__)
+
+    async def get_all(self) -> List[Optional[GroupInDB]]:
+        stmt = select(Group).order_by(Group.id)
+        result = await self.session.execute(stmt)
+        entities = result.scalars().all()
+        return [GroupInDB(**group.__dict__) for group in entities]
+
+    async def get_group(self, _id: UUID) -> GroupInDB:
+        group = await self.session.get(Group, _id)
+        return GroupInDB(**group.__dict__)
+
+    async def get_by_id(self, _id: UUID) -> Optional[Group]:
+        return await self.session.get(Group, _id)
+
+    async def get_by_event(self, event_id: UUID) -> List[GroupInDB]:
+        stmt = select(Group).where(Group.event == event_id)
+        result = await self.session.execute(stmt)
+        return [GroupInDB(**group.__dict__) for group in result.scalars().all()]
+
+    async def get_leaderboard(self, event_id: UUID, group_id: UUID, limit: int = None) -> Dict[UUID, int]:
+        """
+        Results of the classified runners of the group, fastest first.
+        Served by the (event, group) index of runners.
+
+        Returns:
+            Dict[UUID, int]: Result in seconds by runner ID.
+        """
+        stmt = select(Runner.id, Runner.result) \
+            .where(Runner.event == event_id, Runner.group == group_id, Runner.result.is_not(None)) \
+            .order_by(Runner.result, Runner.id) \
+            .limit(limit)
+        result = await self.session.execute(stmt)
+        return {row.id: row.result for row in result}
+
+    async def update(self, group: Type[Group], data: GroupInput) -> GroupInDB:
+        for key, value in data.model_dump(exclude_none=True).items():
+            setattr(group, key, value)
+        await self.session.commit()
+        await self.session.refresh(group)
+        return GroupInDB(**group.__dict__)
+
+    async def delete(self, group: Type[Group]) -> bool:
+        await self.session.delete(group)
+        await self.session.commit()
+        return True
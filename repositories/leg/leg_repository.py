@@ -0,0 +1,62 @@
+from typing import List, Optional, Type, Dict
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models.leg.leg import Leg
+from src.database.models.runner.runner import Runner
+from src.database.models.split.split import Split
+from src.schemas.leg.leg_schema import LegInput, LegInDB
+
+
+class LegRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, data: LegInput) -> LegInDB:
+        leg = Leg(**data.model_dump(exclude_unset=True))
+        self.session.add(leg)
+        await self.session.commit()
+        await self.session.refresh(leg)
+        return LegInDB(**leg.__dict__)
+
+    async def get_all(self) -> List[Optional[LegInDB]]:
+        stmt = select(Leg).order_by(Leg.id)
+        result = await self.session.execute(stmt)
+        entities = result.scalars().all()
+        return [LegInDB(**leg.__dict__) for leg in entities]
+
+    async def get_leg(self, _id: UUID) -> LegInDB:
+        leg = await self.session.get(Leg, _id)
+        return LegInDB(**leg.__dict__)
+
+    async def get_by_id(self, _id: UUID) -> Optional[Leg]:
+        return await self.session.get(Leg, _id)
+
+    async def get_leaderboard(self, leg_id: UUID, group_id: UUID = None, limit: int = None) -> Dict[UUID, int]:
+        """
+        Splits of the leg, optionally of one group only, fastest first.
+        Served by the (leg, time) index of splits.
+
+        Returns:
+            Dict[UUID, int]: Split in seconds by runner ID.
+        """
+        stmt = select(Split.runner, Split.time).where(Split.leg == leg_id)
+        if group_id:
+            stmt = stmt.join(Runner, Runner.id == Split.runner).where(Runner.group == group_id)
+        stmt = stmt.order_by(Split.time, Split.runner).limit(limit)
+        result = await self.session.execute(stmt)
+        return {row.runner: row.time for row in result}
+
+    async def update(self, leg: Type[Leg], data: LegInput) -> LegInDB:
+        for key, value in data.model_dump(exclude_none=True).items():
+            setattr(leg, key, value)
+        await self.session.commit()
+        await self.session.refresh(leg)
+        return LegInDB(**leg.__dict__)
+
+    async def delete(self, leg: Type[Leg]) -> bool:
+        await self.session.delete(leg)
+        await self.session.commit()
+        return True
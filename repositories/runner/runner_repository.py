@@ -0,0 +1,50 @@
+from typing import List, Optional, Type
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models.runner.runner import Runner
+from src.schemas.runner.runner_schema import RunnerInput, RunnerInDB
+
+
+class RunnerRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, data: RunnerInput) -> RunnerInDB:
+        runner = Runner(**data.model_dump(exclude_unset=True))
+        self.session.add(runner)
+        await self.session.commit()
+        await self.session.refresh(runner)
+        return RunnerInDB(**runner.__dict__)
+
+    async def get_all(self) -> List[Optional[RunnerInDB]]:
+        stmt = select(Runner).order_by(Runner.id)
+        result = await self.session.execute(stmt)
+        entities = result.scalars().all()
+        return [RunnerInDB(**runner.__dict__) for runner in entities]
+
+    async def get_runner(self, _id: UUID) -> RunnerInDB:
+        runner = await self.session.get(Runner, _id)
+        return RunnerInDB(**runner.__dict__)
+
+    async def get_by_id(self, _id: UUID) -> Optional[Runner]:
+        return await self.session.get(Runner, _id)
+
+    async def get_by_group(self, event_id: UUID, group_id: UUID) -> List[RunnerInDB]:
+        stmt = select(Runner).where(Runner.event == event_id, Runner.group == group_id).order_by(Runner.name)
+        result = await self.session.execute(stmt)
+        return [RunnerInDB(**runner.__dict__) for runner in result.scalars().all()]
+
+    async def update(self, runner: Type[Runner], data: RunnerInput) -> RunnerInDB:
+        for key, value in data.model_dump(exclude_none=True).items():
+            setattr(runner, key, value)
+        await self.session.commit()
+        await self.session.refresh(runner)
+        return RunnerInDB(**runner.__dict__)
+
+    async def delete(self, runner: Type[Runner]) -> bool:
+        await self.session.delete(runner)
+        await self.session.commit()
+        return True
@@ -1,53 +1,80 @@
 from typing import List, Optional, Type
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, exists
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
 from src.database.models.track.track import Track
-from src.schemas.track.track_schema import TrackInput, TrackInDB
+from src.database.track_points import track_points_count
+from src.schemas.track.track_schema import TrackInput, TrackInDB, TrackResponse
+
+EVENT_RUNNER_INDEX = "ux_tracks_event_runner"
+
+
+def is_track_conflict(error: IntegrityError) -> bool:  # The runner already has a track, other violations are errors
+    return EVENT_RUNNER_INDEX in str(error.orig)
 
 
 class TrackRepository:
+    # Track.points is deferred: only get_by_event_and_runner loads it, the other queries return TrackResponse
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def create(self, data: TrackInput) -> TrackInDB:
-        track = Track(**data.model_dump(exclude_unset=True))
+    async def create(self, data: TrackInput) -> Optional[TrackInDB]:
+        points_count = track_points_count(data.points)
+        track = Track(**data.model_dump(exclude_unset=True), points_count=points_count)
         self.session.add(track)
-        await self.session.commit()
+        try:
+            await self.session.commit()
+        except IntegrityError as e:
+            await self.session.rollback()
+            if not is_track_conflict(e):
+                raise
+            # The runner already has a track in the event
+            return None
         await self.session.refresh(track)
         return TrackInDB(
             id=track.id,
             runner=track.runner,
+            points_count=points_count,
             **data.model_dump(exclude={"runner"})
         )
 
-    async def get_all(self) -> List[Optional[TrackInDB]]:
+    async def get_all(self) -> List[Optional[TrackResponse]]:
         stmt = select(Track).order_by(Track.id)
         result = await self.session.execute(stmt)
         entities = result.scalars().all()
-        return [TrackInDB(**track.__dict__) for track in entities]
+        return [TrackResponse(**track.__dict__) for track in entities]
 
-    async def get_track(self, _id: UUID) -> TrackInDB:
+    async def get_track(self, _id: UUID) -> Optional[TrackResponse]:
         track = await self.session.get(Track, _id)
-        return TrackInDB(**track.__dict__)
+        return TrackResponse(**track.__dict__) if track else None
 
     async def get_by_id(self, _id: UUID) -> Optional[Track]:
         return await self.session.get(Track, _id)
 
-    async def get_by_event(self, event_id: UUID) -> List[TrackInDB]:
-        stmt = select(Track).where(Track.event == event_id)
+    async def get_by_event(self, event_id: UUID) -> List[TrackResponse]:
+        stmt = select(Track).where(Track.event == event_id).order_by(Track.id)
         result = await self.session.execute(stmt)
         entities = result.scalars().all()
-        return [TrackInDB(**track.__dict__) for track in entities]
+        return [TrackResponse(**track.__dict__) for track in entities]
 
-    async def get_by_event_and_runner(self, event_id: UUID, runner_id: UUID) -> TrackInDB:
-        stmt = select(Track).where(Track.event == event_id).where(Track.runner == runner_id)
+    async def get_by_event_and_runner(self, event_id: UUID, runner_id: UUID) -> Optional[TrackInDB]:
+        stmt = (select(Track).options(undefer(Track.points))
+                .where(Track.event == event_id).where(Track.runner == runner_id))
         result = await self.session.execute(stmt)
         track = result.scalar()
-        return TrackInDB(**track.__dict__)
+        return TrackInDB(**track.__dict__) if track else None
+
+    async def get_id(self, event_id: UUID, runner_id: UUID) -> Optional[UUID]:
+        stmt = select(Track.id).where(Track.event == event_id).where(Track.runner == runner_id)
+        return await self.session.scalar(stmt)
 
+    async def exists(self, event_id: UUID, runner_id: UUID) -> bool:
+        stmt = select(exists().where(Track.event == event_id).where(Track.runner == runner_id))
+        return await self.session.scalar(stmt)
 
     async def delete(self, track: Type[Track]) -> bool:
         await self.session.delete(track)
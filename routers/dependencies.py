@@ -1,16 +1,19 @@
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Annotated, Type, List, Dict, Any, TypedDict, Tuple, Union
+from typing import Annotated, Type, List, Dict, Any, TypedDict, Tuple, Union, Optional
 
-from fastapi import Depends, HTTPException, Form
+from fastapi import Depends, HTTPException, Form, Request, Response
 from pydantic import BaseModel, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from src.database import db_helper
-from src.schemas.event.event_schema import EventInDB
+from src.schemas.event.event_schema import EventInDB, EventValidators
 from src.schemas.track.track_schema import TrackInDB
 from src.services.event.event_service import EventService
 from src.services.single_event_data.single_event_data_service import SingleEventDataService
+from src.services.single_event_statistics.leaderboard_service import LeaderboardService
 from src.services.single_event_statistics.statistics_service import SingleEventStatisticsService
 from src.services.single_event_statistics.subservices.geosplit.geosplit_service import GeoSplitService
 from src.services.track.track_service import TrackService
@@ -59,9 +62,83 @@ def get_event_service(session: AsyncSession = Depends(db_helper.scoped_session_d
     return EventService(session)
 
 
-def get_event_data_service(event: EventInDB = Depends(event_by_id)) -> SingleEventDataService:
-    return SingleEventDataService(event)
+async def event_validators(
+        event_id: Annotated[str, Path],
+        session: AsyncSession = Depends(db_helper.scoped_session_dependency),
+) -> EventValidators:
+    event_service = EventService(session=session)
+    return await event_service.get_validators(event_id)
+
+
+def is_not_modified(request: Request, etag: Optional[str], last_modified: Optional[datetime] = None) -> bool:
+    """
+    Evaluates If-None-Match, or If-Modified-Since when there is no If-None-Match, against the validators.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag is not None and ("*" in tags or etag in tags)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+    return False
+
+
+def event_not_modified(
+        request: Request,
+        response: Response,
+        validators: EventValidators = Depends(event_validators),
+):
+    """
+    Answers 304 when the client has the current version of the event, before the event itself is loaded.
+    """
+    headers = validators.headers()
+    if is_not_modified(request, validators.etag, validators.updated):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+
+
+async def runner_statistics_not_modified(
+        request: Request,
+        response: Response,
+        event_id: Annotated[str, Path],
+        runner_id: Annotated[str, Path],
+        validators: EventValidators = Depends(event_validators),
+        session: AsyncSession = Depends(db_helper.scoped_session_dependency),
+):
+    """
+    Same as event_not_modified for the runner statistics, which also depend on the track of the runner.
+    Tracks are only added and deleted, so the track ID stands for its content.
+    """
+    track_id = await TrackService(session).get_track_id(event_id, runner_id)
+    if not validators.checksum or track_id is None:
+        return
+    headers = {"ETag": f'"{validators.checksum}-{track_id.hex}"'}
+    if is_not_modified(request, headers["ETag"]):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+
+
+async def get_event_data_service(
+        event_id: Annotated[str, Path],
+        validators: EventValidators = Depends(event_validators),
+        session: AsyncSession = Depends(db_helper.scoped_session_dependency),
+) -> SingleEventDataService:
+    event_service = EventService(session=session)
+    return await event_service.get_event_data(event_id, validators.version)
+
+
+def get_event_statistics_service(
+        event_data_service: SingleEventDataService = Depends(get_event_data_service),
+) -> SingleEventStatisticsService:
+    return SingleEventStatisticsService(event_data_service)
 
 
-def get_event_statistics_service(event: EventInDB = Depends(event_by_id)) -> SingleEventStatisticsService:
-    return SingleEventStatisticsService(event)
+def get_leaderboard_service(session: AsyncSession = Depends(db_helper.scoped_session_dependency)) -> LeaderboardService:
+    return LeaderboardService(session)
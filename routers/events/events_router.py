@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, status
+import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, status, UploadFile, File, Form, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import db_helper
 from src.routers.dependencies import get_event_service
-from src.schemas.event.event_schema import EventEndpoint, EventResponse, EventUpdate
+from src.schemas.event.event_schema import EventEndpoint, EventResponse, EventUpdate, EventImportStatus, EventPage
 from src.services.event.event_service import EventService
+from src.services.event.subservices.parser.telemetry import metrics_registry
+from src.services.single_event_data.event_data_cache import event_data_cache
 
 # Create a FastAPI router for event-related endpoints
 event_router = APIRouter()
@@ -12,9 +17,34 @@ event_router = APIRouter()
 # Define a dependency to get EventService with injected session
 
 
+@event_router.get("/", response_model=EventPage, status_code=status.HTTP_200_OK)
+async def list_events(
+        limit: int = Query(50, ge=1, le=500),
+        cursor: Optional[str] = None,
+        date_from: Optional[datetime.date] = None,
+        date_to: Optional[datetime.date] = None,
+        service: EventService = Depends(get_event_service)
+) -> EventPage:
+    """
+    List events, newest first. Only the event metadata is returned, not the results.
+
+    Args:
+        limit (int): Page size.
+        cursor (str, optional): The next_cursor of the previous page.
+        date_from (datetime.date, optional): First event date to include.
+        date_to (datetime.date, optional): Last event date to include.
+        service (EventService, optional): The EventService instance with the database session injected.
+
+    Returns:
+        EventPage: A page of events and the cursor of the next one.
+    """
+    return await service.get_page(limit=limit, cursor=cursor, date_from=date_from, date_to=date_to)
+
 @event_router.post("/", response_model=EventResponse, status_code=status.HTTP_201_CREATED)
 async def create_event(
         event_input: EventEndpoint,
+        refresh: bool = False,
+        debug: bool = False,
         service: EventService = Depends(get_event_service)
 ) -> EventResponse:
     """
@@ -22,12 +52,78 @@ async def create_event(
 
     Args:
         event_input (EventEndpoint): The input data for creating a new event.
+        refresh (bool): If the event already exists, refetch its source and update the changed groups.
+        debug (bool): Attach the import telemetry (stage timings and counters) to the response.
+        service (EventService, optional): The EventService instance with the database session injected.
+
+    Returns:
+        EventResponse: The created event's response data.
+    """
+    event = await service.create(data_from_api=event_input, refresh=refresh)
+    return EventResponse(**event.model_dump(), debug=service.trace.to_schema() if debug else None)
+
+@event_router.post("/upload", response_model=EventResponse, status_code=status.HTTP_201_CREATED)
+async def upload_event(
+        title: str = Form(),
+        date: datetime.date = Form(),
+        file: UploadFile = File(),
+        debug: bool = False,
+        service: EventService = Depends(get_event_service)
+) -> EventResponse:
+    """
+    Create a new event from an uploaded protocol file (HTML or IOF XML).
+
+    Args:
+        title (str): The event title.
+        date (datetime.date): The event date.
+        file (UploadFile): The protocol file.
+        debug (bool): Attach the import telemetry (stage timings and counters) to the response.
         service (EventService, optional): The EventService instance with the database session injected.
 
     Returns:
         EventResponse: The created event's response data.
     """
-    return await service.create(data_from_api=event_input)
+    event = await service.create_from_file(title=title, event_date=date, source_file=file)
+    return EventResponse(**event.model_dump(), debug=service.trace.to_schema() if debug else None)
+
+@event_router.post("/bulk", response_model=List[EventImportStatus], status_code=status.HTTP_200_OK)
+async def create_events(
+        events_input: List[EventEndpoint],
+        debug: bool = False,
+        service: EventService = Depends(get_event_service)
+) -> List[EventImportStatus]:
+    """
+    Import a batch of events at once.
+
+    Args:
+        events_input (List[EventEndpoint]): The input data for every event to import.
+        debug (bool): Attach the import telemetry of every created event to its status.
+        service (EventService, optional): The EventService instance with the database session injected.
+
+    Returns:
+        List[EventImportStatus]: Per-item import status (created, exists, duplicate or failed), in input order.
+    """
+    return await service.create_many(data_from_api=events_input, debug=debug)
+
+@event_router.get("/metrics", status_code=status.HTTP_200_OK)
+async def import_metrics() -> dict:
+    """
+    Import telemetry aggregated in this process since it started.
+
+    Returns:
+        dict: Per punching system: number of imports, stage timings (count, total, mean, max seconds) and counters.
+    """
+    return metrics_registry.snapshot()
+
+@event_router.get("/metrics/cache", status_code=status.HTTP_200_OK)
+async def event_cache_metrics() -> dict:
+    """
+    State of the decoded event cache of this process.
+
+    Returns:
+        dict: Number of entries, their size and the limit in bytes, hits, misses and evictions.
+    """
+    return event_data_cache.snapshot()
 
 @event_router.patch("/{event_id}", response_model=EventResponse, status_code=status.HTTP_200_OK)
 async def update_event(
@@ -1,15 +1,24 @@
-from fastapi import APIRouter, Depends
-from typing import List
+from fastapi import APIRouter, Depends, Response, Query
+from typing import List, Optional
 
 from src.schemas.event.event_schema import EventInDB
 from src.schemas.single_event_data.single_event_data_schema import EventOutput, GroupOutput, CourseOutput, RunnerOutput, LegOutput
-from src.routers.dependencies import event_by_id, get_event_data_service
+from src.routers.dependencies import event_by_id, get_event_data_service, event_not_modified
 from ...services.single_event_data.single_event_data_service import SingleEventDataService
 
 # Create a FastAPI router for event data-related endpoints
-event_data_router = APIRouter()
+event_data_router = APIRouter(dependencies=[Depends(event_not_modified)])
+# Responses are JSON rendered by the service (see SingleEventDataService.get_event_json),
+# response_model only documents them. Conditional requests are answered by event_not_modified.
 
 
+def json_response(service: SingleEventDataService, content: bytes, next_cursor: Optional[str] = None) -> Response:
+    headers = service.validators.headers()
+    if next_cursor:
+        # List endpoints stay JSON arrays, the cursor of the next page goes to a header
+        headers["X-Next-Cursor"] = next_cursor
+    return Response(content, media_type="application/json", headers=headers)
+
 
 # Retrieve full event data
 @event_data_router.get("/{event_id}", response_model=EventOutput)
@@ -28,7 +37,7 @@ async def get_event(
     Returns:
         EventOutput: Complete event data including groups, runners, courses, and legs.
     """
-    return service.get_event(nesting_level)
+    return json_response(service, service.get_event_json(nesting_level))
 
 # Retrieve a specific group within the event
 @event_data_router.get("/{event_id}/groups/{group_id}", response_model=GroupOutput)
@@ -49,13 +58,16 @@ async def get_group(
     Returns:
         GroupOutput: Detailed group data.
     """
-    return service.get_group(group_id=group_id, nesting_level=nesting_level)
+    return json_response(service, service.get_group_json(group_id=group_id, nesting_level=nesting_level))
 
 # Retrieve all groups within the event
 @event_data_router.get("/{event_id}/groups", response_model=List[GroupOutput])
 async def get_groups(
         service: SingleEventDataService = Depends(get_event_data_service),
-        nesting_level: int = 0
+        nesting_level: int = 0,
+        limit: int = Query(None, ge=1),
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
 ):
     """
     Retrieves a list of all groups within the event.
@@ -64,11 +76,16 @@ async def get_groups(
         service (SingleEventDataService): The event data service with injected event data.
         nesting_level (int, optional): The level of nesting for group details (runners and courses).
                                        Default is 0 (no nesting).
+        limit (int, optional): Page size, all the groups if not set.
+        cursor (str, optional): X-Next-Cursor header of the previous page.
+        fields (str, optional): Comma-separated fields to include, e.g. "id,name".
 
     Returns:
         List[GroupOutput]: A list of all group data within the event.
     """
-    return service.get_groups(nesting_level)
+    fields = service.parse_fields(GroupOutput, fields)
+    ids, next_cursor = service.get_page("groups", limit, cursor)
+    return json_response(service, service.get_groups_json(nesting_level, ids, fields), next_cursor)
 
 # Retrieve a specific course within the event
 @event_data_router.get("/{event_id}/courses/{course_id}", response_model=CourseOutput)
@@ -88,13 +105,16 @@ async def get_course(
     Returns:
         CourseOutput: Detailed course data.
     """
-    return service.get_course(course_id=course_id, nesting_level=nesting_level)
+    return json_response(service, service.get_course_json(course_id=course_id, nesting_level=nesting_level))
 
 # Retrieve all courses within the event
 @event_data_router.get("/{event_id}/courses", response_model=List[CourseOutput])
 async def get_courses(
         service: SingleEventDataService = Depends(get_event_data_service),
-        nesting_level: int = 0
+        nesting_level: int = 0,
+        limit: int = Query(None, ge=1),
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
 ):
     """
     Retrieves a list of all courses within the event.
@@ -102,11 +122,16 @@ async def get_courses(
     Args:
         service (SingleEventDataService): The event data service with injected event data.
         nesting_level (int, optional): The level of nesting for course details (legs). Default is 0 (no nesting).
+        limit (int, optional): Page size, all the courses if not set.
+        cursor (str, optional): X-Next-Cursor header of the previous page.
+        fields (str, optional): Comma-separated fields to include, e.g. "id,points".
 
     Returns:
         List[CourseOutput]: A list of all course data within the event.
     """
-    return service.get_courses(nesting_level)
+    fields = service.parse_fields(CourseOutput, fields)
+    ids, next_cursor = service.get_page("courses", limit, cursor)
+    return json_response(service, service.get_courses_json(nesting_level, ids, fields), next_cursor)
 
 # Retrieve a specific runner within the event
 @event_data_router.get("/{event_id}/runners/{runner_id}", response_model=RunnerOutput)
@@ -126,13 +151,16 @@ async def get_runner(
     Returns:
         RunnerOutput: Detailed runner data.
     """
-    return service.get_runner(runner_id=runner_id, nesting_level=nesting_level)
+    return json_response(service, service.get_runner_json(runner_id=runner_id, nesting_level=nesting_level))
 
 # Retrieve all runners within the event
 @event_data_router.get("/{event_id}/runners", response_model=List[RunnerOutput])
 async def get_runners(
         service: SingleEventDataService = Depends(get_event_data_service),
-        nesting_level: int = 0
+        nesting_level: int = 0,
+        limit: int = Query(None, ge=1),
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
 ):
     """
     Retrieves a list of all runners within the event.
@@ -140,11 +168,16 @@ async def get_runners(
     Args:
         service (SingleEventDataService): The event data service with injected event data.
         nesting_level (int, optional): The level of nesting for runner details (course). Default is 0 (no nesting).
+        limit (int, optional): Page size, all the runners if not set.
+        cursor (str, optional): X-Next-Cursor header of the previous page.
+        fields (str, optional): Comma-separated fields to include, e.g. "id,name,surname".
 
     Returns:
         List[RunnerOutput]: A list of all runner data within the event.
     """
-    return service.get_runners(nesting_level)
+    fields = service.parse_fields(RunnerOutput, fields)
+    ids, next_cursor = service.get_page("runners", limit, cursor)
+    return json_response(service, service.get_runners_json(nesting_level, ids, fields), next_cursor)
 
 # Retrieve a specific leg within the event
 @event_data_router.get("/{event_id}/legs/{leg_id}", response_model=LegOutput)
@@ -162,20 +195,28 @@ async def get_leg(
     Returns:
         LegOutput: Detailed leg data.
     """
-    return service.get_leg(leg_id)
+    return json_response(service, service.get_leg_json(leg_id))
 
 # Retrieve all legs within the event
 @event_data_router.get("/{event_id}/legs", response_model=List[LegOutput])
 async def get_legs(
-        service: SingleEventDataService = Depends(get_event_data_service)
+        service: SingleEventDataService = Depends(get_event_data_service),
+        limit: int = Query(None, ge=1),
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
 ):
     """
     Retrieves a list of all legs within the event.
 
     Args:
         service (SingleEventDataService): The event data service with injected event data.
+        limit (int, optional): Page size, all the legs if not set.
+        cursor (str, optional): X-Next-Cursor header of the previous page.
+        fields (str, optional): Comma-separated fields to include, e.g. "id,start".
 
     Returns:
         List[LegOutput]: A list of all leg data within the event.
     """
-    return service.get_legs()
+    fields = service.parse_fields(LegOutput, fields)
+    ids, next_cursor = service.get_page("legs", limit, cursor)
+    return json_response(service, service.get_legs_json(ids, fields), next_cursor)
@@ -1,9 +1,12 @@
 from datetime import datetime
+from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
-from src.routers.dependencies import get_event_statistics_service, get_geosplit_service
+from src.routers.dependencies import get_event_statistics_service, get_geosplit_service, get_leaderboard_service, \
+    event_not_modified, runner_statistics_not_modified
 from src.schemas.single_event_statistics.single_event_statistics_schema import RunnerStatistics, LeaderBoard
+from src.services.single_event_statistics.leaderboard_service import LeaderboardService
 from src.services.single_event_statistics.statistics_service import SingleEventStatisticsService
 # Create a FastAPI router for event statistics
 from src.services.single_event_statistics.subservices.geosplit.geosplit_service import GeoSplitService
@@ -12,7 +15,8 @@ event_statistics_router = APIRouter()
 
 
 # Retrieve the statistics for a specific runner
-@event_statistics_router.get("/{event_id}/statistics/runners/{runner_id}", response_model=RunnerStatistics)
+@event_statistics_router.get("/{event_id}/statistics/runners/{runner_id}", response_model=RunnerStatistics,
+                             dependencies=[Depends(runner_statistics_not_modified)])
 async def get_runner_stats(
         runner_id: str,
         filter: str = None,
@@ -37,63 +41,78 @@ async def get_runner_stats(
     return runner_stat
 
 # Retrieve the leaderboard for a specific group
-@event_statistics_router.get("/{event_id}/statistics/groups/{group_id}/leaderboard", response_model=LeaderBoard)
+@event_statistics_router.get("/{event_id}/statistics/groups/{group_id}/leaderboard", response_model=LeaderBoard,
+                             dependencies=[Depends(event_not_modified)])
 async def get_group_leaderboard(
-        group_id: str,
-        service: SingleEventStatisticsService = Depends(get_event_statistics_service)
+        event_id: UUID,
+        group_id: UUID,
+        limit: int = Query(None, ge=1),
+        service: LeaderboardService = Depends(get_leaderboard_service)
 ) -> LeaderBoard:
     """
     Retrieve the leaderboard for a specific group in a particular event.
 
     Args:
-        group_id (str): The ID of the group whose leaderboard is being retrieved.
-        service (SingleEventStatisticsService): The event statistics service with injected event data.
+        event_id (UUID): The ID of the event.
+        group_id (UUID): The ID of the group whose leaderboard is being retrieved.
+        limit (int, optional): Number of leading runners to return, all by default.
+        service (LeaderboardService): The leaderboard service with the database session injected.
 
     Returns:
         LeaderBoard: A LeaderBoard object containing the ranking of runners in the group.
     """
-    return service.get_group_leaderboard(group_id)
+    return await service.get_group_leaderboard(event_id, group_id, limit)
 
 
 # Retrieve the leaderboard for a specific leg
-@event_statistics_router.get("/{event_id}/statistics/legs/{leg_id}/leaderboard", response_model=LeaderBoard)
+@event_statistics_router.get("/{event_id}/statistics/legs/{leg_id}/leaderboard", response_model=LeaderBoard,
+                             dependencies=[Depends(event_not_modified)])
 async def get_leg_leaderboard(
-        leg_id: str,
-        group_id: str = None,
-        service: SingleEventStatisticsService = Depends(get_event_statistics_service)
+        event_id: UUID,
+        leg_id: UUID,
+        group_id: UUID = None,
+        limit: int = Query(None, ge=1),
+        service: LeaderboardService = Depends(get_leaderboard_service)
 ) -> LeaderBoard:
     """
     Retrieve the leaderboard for a specific leg in a particular event.
     Optionally, filter by group.
 
     Args:
-        leg_id (str): The ID of the leg whose leaderboard is being retrieved.
-        group_id (str, optional): The ID of the group to filter the leaderboard by (if applicable).
-        service (SingleEventStatisticsService): The event statistics service with injected event data.
+        event_id (UUID): The ID of the event.
+        leg_id (UUID): The ID of the leg whose leaderboard is being retrieved.
+        group_id (UUID, optional): The ID of the group to filter the leaderboard by (if applicable).
+        limit (int, optional): Number of leading runners to return, all by default.
+        service (LeaderboardService): The leaderboard service with the database session injected.
 
     Returns:
         LeaderBoard: A LeaderBoard object containing the ranking of runners in the leg.
     """
-    return service.get_leg_leaderboard(leg_id, group_id)
+    return await service.get_leg_leaderboard(event_id, leg_id, group_id, limit)
 
 
 # Retrieve the leaderboard for a specific course
-@event_statistics_router.get("/{event_id}/statistics/courses/{course_id}/leaderboard", response_model=LeaderBoard)
+@event_statistics_router.get("/{event_id}/statistics/courses/{course_id}/leaderboard", response_model=LeaderBoard,
+                             dependencies=[Depends(event_not_modified)])
 async def get_course_leaderboard(
-        course_id: str,
-        group_id: str = None,
-        service: SingleEventStatisticsService = Depends(get_event_statistics_service)
+        event_id: UUID,
+        course_id: UUID,
+        group_id: UUID = None,
+        limit: int = Query(None, ge=1),
+        service: LeaderboardService = Depends(get_leaderboard_service)
 ) -> LeaderBoard:
     """
     Retrieve the leaderboard for a specific course in a particular event.
     Optionally, filter by group.
 
     Args:
-        course_id (str): The ID of the course whose leaderboard is being retrieved.
-        group_id (str, optional): The ID of the group to filter the leaderboard by (if applicable).
-        service (SingleEventStatisticsService): The event statistics service with injected event data.
+        event_id (UUID): The ID of the event.
+        course_id (UUID): The ID of the course whose leaderboard is being retrieved.
+        group_id (UUID, optional): The ID of the group to filter the leaderboard by (if applicable).
+        limit (int, optional): Number of leading runners to return, all by default.
+        service (LeaderboardService): The leaderboard service with the database session injected.
 
     Returns:
         LeaderBoard: A LeaderBoard object containing the ranking of runners in the course.
     """
-    return service.get_course_leaderboard(course_id, group_id)
+    return await service.get_course_leaderboard(event_id, course_id, group_id, limit)
@@ -31,11 +31,11 @@ async def create_track(event_id: str, runner_id: str,
 
 # Endpoint for retrieving all tracks
 @track_router.get("/{event_id}/tracks", response_model=List[TrackResponse])
-async def get_all_tracks(service: TrackService = Depends(get_track_service)):
+async def get_all_tracks(event_id: UUID, service: TrackService = Depends(get_track_service)):
     """
-    Get a list of all tracks.
+    Get a list of all tracks of an event.
     """
-    return await service.get_all()
+    return await service.get_by_event(event_id)
 
 
 # Endpoint for retrieving a specific track by its ID
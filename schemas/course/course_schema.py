@@ -0,0 +1,15 @@
+from typing import Dict
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class CourseInput(BaseModel):
+    event: UUID = None
+    points: Dict[int, UUID] = None
+
+
+class CourseInDB(BaseModel):
+    id: UUID
+    event: UUID
+    points: Dict[int, UUID]
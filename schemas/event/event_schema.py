@@ -1,4 +1,6 @@
-from datetime import datetime, date
+from datetime import datetime, date, timezone
+from email.utils import format_datetime
+from typing import Optional, Dict, List
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -16,6 +18,8 @@ class EventInput(BaseModel):
     legs: str = None
     runners: str = None
     results: str = None
+    split_matrix: bytes = None
+    checksum: str = None
 
 
 class EventInDB(BaseModel):
@@ -31,6 +35,28 @@ class EventInDB(BaseModel):
     legs: str
     runners: str
     results: str
+    split_matrix: Optional[bytes] = None
+    version: int = 1
+    checksum: Optional[str] = None
+    updated: Optional[datetime] = None
+
+
+class EventValidators(BaseModel):
+    version: int
+    checksum: Optional[str] = None
+    updated: Optional[datetime] = None  # UTC
+
+    @property
+    def etag(self) -> Optional[str]:
+        return f'"{self.checksum}"' if self.checksum else None
+
+    def headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.checksum:
+            headers["ETag"] = self.etag
+        if self.updated:
+            headers["Last-Modified"] = format_datetime(self.updated.replace(tzinfo=timezone.utc), usegmt=True)
+        return headers
 
 
 class EventEndpoint(BaseModel):
@@ -43,10 +69,30 @@ class EventUpdate(BaseModel):
     source: str = None
     date: datetime = None
 
+class ImportTelemetry(BaseModel):
+    system: Optional[str] = None
+    stages: Dict[str, float] = {}  # seconds
+    counters: Dict[str, int] = {}
+
+
 class EventResponse(BaseModel):
     id: UUID
     title: str
     source: str
     count: int
     status: bool
-    date: datetime
\ No newline at end of file
+    date: datetime
+    debug: Optional[ImportTelemetry] = None
+
+
+class EventPage(BaseModel):
+    items: List[EventResponse]
+    next_cursor: Optional[str] = None  # None on the last page
+
+
+class EventImportStatus(BaseModel):
+    source: str
+    status: str  # created | exists | duplicate | failed
+    event: Optional[EventResponse] = None
+    detail: Optional[str] = None
+    debug: Optional[ImportTelemetry] = None
@@ -0,0 +1,14 @@
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class GroupInput(BaseModel):
+    event: UUID = None
+    name: str = None
+
+
+class GroupInDB(BaseModel):
+    id: UUID
+    event: UUID
+    name: str
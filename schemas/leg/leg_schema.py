@@ -0,0 +1,16 @@
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class LegInput(BaseModel):
+    event: UUID = None
+    start: int = None
+    end: int = None
+
+
+class LegInDB(BaseModel):
+    id: UUID
+    event: UUID
+    start: int
+    end: int
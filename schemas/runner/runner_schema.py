@@ -0,0 +1,21 @@
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class RunnerInput(BaseModel):
+    event: UUID = None
+    group: UUID = None
+    course: UUID = None
+    name: str = None
+    result: Optional[int] = None  # seconds
+
+
+class RunnerInDB(BaseModel):
+    id: UUID
+    event: UUID
+    group: UUID
+    course: UUID
+    name: str
+    result: Optional[int] = None
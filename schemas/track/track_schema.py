@@ -8,7 +8,7 @@ class TrackData(BaseModel):
     distance: float
     elevation: float
     duration: float
-    points: list
+    points: bytes  # see src.database.track_points
 
 
 class TrackInput(BaseModel):
@@ -17,7 +17,7 @@ class TrackInput(BaseModel):
     distance: float
     elevation: float
     duration: float
-    points: list
+    points: bytes  # see src.database.track_points
 
 
 class TrackInDB(BaseModel):
@@ -27,11 +27,8 @@ class TrackInDB(BaseModel):
     distance: float
     elevation: float
     duration: float
-    points: list
-
-    @property
-    def points_count(self):
-        return len(self.points)
+    points: bytes  # see src.database.track_points
+    points_count: int
 
 
 class TrackResponse(BaseModel):
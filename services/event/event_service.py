@@ -1,12 +1,22 @@
+import asyncio
+from datetime import date
 from typing import List
 from uuid import UUID
 
-from fastapi import HTTPException
+from fastapi import HTTPException, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.repositories.event.event_repository import EventRepository
-from src.schemas.event.event_schema import EventInDB, EventEndpoint, EventUpdate
-from src.services.event.subservices.parser.parser import Parser
+from src.database.event_checksum import event_checksum
+from src.repositories.event.event_repository import EventRepository, normalize_source, PAGE_SIZE
+from src.schemas.event.event_schema import EventInDB, EventEndpoint, EventUpdate, EventInput, EventImportStatus, \
+    EventResponse, EventPage, EventValidators
+from src.services.event.single_flight import import_flights
+from src.services.event.subservices.parser.parser import Parser, UPLOAD_SOURCE
+from src.services.event.subservices.parser.parser_pool import ParserQueueFull, parser_pool
+from src.services.event.subservices.parser.src.web_parse import get_source
+from src.services.event.subservices.parser.telemetry import ImportTrace, tracing, stage, metrics_registry
+from src.services.single_event_data.event_data_cache import event_data_cache
+from src.services.single_event_data.single_event_data_service import SingleEventDataService
 
 
 class EventService:
@@ -16,44 +26,280 @@ class EventService:
 
     def __init__(self, session: AsyncSession):
         self.repository = EventRepository(session)
+        self.trace = ImportTrace()  # stages and counters of the last import made by this service
 
-    async def create(self, data_from_api: EventEndpoint) -> EventInDB:
+    async def create(self, data_from_api: EventEndpoint, refresh: bool = False) -> EventInDB:
+        """
+        Imports an event from its source link, or returns the stored one.
+        Concurrent imports of the same source are done once: requests in this process wait for
+        the running import and get its event. Other workers may fetch and parse the source too,
+        but the check and the insert run under the advisory lock of the source, so only one event is stored.
+
+        Args:
+            data_from_api (EventEndpoint): The event to import.
+            refresh (bool): If the event already exists, refetch its source and update the changed groups.
+
+        Returns:
+            EventInDB: The created, refreshed or existing event.
+        """
+        link = normalize_source(data_from_api.source)
+        return await import_flights.run((link, refresh), lambda: self.import_source(data_from_api, refresh))
+
+    async def import_source(self, data_from_api: EventEndpoint, refresh: bool = False) -> EventInDB:
         # TODO: add EventEndpoint data validation
         # Check if event exist
         exist = await self.repository.get_by_source_link(data_from_api.source)
+        # The source is fetched and parsed without holding a database connection
+        await self.repository.release()
         if exist:
-            return exist
+            return await self.refresh(exist) if refresh else exist
 
         # Parse data from link
         parser = Parser()
-        event = parser.parse(source_link=data_from_api.source)
+        with tracing(self.trace):
+            try:
+                event = await parser.parse(source_link=data_from_api.source)
+            except ParserQueueFull as e:
+                raise HTTPException(status_code=503, detail=str(e))
+
+            # Update EventInput object and add to db, unless another worker has stored it meanwhile
+            self.fill_event(event, data_from_api)
+            with stage('db_insert'):
+                await self.repository.lock_source(data_from_api.source)
+                exist = await self.repository.get_by_source_link(data_from_api.source)
+                if exist:
+                    await self.repository.release()
+                    return exist
+                event_from_db = await self.repository.create(event)
+        metrics_registry.record(self.trace)
+        return event_from_db
+
+    async def create_from_file(self, title: str, event_date: date, source_file: UploadFile) -> EventInDB:
+        """
+        Imports an event from an uploaded protocol file (HTML or IOF XML).
+        The same file uploaded twice returns the existing event.
+
+        Args:
+            title (str): Event title.
+            event_date (date): Event date.
+            source_file (UploadFile): The uploaded protocol.
+
+        Returns:
+            EventInDB: The created or the existing event.
+        """
+        parser = Parser()
+        with tracing(self.trace):
+            try:
+                event = await parser.parse(source_file=source_file)
+            except ParserQueueFull as e:
+                raise HTTPException(status_code=503, detail=str(e))
+            except ValueError as e:
+                raise HTTPException(status_code=422, detail=str(e))
+
+            exist = await self.repository.get_by_source_link(event.source)
+            if exist:
+                return exist
+            self.fill_event(event, EventEndpoint(title=title, source=event.source, date=event_date))
+            with stage('db_insert'):
+                event_from_db = await self.repository.create(event)
+        metrics_registry.record(self.trace)
+        return event_from_db
+
+    async def create_many(self, data_from_api: List[EventEndpoint], debug: bool = False) -> List[EventImportStatus]:
+        """
+        Imports a batch of events: sources are fetched concurrently (limited per host),
+        parsed in the parser pool and inserted in batched transactions.
+
+        Args:
+            data_from_api (List[EventEndpoint]): Events to import.
+            debug (bool): Attach the import telemetry of every created event to its status.
+
+        Returns:
+            List[EventImportStatus]: Import status of every item, in input order.
+        """
+        statuses: List[EventImportStatus] = [None] * len(data_from_api)
+        links = [normalize_source(item.source) for item in data_from_api]
+
+        # Check which events already exist with one query
+        existing = await self.repository.get_by_source_links(links)
+        to_import = {}
+        for n, (item, link) in enumerate(zip(data_from_api, links)):
+            if link in existing:
+                statuses[n] = EventImportStatus(source=item.source, status="exists", event=existing[link])
+            elif link in to_import:
+                statuses[n] = EventImportStatus(source=item.source, status="duplicate")
+            else:
+                to_import[link] = n
+
+        # Fetch and parse new sources concurrently, taking at most one parser worker slot per worker
+        parser = Parser()
+        parse_slots = asyncio.Semaphore(parser_pool.workers)
+
+        traces = {n: ImportTrace() for n in to_import.values()}
+
+        async def import_event(n: int) -> EventInput:
+            item = data_from_api[n]
+            with tracing(traces[n]):
+                content, content_type = await get_source(item.source)
+                async with parse_slots:
+                    event = await parser.parse_content(content, content_type, item.source)
+            return self.fill_event(event, item)
+
+        indexes = list(to_import.values())
+        parsed = await asyncio.gather(*[import_event(n) for n in indexes], return_exceptions=True)
+
+        events, created_indexes = [], []
+        for n, result in zip(indexes, parsed):
+            if isinstance(result, Exception):
+                statuses[n] = EventImportStatus(source=data_from_api[n].source, status="failed", detail=str(result))
+            else:
+                events.append(result)
+                created_indexes.append(n)
 
-        # Update EventInput object and add to db
+        # The batch insert time is shared evenly by the events inserted together
+        insert = ImportTrace()
+        with insert.stage('db_insert'):
+            created = await self.repository.create_many(events)
+
+        inserted = [(n, event) for n, event in zip(created_indexes, created) if event is not None]
+        for n, event in inserted:
+            traces[n].stages['db_insert'] = insert.stages['db_insert'] / len(inserted)
+            statuses[n] = EventImportStatus(source=data_from_api[n].source, status="created",
+                                            event=EventResponse(**event.model_dump()),
+                                            debug=traces[n].to_schema() if debug else None)
+
+        # Events imported meanwhile by another request are reported as existing
+        skipped = [n for n, event in zip(created_indexes, created) if event is None]
+        if skipped:
+            existing = await self.repository.get_by_source_links([links[n] for n in skipped])
+            for n in skipped:
+                statuses[n] = EventImportStatus(source=data_from_api[n].source, status="exists",
+                                                event=existing.get(links[n]))
+        for trace in traces.values():
+            metrics_registry.record(trace)
+        return statuses
+
+    async def refresh(self, stored: EventInDB) -> EventInDB:
+        """
+        Refetches the source of a stored event (e.g. live results republished during a race)
+        and merges the groups that changed. IDs of unchanged entities stay valid.
+
+        Args:
+            stored (EventInDB): The stored event.
+
+        Returns:
+            EventInDB: The refreshed event, or the stored one if the protocol has not changed.
+        """
+        if stored.source.startswith(UPLOAD_SOURCE):
+            raise HTTPException(status_code=400, detail="Uploaded events can't be refreshed")
+        parser = Parser()
+        with tracing(self.trace):
+            try:
+                event = await parser.refresh(stored)
+            except ParserQueueFull as e:
+                raise HTTPException(status_code=503, detail=str(e))
+            except ValueError as e:
+                raise HTTPException(status_code=422, detail=str(e))
+            if event is None:
+                return stored
+            content = event.model_dump(include={"count", "splits", "results", "courses", "groups", "runners", "legs"})
+            event.checksum = event_checksum(stored.model_copy(update=content))
+            with stage('db_insert'):
+                refreshed = await self.repository.update_entities(await self.repository.get_by_id(stored.id), event)
+        event_data_cache.invalidate(stored.id)
+        metrics_registry.record(self.trace)
+        return refreshed
+
+    @staticmethod
+    def fill_event(event: EventInput, data_from_api: EventEndpoint) -> EventInput:
         event.title = data_from_api.title
         event.date = data_from_api.date
-        event.source = data_from_api.source
-        event_from_db = await self.repository.create(event)
-        return event_from_db
+        event.source = normalize_source(data_from_api.source)
+        event.checksum = event_checksum(event)
+        return event
 
     async def get_all(self) -> List[EventInDB]:
         return await self.repository.get_all()
 
+    async def get_page(self, limit: int = PAGE_SIZE, cursor: str = None, date_from: date = None,
+                       date_to: date = None) -> EventPage:
+        """
+        Lists events, newest first, without their results.
+
+        Args:
+            limit (int): Page size.
+            cursor (str, optional): next_cursor of the previous page.
+            date_from (date, optional): First event date to include.
+            date_to (date, optional): Last event date to include.
+
+        Returns:
+            EventPage: The events and the cursor of the next page.
+        """
+        try:
+            events, next_cursor = await self.repository.get_page(limit, cursor, date_from, date_to)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return EventPage(items=events, next_cursor=next_cursor)
+
     async def get_event(self, _id: UUID) -> EventInDB:
         event = await self.repository.get_event(_id)
         if not event:
             raise HTTPException(status_code=404, detail="Event not found")
         return event
 
+    async def get_validators(self, _id: UUID) -> EventValidators:
+        """
+        Reads the version, checksum and modification time of the event, without its content.
+
+        Args:
+            _id (UUID): ID of the event.
+
+        Returns:
+            EventValidators: The validators of the event.
+        """
+        try:
+            _id = UUID(str(_id))
+        except ValueError:
+            raise HTTPException(status_code=404, detail="Event not found")
+        validators = await self.repository.get_validators(_id)
+        if validators is None:
+            raise HTTPException(status_code=404, detail="Event not found")
+        return validators
+
+    async def get_event_data(self, _id: UUID, version: int = None) -> SingleEventDataService:
+        """
+        Returns the decoded event, from event_data_cache unless the event has changed since it was cached.
+
+        Args:
+            _id (UUID): ID of the event.
+            version (int, optional): Current version of the event, read from the database if not given.
+
+        Returns:
+            SingleEventDataService: The event data service of the current version of the event.
+        """
+        if version is None:
+            version = (await self.get_validators(_id)).version
+        _id = UUID(str(_id))
+        service = event_data_cache.get(_id, version)
+        if service is None:
+            event = await self.get_event(_id)
+            service = SingleEventDataService(event)
+            event_data_cache.put(_id, event.version, service)
+        return service
+
     async def update(self, _id: UUID, data: EventUpdate) -> EventInDB:
         event = await self.repository.get_by_id(_id)
         if not event:
             raise HTTPException(status_code=404, detail="Event not found")
-        updated_event = await self.repository.update(event, data)
+        checksum = event_checksum(EventInDB(**event.__dict__).model_copy(update=data.model_dump(exclude_none=True)))
+        updated_event = await self.repository.update(event, data, checksum)
+        event_data_cache.invalidate(updated_event.id)
         return updated_event
 
     async def delete(self, _id: UUID) -> bool:
         event = await self.repository.get_by_id(_id)
         if not event:
             raise HTTPException(status_code=404, detail="Event not found")
+        event_data_cache.invalidate(event.id)
         return await self.repository.delete(event)
 
@@ -0,0 +1,51 @@
+import asyncio
+from typing import Dict, Callable, Awaitable, Any, Hashable
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time in this process: callers that come while a call
+    for their key is running wait for it and get its result (or its exception) instead of
+    repeating the work.
+    """
+
+    def __init__(self):
+        self.calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Args:
+            key (Hashable): Key of the call.
+            func (Callable[[], Awaitable[Any]]): Does the work, called only if no call for key is running.
+
+        Returns:
+            Any: Result of func, or of the running call for the same key.
+        """
+        while (call := self.calls.get(key)) is not None:
+            try:
+                # Shielded, so a cancelled waiter does not cancel the call
+                return await asyncio.shield(call)
+            except asyncio.CancelledError:
+                if not call.cancelled():
+                    raise
+                # The caller that was doing the work was cancelled, try again
+
+        call = self.calls[key] = asyncio.get_running_loop().create_future()
+        # Nobody may be waiting for the call: mark its exception as retrieved
+        call.add_done_callback(lambda f: f.cancelled() or f.exception())
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            del self.calls[key]
+
+
+import_flights = SingleFlight()  # event imports by normalized source and refresh flag
@@ -1,8 +1,101 @@
+import asyncio
+import json
+import os
+from typing import Optional, Tuple
+
 from fastapi import UploadFile
+from pandas import DataFrame
 
-from src.schemas.event.event_schema import EventInput
+from src.schemas.event.event_schema import EventInput, EventInDB
+from src.services.event.subservices.parser.parser_pool import parser_pool
+from src.services.event.subservices.parser.protocol_cache import protocol_cache
+from src.services.event.subservices.parser.src.group_blocks import GroupBlocks
 from src.services.event.subservices.parser.src.init_db_entities import init_event_entities
-from src.services.event.subservices.parser.src.web_parse import parse_event, get_source
+from src.services.event.subservices.parser.src.merge_entities import merge_event_entities
+from src.services.event.subservices.parser.src.web_parse import parse_page, get_source, parse_stream, file_parse
+from src.services.event.subservices.parser.telemetry import stage, count, traced, merge_trace
+
+UPLOAD_SOURCE = "upload:"  # source of uploaded protocols, followed by the content hash
+
+
+def parse_source(content: bytes, content_type: str, source_name: str) -> EventInput:
+    """
+    Parses a fetched page into an EventInput. Runs inside a parser worker process.
+
+    Args:
+        content (bytes): Raw page content.
+        content_type (str): Content-Type of the page, used to pick the encoding.
+        source_name (str): Link or file name, used in error messages.
+
+    Returns:
+        EventInput: Parsed event data encapsulated in the EventInput schema.
+    """
+    try:
+        # Parse the event data into a DataFrame and list of courses
+        event_df, courses = parse_page(content, content_type)
+    except Exception as e:
+        raise ValueError(f"Can't parse {source_name}")
+
+    # Initialize event entities and return the result
+    return event_entities(event_df, courses)
+
+
+def event_entities(event_df: DataFrame, courses: DataFrame) -> EventInput:
+    count('runners', len(event_df))
+    count('legs', max(event_df.shape[1] - 1, 0))
+    count('groups', event_df.index.str.split('^').str[-1].nunique() if len(event_df) else 0)
+    with stage('entities'):
+        return init_event_entities(event_df, courses)
+
+
+def parse_file(path: str, content_type: str, source_name: str) -> EventInput:
+    """
+    Parses an uploaded protocol file into an EventInput. Runs inside a parser worker process.
+
+    Args:
+        path (str): Path of the temporary file with the upload.
+        content_type (str): Content-Type of the upload, used to pick the encoding.
+        source_name (str): File name, used in error messages.
+
+    Returns:
+        EventInput: Parsed event data encapsulated in the EventInput schema.
+    """
+    try:
+        with open(path, 'rb') as file:
+            event_df, courses = parse_stream(file, content_type)
+    except Exception as e:
+        raise ValueError(f"Can't parse {source_name}")
+
+    return event_entities(event_df, courses)
+
+
+def refresh_source(stored: EventInDB, content: bytes, content_type: str,
+                   previous: Optional[Tuple[bytes, str]], source_name: str) -> Optional[EventInput]:
+    """
+    Re-parses only the groups whose blocks changed since the previous version of the page
+    and merges them into the stored event. Runs inside a parser worker process.
+
+    Args:
+        stored (EventInDB): The event as stored in the database.
+        content (bytes): New page content.
+        content_type (str): Content-Type of the new page.
+        previous (Optional[Tuple[bytes, str]]): Previous page content and Content-Type, None if unknown.
+        source_name (str): Link of the source, used in error messages.
+
+    Returns:
+        Optional[EventInput]: The merged event, None if no group has changed.
+    """
+    blocks = GroupBlocks(content, content_type)
+    hashes = blocks.hashes()
+    old_hashes = GroupBlocks(*previous).hashes() if previous else {}
+    changed = [name for name, content_hash in hashes.items() if old_hashes.get(name) != content_hash]
+    stored_groups = {group['name'] for group in json.loads(stored.groups).values()}
+    removed = list(stored_groups - set(hashes))
+    if not changed and not removed:
+        return None
+
+    fresh = parse_source(blocks.page(changed), content_type, source_name) if changed else None
+    return merge_event_entities(stored, fresh, changed + removed)
 
 
 class Parser:
@@ -11,9 +104,21 @@ class Parser:
     and generate an EventInput schema.
     """
 
-    def parse(self, source_link: str = None, source_file: UploadFile = None) -> EventInput:
+    @staticmethod
+    async def run_in_pool(func, *args):
+        """
+        Runs func(*args) in the parser pool. Stages and counters recorded in the worker are added
+        to the current import trace; the 'pool' stage is the wall time of the whole call.
+        """
+        with stage('pool'):
+            result, trace = await parser_pool.run(traced, func, *args)
+        merge_trace(trace)
+        return result
+
+    async def parse(self, source_link: str = None, source_file: UploadFile = None) -> EventInput:
         """
         Parse the event data from the provided source link or file.
+        The page is fetched on the event loop and parsed in the parser process pool.
 
         Args:
             source_link (str): URL link to the event source.
@@ -22,14 +127,96 @@ class Parser:
         Returns:
             EventInput: Parsed event data encapsulated in the EventInput schema.
         """
-        # Fetch the source data from link or file
-        page = get_source(source_link, source_file)
+        if source_file is not None:
+            return await self.parse_upload(source_file)
+        content, content_type = await get_source(source_link)
+        return await self.parse_content(content, content_type, source_link)
+
+    async def parse_upload(self, source_file: UploadFile) -> EventInput:
+        """
+        Parse an uploaded protocol. The upload is copied to a temporary file in chunks and the
+        parser worker reads it from there; the source of the event is the content hash.
+
+        Args:
+            source_file (UploadFile): Uploaded file containing the event data.
+
+        Returns:
+            EventInput: Parsed event data with the source set.
+        """
+        upload = await file_parse(source_file)
         try:
-            # Parse the event data into a DataFrame and list of courses
-            event_df, courses = parse_event(page)
-        except Exception as e:
-            raise ValueError(f"Can't parse {source_link if source_link else source_file.filename}")
+            event = await asyncio.to_thread(protocol_cache.load_result, upload.content_hash)
+            if event is None:
+                event = await self.run_in_pool(parse_file, upload.path, upload.content_type, source_file.filename)
+                await asyncio.to_thread(protocol_cache.store_result, upload.content_hash, event)
+            else:
+                count('memo_hits', 1)
+        finally:
+            os.unlink(upload.path)
+        event.source = UPLOAD_SOURCE + upload.content_hash
+        return event
+
+    async def parse_content(self, content: bytes, content_type: str, source_name: str) -> EventInput:
+        """
+        Parse already fetched page content in the parser process pool.
+        The page is kept in the protocol cache, and a page with the same content is never parsed twice.
 
-        # Initialize event entities and return the result
-        event = init_event_entities(event_df, courses)
+        Args:
+            content (bytes): Raw page content.
+            content_type (str): Content-Type of the page.
+            source_name (str): Link or file name, used in error messages and as the cache key.
+
+        Returns:
+            EventInput: Parsed event data encapsulated in the EventInput schema.
+        """
+        with stage('cache'):
+            content_hash = await asyncio.to_thread(protocol_cache.store_page, source_name, content, content_type)
+            event = await asyncio.to_thread(protocol_cache.load_result, content_hash)
+        if event is None:
+            event = await self.run_in_pool(parse_source, content, content_type, source_name)
+            await asyncio.to_thread(protocol_cache.store_result, content_hash, event)
+        else:
+            count('memo_hits', 1)
+        return event
+
+    async def reparse(self, source_link: str, content_hash: str = None) -> EventInput:
+        """
+        Re-parse a stored page of the source without network access, ignoring the parse memo.
+
+        Args:
+            source_link (str): URL link to the event source.
+            content_hash (str, optional): Version of the page to use. Defaults to the latest fetched one.
+
+        Returns:
+            EventInput: Parsed event data encapsulated in the EventInput schema.
+        """
+        page = await asyncio.to_thread(protocol_cache.load_page, source_link, content_hash)
+        if page is None:
+            raise ValueError(f"{source_link} is not in the protocol cache")
+        content, content_type, content_hash = page
+        event = await self.run_in_pool(parse_source, content, content_type, source_link)
+        await asyncio.to_thread(protocol_cache.store_result, content_hash, event)
+        return event
+
+    async def refresh(self, stored: EventInDB) -> Optional[EventInput]:
+        """
+        Refetch the source of a stored event and re-parse only the groups that changed since
+        the last fetched version. IDs of runners, groups, courses and legs are kept.
+
+        Args:
+            stored (EventInDB): The event as stored in the database.
+
+        Returns:
+            Optional[EventInput]: The refreshed event, None if the protocol has not changed.
+        """
+        content, content_type = await get_source(stored.source)
+        if not content:
+            raise ValueError(f"Can't fetch {stored.source}")
+        previous = await asyncio.to_thread(protocol_cache.load_page, stored.source)
+        if previous is not None and previous[2] == protocol_cache.content_hash(content):
+            return None
+        event = await self.run_in_pool(refresh_source, stored, content, content_type,
+                                       previous[:2] if previous else None, stored.source)
+        # The page becomes the base of the next refresh only once it is merged
+        await asyncio.to_thread(protocol_cache.store_page, stored.source, content, content_type)
         return event
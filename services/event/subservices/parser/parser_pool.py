@@ -0,0 +1,71 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+from src.config import settings
+
+
+class ParserQueueFull(RuntimeError):
+    """
+    Raised when every parser worker is busy and the waiting queue is full.
+    """
+
+
+def warm_up() -> bool:
+    """
+    Worker initializer: pays the pandas/bs4 import cost once per process.
+    """
+    import src.services.event.subservices.parser.src.web_parse  # noqa: F401
+    return True
+
+
+class ParserPool:
+    """
+    Bounded process pool that runs CPU-bound protocol parsing outside the event loop.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = max(workers, 1)
+        self.max_queue = max_queue
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.pending = 0
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=warm_up)
+        return self.executor
+
+    async def start(self):
+        """
+        Starts the workers and waits until every one of them has imported the parsers.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self.get_executor()
+        await asyncio.gather(*[loop.run_in_executor(executor, warm_up) for _ in range(self.workers)])
+
+    async def run(self, func: Callable, *args):
+        """
+        Runs func(*args) in a worker process and returns its result.
+
+        Raises:
+            ParserQueueFull: If workers + max_queue tasks are already in flight.
+        """
+        if self.pending >= self.workers + self.max_queue:
+            raise ParserQueueFull("Parser queue is full, try again later")
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.get_executor(), func, *args)
+        finally:
+            self.pending -= 1
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+parser_pool = ParserPool(
+    workers=settings.parser.workers,
+    max_queue=settings.parser.max_queue,
+)
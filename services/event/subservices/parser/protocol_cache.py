@@ -0,0 +1,145 @@
+import gzip
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+from src.config import settings
+from src.schemas.event.event_schema import EventInput
+from src.services.event.subservices.parser.src.merge_entities import rekey_event_entities
+
+PAGE = "page"
+RESULT = "result"
+# Version of the punching-system engines, part of the key of every memoized result.
+# Bump it whenever an engine changes its output so stale results are not reused.
+PARSER_VERSION = 1
+
+
+class ProtocolCache:
+    """
+    Local content-addressed store of fetched protocol pages (keyed by URL and content hash)
+    with a memo of the EventInput parsed from every page (keyed by parser version and content hash).
+    Blobs are gzip-compressed files, the index lives in SQLite and the total size is bounded with LRU eviction.
+    """
+
+    def __init__(self, path: Path, max_size: int):
+        self.path = Path(path)
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path / "index.sqlite3", check_same_thread=False, isolation_level=None)
+            db.execute("CREATE TABLE IF NOT EXISTS blobs "
+                       "(key TEXT PRIMARY KEY, size INTEGER NOT NULL, last_access REAL NOT NULL)")
+            db.execute("CREATE TABLE IF NOT EXISTS sources "
+                       "(url TEXT NOT NULL, hash TEXT NOT NULL, content_type TEXT, fetched_at REAL NOT NULL, "
+                       "PRIMARY KEY (url, hash))")
+            self._db = db
+        return self._db
+
+    @staticmethod
+    def content_hash(content: bytes) -> str:
+        return hashlib.sha256(content).hexdigest()
+
+    @staticmethod
+    def result_kind() -> str:
+        return f"{RESULT}/v{PARSER_VERSION}"
+
+    def blob_path(self, kind: str, content_hash: str) -> Path:
+        return self.path / kind / content_hash[:2] / f"{content_hash}.gz"
+
+    def write_blob(self, kind: str, content_hash: str, data: bytes):
+        path = self.blob_path(kind, content_hash)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(gzip.compress(data))
+            tmp.replace(path)
+        self.db.execute("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?)",
+                        (f"{kind}/{content_hash}", path.stat().st_size, time.time()))
+
+    def read_blob(self, kind: str, content_hash: str) -> Optional[bytes]:
+        path = self.blob_path(kind, content_hash)
+        try:
+            data = gzip.decompress(path.read_bytes())
+        except (FileNotFoundError, OSError, EOFError):
+            return None
+        self.db.execute("UPDATE blobs SET last_access = ? WHERE key = ?", (time.time(), f"{kind}/{content_hash}"))
+        return data
+
+    def store_page(self, url: str, content: bytes, content_type: str) -> str:
+        """
+        Stores a fetched page and returns its content hash.
+        """
+        content_hash = self.content_hash(content)
+        with self.lock:
+            self.write_blob(PAGE, content_hash, content)
+            self.db.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)",
+                            (url, content_hash, content_type, time.time()))
+            self.evict()
+        return content_hash
+
+    def load_page(self, url: str, content_hash: str = None) -> Optional[Tuple[bytes, str, str]]:
+        """
+        Loads a stored page of the url: the given version or the latest fetched one.
+
+        Returns:
+            Optional[Tuple[bytes, str, str]]: Page content, its Content-Type and content hash.
+        """
+        with self.lock:
+            query = "SELECT hash, content_type FROM sources WHERE url = ?"
+            params = (url,)
+            if content_hash:
+                query += " AND hash = ?"
+                params += (content_hash,)
+            row = self.db.execute(query + " ORDER BY fetched_at DESC LIMIT 1", params).fetchone()
+            if row is None:
+                return None
+            content = self.read_blob(PAGE, row[0])
+        if content is None:
+            return None
+        return content, row[1], row[0]
+
+    def store_result(self, content_hash: str, event: EventInput):
+        # Title, date and source come from the import request, not from the page
+        data = event.model_dump_json(exclude_none=True, exclude={"title", "source", "date"}).encode()
+        with self.lock:
+            self.write_blob(self.result_kind(), content_hash, data)
+            self.evict()
+
+    def load_result(self, content_hash: str) -> Optional[EventInput]:
+        with self.lock:
+            data = self.read_blob(self.result_kind(), content_hash)
+        if data is None:
+            return None
+        # Every stored event gets its own entity IDs, the memo may already be stored under another source
+        return rekey_event_entities(EventInput.model_validate_json(data))
+
+    def evict(self):
+        """
+        Removes least recently used blobs until the store fits max_size.
+        """
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= self.max_size:
+            return
+        for key, size in self.db.execute("SELECT key, size FROM blobs ORDER BY last_access").fetchall():
+            kind, content_hash = key.rsplit("/", 1)
+            self.blob_path(kind, content_hash).unlink(missing_ok=True)
+            self.db.execute("DELETE FROM blobs WHERE key = ?", (key,))
+            if kind == PAGE:
+                self.db.execute("DELETE FROM sources WHERE hash = ?", (content_hash,))
+            total -= size
+            if total <= self.max_size:
+                break
+
+
+protocol_cache = ProtocolCache(
+    path=settings.cache.path,
+    max_size=settings.cache.max_size,
+)
@@ -0,0 +1,111 @@
+import hashlib
+import html
+import json
+import re
+from typing import Dict, List, Iterable
+
+from bs4 import BeautifulSoup
+
+from src.services.event.subservices.parser.src.detect import detect_system, SPORTORG, WINORIENT, IOF_XML
+from src.services.event.subservices.parser.src.punching_systems import SFR_parse, WinOrient_parse, SPORT_ORG_parse, \
+    IOF_XML_parse
+from src.services.event.subservices.parser.src.punching_systems.SPORT_ORG_parse import race_data, RACE_MARKER
+from src.services.event.subservices.parser.src.web_fetch import detect_encoding
+
+HEADING = re.compile(rb'<h2[\s>]', re.IGNORECASE)
+HEADING_END = re.compile(rb'</h2\s*>', re.IGNORECASE)
+BODY_END = re.compile(rb'</body\s*>', re.IGNORECASE)
+CLASS_RESULT = re.compile(rb'<(?:\w+:)?ClassResult[\s>]')
+CLASS_RESULT_END = re.compile(rb'</(?:\w+:)?ClassResult\s*>')
+CLASS_NAME = re.compile(rb'<(?:\w+:)?Class[\s>].*?<(?:\w+:)?Name[^>]*>(.*?)</', re.DOTALL)
+
+
+class GroupBlocks:
+    """
+    Splits a protocol page into the raw blocks of its groups, without parsing the results.
+    A page with only some of the groups can be put back together and parsed as usual.
+    """
+
+    def __init__(self, content: bytes, content_type: str = None):
+        self.system = detect_system(content)
+        self.head = b''
+        self.tail = b''
+        self.blocks: Dict[str, List[bytes]] = {}
+        if self.system == SPORTORG:
+            self.split_race(content)
+        elif self.system == IOF_XML:
+            self.split_xml(content)
+        else:
+            self.split_html(content, content_type)
+
+    def split_html(self, content: bytes, content_type: str = None):
+        # Every group starts with its <h2>, the page closes after the last group
+        starts = [m.start() for m in HEADING.finditer(content)]
+        if not starts:
+            self.head = content
+            return
+        body_end = BODY_END.search(content, starts[-1])
+        end = body_end.start() if body_end else len(content)
+        self.head, self.tail = content[:starts[0]], content[end:]
+        engine = WinOrient_parse if self.system == WINORIENT else SFR_parse
+        encoding = detect_encoding(content, content_type)
+        for start, stop in zip(starts, starts[1:] + [end]):
+            block = content[start:stop]
+            heading_end = HEADING_END.search(block)
+            heading = block[:heading_end.end()] if heading_end else block
+            text = BeautifulSoup(heading.decode(encoding, errors='replace'), 'html.parser').get_text(' ')
+            try:
+                name = engine.group_name(text).upper()
+            except IndexError:
+                name = ''
+            self.blocks.setdefault(name, []).append(block)
+
+    def split_xml(self, content: bytes):
+        # Every class is a <ClassResult> of the <ResultList>
+        starts = [m.start() for m in CLASS_RESULT.finditer(content)]
+        ends = [m.end() for m in CLASS_RESULT_END.finditer(content)]
+        if not starts or not ends:
+            self.head = content
+            return
+        self.head, self.tail = content[:starts[0]], content[ends[-1]:]
+        for start, stop in zip(starts, starts[1:] + [ends[-1]]):
+            block = content[start:stop]
+            match = CLASS_NAME.search(block)
+            name = html.unescape(match.group(1).decode('utf-8', errors='replace')) if match else ''
+            self.blocks.setdefault(IOF_XML_parse.group_name(name).upper(), []).append(block)
+
+    def split_race(self, content: bytes):
+        race = race_data(content)
+        persons = {}
+        for person in race['persons']:
+            persons.setdefault(person['group_id'], []).append(person)
+        results = {result['person_id']: result for result in race['results']}
+        for group in race['groups']:
+            group_persons = persons.get(group['id'], [])
+            block = {
+                'groups': [group],
+                'persons': group_persons,
+                'results': [results[p['id']] for p in group_persons if p['id'] in results],
+            }
+            name = SPORT_ORG_parse.group_name(group).upper()
+            self.blocks.setdefault(name, []).append(json.dumps(block, ensure_ascii=False).encode())
+
+    def hashes(self) -> Dict[str, str]:
+        """
+        Returns:
+            Dict[str, str]: Content hash of every group, by group name.
+        """
+        return {name: hashlib.sha256(b''.join(blocks)).hexdigest() for name, blocks in self.blocks.items()}
+
+    def page(self, names: Iterable[str]) -> bytes:
+        """
+        Puts together a page of the same format with only the given groups.
+        """
+        blocks = [block for name in names for block in self.blocks.get(name, [])]
+        if self.system != SPORTORG:
+            return self.head + b''.join(blocks) + self.tail
+        race = {'groups': [], 'persons': [], 'results': []}
+        for block in blocks:
+            for key, items in json.loads(block).items():
+                race[key].extend(items)
+        return RACE_MARKER + b' ' + json.dumps(race, ensure_ascii=False).encode() + b';\n'
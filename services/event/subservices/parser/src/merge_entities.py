@@ -0,0 +1,118 @@
+import json
+from typing import Dict, Iterable, Optional
+from uuid import uuid4
+
+from src.schemas.event.event_schema import EventInDB, EventInput
+
+ENTITIES = ['splits', 'results', 'courses', 'groups', 'runners', 'legs']
+
+
+def course_key(points: Dict[str, str]) -> tuple:  # Legs of a course in their order
+    return tuple(points[n] for n in sorted(points, key=int))
+
+
+def rekey_event_entities(event: EventInput) -> EventInput:
+    """
+    Gives every entity of a parsed event a fresh ID, so that one parse result can be stored
+    as several events (e.g. the same protocol imported from a link and uploaded as a file).
+
+    Args:
+        event (EventInput): The parsed event.
+
+    Returns:
+        EventInput: A copy of the event with new IDs of groups, runners, courses and legs.
+    """
+    ids = {}
+
+    def new_id(_id: str) -> str:
+        return ids.setdefault(_id, str(uuid4()))
+
+    old = {key: json.loads(getattr(event, key)) for key in ENTITIES}
+    new = {
+        'groups': {new_id(_id): group for _id, group in old['groups'].items()},
+        'legs': {new_id(_id): leg for _id, leg in old['legs'].items()},
+        'courses': {new_id(_id): {n: new_id(leg) for n, leg in points.items()}
+                    for _id, points in old['courses'].items()},
+        'runners': {new_id(_id): {**runner, 'group': new_id(runner['group']), 'course': new_id(runner['course'])}
+                    for _id, runner in old['runners'].items()},
+        'results': {new_id(_id): result for _id, result in old['results'].items()},
+        'splits': {new_id(leg): {new_id(_id): t for _id, t in times.items()} for leg, times in old['splits'].items()},
+    }
+    return event.model_copy(update={key: json.dumps(value) for key, value in new.items()})
+
+
+def merge_event_entities(stored: EventInDB, fresh: Optional[EventInput], replaced: Iterable[str]) -> EventInput:
+    """
+    Replaces the groups of a stored event with freshly parsed ones.
+
+    Entities of the fresh event get the IDs of the stored ones with the same natural key:
+    groups by name, runners by name inside their group, legs by start and end controls
+    and courses by their legs. New entities keep their fresh IDs, and courses and legs
+    no runner uses any more are dropped.
+
+    Args:
+        stored (EventInDB): The event as stored in the database.
+        fresh (Optional[EventInput]): Entities of the re-parsed groups only, None if no group is left to parse.
+        replaced (Iterable[str]): Names of the stored groups to replace, including the removed ones.
+
+    Returns:
+        EventInput: The merged event entities.
+    """
+    old = {key: json.loads(getattr(stored, key)) for key in ENTITIES}
+    new = {key: json.loads(getattr(fresh, key)) if fresh else {} for key in ENTITIES}
+
+    # Stable IDs of the fresh entities
+    group_ids = {group['name']: _id for _id, group in old['groups'].items()}
+    group_map = {_id: group_ids.get(group['name'], _id) for _id, group in new['groups'].items()}
+    leg_ids = {(leg['start'], leg['end']): _id for _id, leg in old['legs'].items()}
+    leg_map = {_id: leg_ids.get((leg['start'], leg['end']), _id) for _id, leg in new['legs'].items()}
+    course_ids = {course_key(points): _id for _id, points in old['courses'].items()}
+    course_map = {}
+    for _id, points in new['courses'].items():
+        points = {n: leg_map[leg] for n, leg in points.items()}
+        course_map[_id] = course_ids.get(course_key(points), _id)
+        new['courses'][_id] = points
+
+    replaced_groups = {group_ids[name] for name in replaced if name in group_ids}
+    dropped = {_id for _id, runner in old['runners'].items() if runner['group'] in replaced_groups}
+    runner_ids = {(old['runners'][_id]['name'], old['runners'][_id]['group']): _id for _id in dropped}
+    runner_map = {_id: runner_ids.get((runner['name'], group_map[runner['group']]), _id)
+                  for _id, runner in new['runners'].items()}
+
+    groups = {_id: group for _id, group in old['groups'].items() if _id not in replaced_groups}
+    groups.update({group_map[_id]: group for _id, group in new['groups'].items()})
+
+    runners = {_id: runner for _id, runner in old['runners'].items() if _id not in dropped}
+    runners.update({
+        runner_map[_id]: {**runner, 'group': group_map[runner['group']], 'course': course_map[runner['course']]}
+        for _id, runner in new['runners'].items()
+    })
+
+    courses = {**old['courses'], **{course_map[_id]: points for _id, points in new['courses'].items()}}
+    courses = {_id: courses[_id] for _id in dict.fromkeys(runner['course'] for runner in runners.values())}
+
+    used_legs = {leg for points in courses.values() for leg in points.values()}
+    legs = {**old['legs'], **{leg_map[_id]: leg for _id, leg in new['legs'].items()}}
+    legs = {_id: leg for _id, leg in legs.items() if _id in used_legs}
+
+    results = {_id: result for _id, result in old['results'].items() if _id not in dropped}
+    results.update({runner_map[_id]: result for _id, result in new['results'].items()})
+
+    splits = {leg: {_id: t for _id, t in times.items() if _id not in dropped} for leg, times in old['splits'].items()}
+    for leg, times in new['splits'].items():
+        splits.setdefault(leg_map[leg], {}).update({runner_map[_id]: t for _id, t in times.items()})
+    splits = {leg: times for leg, times in splits.items() if leg in legs and times}
+
+    return EventInput(
+        title=stored.title,
+        source=stored.source,
+        date=stored.date,
+        status=stored.status,
+        count=len(runners),
+        splits=json.dumps(splits),
+        results=json.dumps(results),
+        courses=json.dumps(courses),
+        groups=json.dumps(groups),
+        runners=json.dumps(runners),
+        legs=json.dumps(legs),
+    )
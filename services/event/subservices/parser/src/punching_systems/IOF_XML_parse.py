@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+import logging
+from io import BytesIO
+from typing import Union, BinaryIO, List, Optional
+
+import numpy as np
+from lxml import etree
+from pandas import DataFrame
+
+from src.services.event.subservices.parser.src.punching_systems.utils import EventBuilder, points_to_routes, \
+    unique_names
+from src.services.event.subservices.parser.telemetry import count
+
+logger = logging.getLogger(__name__)
+
+MISSING_RESULT = 100 * 60 * 60  # seconds
+SKIPPED_STATUSES = {'DidNotStart', 'DidNotEnter', 'Cancelled'}
+
+# Tags are matched in any namespace: exporters without the IOF 3.0 namespace are common
+CLASS = '{*}Class'
+CLASS_RESULT = '{*}ClassResult'
+PERSON_RESULT = '{*}PersonResult'
+
+
+def group_name(name: str) -> str:  # Group name from the <Name> of the <Class>
+    return ' '.join(name.split())
+
+
+def local_name(element: etree._Element) -> str:
+    return etree.QName(element).localname
+
+
+def release(element: etree._Element):  # Frees a processed element and the already processed siblings before it
+    element.clear()
+    while element.getprevious() is not None:
+        del element.getparent()[0]
+
+
+def seconds(text: Optional[str]) -> float:
+    return float(text) if text else np.nan
+
+
+class GroupResults:
+    """
+    Results of one class, collected runner by runner while the file is streamed.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.names: List[str] = []
+        self.codes: List[List[int]] = []
+        self.times: List[np.ndarray] = []  # control times from the start in seconds, NaN for a missing punch
+        self.finish: List[float] = []
+        self.results: List[int] = []
+
+    def add_person(self, person_result: etree._Element):
+        result = person_result.find('{*}Result')
+        if result is None or result.findtext('{*}Status') in SKIPPED_STATUSES:
+            return
+        person = person_result.find('{*}Person/{*}Name')
+        family = person.findtext('{*}Family', '') if person is not None else ''
+        given = person.findtext('{*}Given', '') if person is not None else ''
+
+        codes, times = [], []
+        for split in result.iterfind('{*}SplitTime'):
+            if split.get('status') == 'Additional':
+                continue
+            codes.append(int(split.findtext('{*}ControlCode')))
+            times.append(seconds(split.findtext('{*}Time')))
+
+        ok = result.findtext('{*}Status') == 'OK'
+        time = seconds(result.findtext('{*}Time'))
+        self.names.append(' '.join(f"{family} {given}".split()).upper() + f"^{self.name.upper()}")
+        self.codes.append(codes)
+        self.times.append(np.array(times, dtype=np.float64))
+        self.finish.append(time if ok else np.nan)
+        self.results.append(int(round(time)) if ok and not np.isnan(time) else MISSING_RESULT)
+
+    def splits(self) -> np.ndarray:
+        """
+        Splits matrix in seconds (runners x controls + finish); 0 marks a missing split,
+        so both legs around a missing punch are missing.
+        """
+        counts = np.array([len(i) for i in self.times], dtype=np.int64)
+        width = counts.max(initial=0) + 2
+        times = np.full((len(self.times), width), np.nan)
+        times[:, 0] = 0
+        for n, row in enumerate(self.times):
+            times[n, 1:len(row) + 1] = row
+        times[np.arange(len(counts)), counts + 1] = self.finish
+        splits = np.diff(times, axis=1)
+        return np.nan_to_num(splits, nan=0).round().astype(np.int64)
+
+    def add_to(self, builder: EventBuilder):
+        splits = self.splits()
+        names = unique_names(self.names)
+        for name, codes, row, result in zip(names, self.codes, splits, self.results):
+            legs = points_to_routes([241] + codes + [240])
+            builder.add_runner(name, legs, row[:len(legs)].tolist(), result)
+
+
+def IOF_parsing(source: Union[bytes, BinaryIO]) -> (DataFrame, DataFrame):
+    """
+    Streams an IOF XML 3.0 ResultList. Every PersonResult is released right after it is read,
+    so memory use does not grow with the file, only with the collected splits.
+
+    Args:
+        source (Union[bytes, BinaryIO]): The file content or a binary stream with it.
+    """
+    if isinstance(source, bytes):
+        source = BytesIO(source)
+    builder = EventBuilder()
+    group: Optional[GroupResults] = None
+    for _, element in etree.iterparse(source, events=('end',), tag=(CLASS, PERSON_RESULT, CLASS_RESULT),
+                                      resolve_entities=False, no_network=True, huge_tree=True):
+        tag = local_name(element)
+        if tag == 'Class' and local_name(element.getparent()) == 'ClassResult':
+            group = GroupResults(group_name(element.findtext('{*}Name', '')))
+        elif tag == 'PersonResult' and group is not None:
+            try:
+                group.add_person(element)
+            except (TypeError, ValueError) as e:
+                logger.warning("Skipped IOF XML runner of group %s: %s", group.name, e)
+                count('skipped_runners', 1)
+            release(element)
+        elif tag == 'ClassResult':
+            if group is not None:
+                group.add_to(builder)
+            group = None
+            release(element)
+    return builder.build()
@@ -1,56 +1,77 @@
 # names = [name1^group.upper(),...]
 # points_l = {name1^group.upper() : [point1-> point2,...], ...}
-# splits_l = {name1^group.upper() : [Timedelta('0 days 00:00:00'),...], ...}
-# results = { name1^group.upper() : Timedelta('0 days 00:00:00'),...}
+# splits_l = {name1^group.upper() : [split1, ...], ...} in seconds, 0 for a missing split
+# results = { name1^group.upper() : result,...} in seconds
 import json
+import logging
 
-import pandas as pd
-from pandas import Timedelta
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
 
-from src.services.event.subservices.parser.src.punching_systems.utils import dispersions, points_to_routes
+from src.services.event.subservices.parser.src.punching_systems.utils import points_to_routes, EventBuilder
+from src.services.event.subservices.parser.telemetry import count
 
+logger = logging.getLogger(__name__)
 
-def SO_parsing(soup):
-    data = str(soup).splitlines()
-    race_line = [i for i in data if "var race =" in i][0]
-    race_data = race_line[race_line.index("{"):-1]
-    race = json.loads(race_data)
+MILLISECONDS_IN_SECOND = 1000
+RACE_MARKER = b'var race ='
+
+
+def race_data(content: bytes) -> dict:  # Decodes the embedded race object straight from the raw page
+    marker = content.find(RACE_MARKER)
+    if marker == -1:
+        raise ValueError('SportOrg race data not found')
+    start = content.index(b'{', marker)
+    end = content.find(b'\n', start)
+    payload = content[start:end if end != -1 else len(content)].rstrip(b' \t\r;')
+    try:
+        return loads(payload)
+    except ValueError:
+        # The object spans several lines or the page is not UTF-8
+        from src.services.event.subservices.parser.src.web_fetch import decode
+        return json.JSONDecoder().raw_decode(decode(content[start:]))[0]
+
+
+def group_name(group: dict) -> str:
+    return group['name'].split(' ')[0]
+
+
+def SO_parsing(content: bytes):
+    race = race_data(content)
 
     groups = {p["id"]: p for p in race['groups']}
-    persons = {p["id"]: p for p in race['persons']}
     results = {p["person_id"]: p for p in race['results']}
     # courses = {p["id"]: p for p in race['courses']}
+    group_persons = {group_id: [] for group_id in groups}
+    for person in race['persons']:
+        if person['group_id'] in group_persons:
+            group_persons[person['group_id']].append(person)
 
-    points_l = {}
-    gen_df = pd.DataFrame()
-    courses = pd.DataFrame()
-    for group_id in groups:
-        group_persons = [i for i in persons if persons[i]['group_id'] == group_id]
-        for person_id in group_persons:
-            person = persons[person_id]
+    builder = EventBuilder()
+    for group_id, persons in group_persons.items():
+        name = group_name(groups[group_id])
+        for person in persons:
             try:
-                nickname = (
-                    f"{person['surname']} {person['name']}^{groups[person['group_id']]['name'].split(' ')[0]}").upper()
-                checked_points = [i for i in results[person_id]['splits'] if i['leg_time'] > 0]
+                nickname = f"{person['surname']} {person['name']}^{name}".upper()
+                person_result = results[person['id']]
+                checked_points = [i for i in person_result['splits'] if i['leg_time'] > 0]
                 points = [{'code': '241'}] + checked_points + [{'code': '240'}]
-                legs = points_to_routes([int(points[i]["code"]) for i in range(len(points))])
-                result = Timedelta(milliseconds=int(results[person['id']]['result_msec']))
-                splits = [Timedelta(milliseconds=i['leg_time']) for i in points[1:-1]]
-                splits += [result - Timedelta(milliseconds=points[-2]['relative_time'])]
+                legs = points_to_routes([int(i["code"]) for i in points])
+                result = int(person_result['result_msec'])
+                splits = [i['leg_time'] for i in points[1:-1]]
+                splits += [result - points[-2]['relative_time']]
+                splits = [round(i / MILLISECONDS_IN_SECOND) for i in splits]
                 relative_times = [i['relative_time'] for i in checked_points]
                 check_gen_times = [i + 1 for i in range(len(relative_times) - 1) if
                                    relative_times[i] > relative_times[i + 1]]
-                df = pd.DataFrame(index=legs, columns=[nickname], data=splits, dtype="timedelta64[ns]").T
                 if len(check_gen_times) > 0:
-                    df.iloc[:, check_gen_times + [check_gen_times[-1] + 1]] = pd.NaT
-                points_l.setdefault(nickname, legs)
-                df["RES"] = result
-                print(nickname, len(legs)  == len(splits))
-                gen_df = pd.concat([gen_df, df], join='outer', axis=0)
-                disps = dispersions(points_l)
-                courses = pd.concat([courses, disps], join='outer', axis=0)
+                    for i in check_gen_times + [check_gen_times[-1] + 1]:
+                        splits[i] = 0
+                builder.add_runner(nickname, legs, splits, round(result / MILLISECONDS_IN_SECOND))
             except Exception as e:
-                print(e)
+                logger.warning("Skipped SportOrg runner of group %s: %s", name, e)
+                count('skipped_runners', 1)
                 continue
-        points_l.clear()
-    return gen_df, courses
+    return builder.build()
@@ -1,170 +1,175 @@
 # -*- coding: utf-8 -*-
+import logging
 import re
 
-import pandas as pd
-from bs4 import BeautifulSoup as BS
-from pandas import Timedelta
+import numpy as np
+from bs4.element import Tag
+from pandas import DataFrame, Series
 
-from src.services.event.subservices.parser.src.punching_systems.utils import points_to_routes, fill_GD, dispersions, null, bs
+from src.services.event.subservices.parser.src.punching_systems.utils import points_to_routes, EventBuilder
+from src.services.event.subservices.parser.telemetry import count
+
+logger = logging.getLogger(__name__)
+
+MISSING_RESULT = 100 * 60 * 60  # seconds
+
+# Group format detection
+LONG_TIME_CHECK = re.compile(r'\d{2}:\d{2}:\d{2}\(')
+SHORT_TIME_CHECK = re.compile(r'\s\d{1,2}:\d{2}\(')
+PLACE_CHECK = re.compile(r'\((\d{1,2})\)')
+CODE_CHECK = re.compile(r'\(\d{2}\)\(')
+
+# Line tokens, one combined pattern per format
+NAME = re.compile(r'\s\w+')
+RESULT = re.compile(r'(\d{2}):(\d{2}):(\d{2})\s')
+LONG_SPLITS = re.compile(r'(?P<h>\d{2}):(?P<m>\d{2}):(?P<s>\d{2})\(')  # 00:03:21(31)
+SHORT_SPLITS = re.compile(r'(?P<m>\d{1,2}):(?P<s>\d{2})\(')  # 3:21(31) or 3:21(2)
+SPACED_SPLITS = re.compile(r'(?<=\s)(?P<m>\d+):(?P<s>\d{2})(?=\s)')  # 3:21
+LINE_POINTS = re.compile(r':\d{2}\((\d+)\)')  # codes after split times, line without spaces
+HEADER_POINTS = re.compile(r'\((\d{2,3})\)')  # codes in the <b> header of the group
+GROUP_NAME = re.compile(r'\S+\b')
 
 global log
 
 
 def check_type(line):
-    l = len(re.findall('\d{2}:\d{2}:\d{2}\(', line))
-    if l != 0:
-        # print(1)
-        check = 1
-    elif l == 0:
-        # print(2)
-        r = re.findall('\s\d{1,2}:\d{2}\(', line)
-        r_l = len(r)
-        r1 = [i for i in re.findall('\(\d{1,2}\)', line.replace(' ', '')) if int(i[1:-1]) < 10]
-        r2 = re.findall('\(\d{2}\)\(', line.replace(' ', ''))
-        r1_l = len(r1)
-        r2_l = len(r2)
-        if (r_l != 0) & (r1_l != 0) & (r2_l != 0):
-            check = 3
-        elif (r_l != 0) & (r1_l != 0):
-            # print(3)
-            check = 0
-        elif (r_l != 0) & (r1_l == 0):
-            # print(4, r2, l2)
-            check = 3
-        else:
-            print(r_l, r1_l, r2_l)
-            check = 2
-    return check
-
-
-def check_time(splits, result):
-    l = [i if i < result else pd.NaT for i in splits]
-    l[-1] = pd.NaT if l.count(pd.NaT) != 0 else l[-1]
-    return l
-
-
-def extract_points(line):  # TAKE ALL BRACKETS LIKE (34)(78)
-    reg = ':\d{2}\(\d+\)'
-    s = line.replace(' ', '')
-    points = ['241'] + [i[4:-1] for i in re.findall(reg, s)] + ['240']
-    return points_to_routes(points)
-
-
-def extract_points_2(soup):
-    b = bs(soup).find('b').text.replace(' ', '')
-    reg = '\(\d{2,3}\)'
-    points = ['241'] + [i[1:-1] for i in re.findall(reg, b)] + ['240']
-    return points_to_routes(points)
-
-
-def extract_points_3(soup, group_name, split_count):
-    b = bs(soup).find('b').text.replace(' ', '')
-    reg = '\(\d{2,3}\)'
-    points = [i[1:-1] for i in re.findall(reg, b)]
-    if len(points) + 1 != split_count:
-        points = ['241'] + [f'{i}_{group_name}' for i in list(range(1, split_count))] + ['240']
-    return points_to_routes(points)
-
-
-def extract_name(line):
-    s = ' '.join(line.split())
-    return ' '.join([i.strip() for i in re.findall('\s\w+', s)[:2]]).upper()
-
-
-def extract_time_data(line):
-    s = ' '.join(line.split())
-    return [Timedelta(i[:-1]) for i in re.findall('\d{2}:\d{2}:\d{2}\(', s)]
-
-
-def extract_result(line):
-    try:
-        result = re.findall('\d{2}:\d{2}:\d{2}\s', ' '.join(line.split()))[0].strip()
-    except:
-        result = Timedelta(hours=100)
-    return Timedelta(result)
-
-
-def extract_splits(line, result):
-    time_data = extract_time_data(line)
-    splits = time_data + [result - pd.Series(time_data, dtype='timedelta64[ns]').sum()]
-    return check_time(splits, result)
-
-
-def extract_splits_2(line, result):
-    reg = re.findall('\d{1,2}:\d{2}\(', line)
-    l = [Timedelta(minutes=int(i.split(':')[0]), seconds=int(i.split(':')[1][:-1])) for i in reg]
-    l = l + [result - pd.Series(l, dtype='timedelta64[ns]').sum()]
-    return check_time(l, result)
-
-
-def extract_splits_3(line, result):
-    reg = re.findall('\s\d+:\d{2}\s', line.replace(' ', '  '))
-    l = [Timedelta(minutes=int(i.split(':')[0][1:]), seconds=int(i.split(':')[1][:-1])) for i in reg][:]
-    sum = pd.Series(l, dtype='timedelta64[ns]').sum()
-    l = l + [result - sum]
-    return check_time(l, result)
+    if LONG_TIME_CHECK.search(line):
+        return 1
+    compact = line.replace(' ', '')
+    r_l = len(SHORT_TIME_CHECK.findall(line))
+    r1_l = len([i for i in PLACE_CHECK.findall(compact) if int(i) < 10])
+    r2_l = len(CODE_CHECK.findall(compact))
+    if r_l and r1_l and r2_l:
+        return 3
+    elif r_l and r1_l:
+        return 0
+    elif r_l:
+        return 3
+    return 2
+
+
+def header_points(group_data: Tag) -> list:  # Control codes from the group header, read once per group
+    b = group_data.find('b')
+    if b is None:
+        return []
+    return [int(i) for i in HEADER_POINTS.findall(b.text.replace(' ', ''))]
+
+
+def extract_names(normalized: Series) -> Series:
+    return normalized.str.findall(NAME).str[:2].str.join('').str.strip().str.upper()
+
+
+def extract_results(normalized: Series) -> np.ndarray:
+    found = normalized.str.extract(RESULT)
+    seconds = found[0].astype(float) * 3600 + found[1].astype(float) * 60 + found[2].astype(float)
+    return seconds.fillna(MISSING_RESULT).to_numpy(dtype=np.int64)
+
+
+def extract_times(lines: Series, pattern: re.Pattern) -> (np.ndarray, np.ndarray):
+    """
+    Extracts split times of all lines in one pass.
+
+    Returns:
+        (np.ndarray, np.ndarray): Split times matrix (lines x max splits) in seconds and splits count of every line.
+    """
+    found = lines.str.extractall(pattern).astype(np.int64)
+    counts = np.zeros(len(lines), dtype=np.int64)
+    if found.empty:
+        return np.zeros((len(lines), 0), dtype=np.int64), counts
+    seconds = found['m'].to_numpy() * 60 + found['s'].to_numpy()
+    if 'h' in found:
+        seconds += found['h'].to_numpy() * 3600
+    rows = found.index.get_level_values(0).to_numpy()
+    columns = found.index.get_level_values(1).to_numpy()
+    times = np.zeros((len(lines), columns.max() + 1), dtype=np.int64)
+    times[rows, columns] = seconds
+    np.add.at(counts, rows, 1)
+    return times, counts
+
+
+def check_times(times: np.ndarray, counts: np.ndarray, results: np.ndarray) -> np.ndarray:
+    """
+    Appends the finish split (result minus the sum of splits) and marks with 0 the splits
+    that are not less than the result; the finish split of such lines is missing too.
+    """
+    lines = np.arange(len(counts))
+    splits = np.zeros((len(counts), times.shape[1] + 1), dtype=np.int64)
+    splits[:, :times.shape[1]] = times
+    splits[lines, counts] = results - times.sum(axis=1)
+    inside = np.arange(splits.shape[1]) <= counts[:, None]
+    over = (splits >= results[:, None]) & inside
+    splits[over] = 0
+    broken = over.any(axis=1)
+    splits[lines[broken], counts[broken]] = 0
+    return splits
+
+
+def extract_points(lines: Series, check: int, group_data: Tag, counts: np.ndarray) -> list:
+    if check in (1, 3):
+        codes = lines.str.replace(' ', '').str.findall(LINE_POINTS)
+        return [points_to_routes([241] + [int(i) for i in c] + [240]) for c in codes]
+    course = header_points(group_data)
+    legs = points_to_routes([241] + course + [240])
+    if check == 0:
+        return [legs for _ in counts]
+    # Without split codes the header course is used only when it fits the number of splits
+    return [legs if len(course) == count else [] for count in counts]
+
+
+def group_name(heading: str) -> str:  # Group name from the text of its <h2>, the course description is cut off
+    return GROUP_NAME.findall(heading)[0]
 
 
 def groups_data(page):
-    reg = r'\S+\b'
-    h2 = [re.findall(reg, i.get_text(' '))[0] for i in page.find_all('h2')]
+    h2 = [group_name(i.get_text(' ')) for i in page.find_all('h2')]
     groups = page.find_all('pre')
     return h2, groups
 
 
-def group_frame(group: str, soup: BS):
-    names, points_l, splits_l, results = group_general_data(soup, group)
-    GD = fill_GD(names, points_l, splits_l, results)
-    disps = dispersions(points_l)
-    df = pd.DataFrame(GD, dtype='timedelta64[ns]').T
-    return df, disps
-
-
-def group_general_data(group_data, group_name):
-    group_l = [i for i in str(group_data).splitlines()[1:-1] if 'u>' not in i]
-    res, spl, pnt = {}, {}, {}
-    names = []
-    check = check_type(group_l[0])
-    for line in group_l[:]:
-        try:
-            name = extract_name(line) + '^' + group_name.upper()
-            result = extract_result(line)
-            if check == 1:
-                splits = extract_splits(line, result)
-                points = extract_points(line)
-            elif check == 0:
-                splits = extract_splits_2(line, result)
-                points = extract_points_2(group_data)
-            elif check == 2:
-                splits = extract_splits_3(line, result)
-                points = extract_points_3(group_data, group_name, len(splits))
-            # elif check == 3:
-            else:
-                splits = extract_splits_2(line, result)
-                points = extract_points(line)
-
-            pnt.setdefault(name, points)
-            res.setdefault(name, result)
-            spl.setdefault(name, splits)
-            names.append(name)
-        except Exception as e:
-            print(e)
-
-    return names, pnt, spl, res
-
-
-def SI_parsing(soup):
-    df = pd.DataFrame()
-    courses = pd.DataFrame()
+def group_general_data(group_data: Tag, group_name: str) -> (list, list, np.ndarray, np.ndarray, np.ndarray):
+    """
+    Classifies the group format once and extracts names, legs, splits and results of all lines.
+
+    Returns:
+        (list, list, np.ndarray, np.ndarray, np.ndarray): Names, legs of every runner, splits matrix,
+        splits count of every runner (without the finish split) and results, all times in seconds.
+    """
+    lines = Series([i for i in str(group_data).splitlines()[1:-1] if 'u>' not in i], dtype=object)
+    if lines.empty:
+        return [], [], np.zeros((0, 0), dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    check = check_type(lines.iloc[0])
+    normalized = lines.str.split().str.join(' ')
+
+    names = extract_names(normalized)
+    results = extract_results(normalized)
+    if check == 1:
+        times, counts = extract_times(lines, LONG_SPLITS)
+    elif check == 2:
+        times, counts = extract_times(lines, SPACED_SPLITS)
+    else:
+        times, counts = extract_times(lines, SHORT_SPLITS)
+    splits = check_times(times, counts, results)
+    points = extract_points(lines, check, group_data, counts)
+
+    # Skip lines without a name and repeated names, runners without legs are kept with an empty course
+    keep = ((names != '') & ~names.duplicated()).to_numpy()
+    names = [f"{name}^{group_name.upper()}" for name in names[keep]]
+    points = [p for p, k in zip(points, keep) if k]
+    return names, points, splits[keep], counts[keep], results[keep]
+
+
+def SI_parsing(soup) -> (DataFrame, DataFrame):
+    builder = EventBuilder()
     h2, soups = groups_data(soup)
-    group_pack = list(zip(h2[:], soups[:]))
-    for group_name, group_soup in group_pack[:]:
+    for group_name, group_soup in zip(h2, soups):
         try:
-            group_df, disps = group_frame(group_name, group_soup)
+            names, points, splits, counts, results = group_general_data(group_soup, group_name)
         except Exception as e:
+            logger.warning("Skipped WinOrient group %s: %s", group_name, e)
+            count('skipped_groups', 1)
             continue
-        df = pd.concat([df, group_df], join='outer', axis=0)
-        courses = pd.concat([courses, disps], join='outer', axis=0)
-    df = df.replace([null], pd.NaT)
+        for name, legs, row, splits_count, result in zip(names, points, splits, counts, results):
+            builder.add_runner(name, legs, row[:splits_count + 1].tolist(), int(result))
+    df, courses = builder.build()
     df.index.name = 'name'
     return df, courses
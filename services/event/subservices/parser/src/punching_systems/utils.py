@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
 import re
+from collections import Counter
 from typing import Union
 
+import numpy as np
 import pandas as pd
 from bs4 import BeautifulSoup as BS
-from pandas import Timedelta
+from pandas import Timedelta, DataFrame
 from pandas._libs import NaTType
 
 
@@ -22,6 +24,24 @@ def course(l: list):
 null: Union[Timedelta, NaTType, NaTType] = Timedelta(seconds=0)
 
 
+def time_to_seconds(time: str) -> int:  # 'h:mm:ss' or 'mm:ss' to seconds
+    seconds = 0
+    for part in time.split(':'):
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+
+def unique_names(names: list) -> list:  # Same 'NAME^GROUP' names get a stable serial suffix: 'NAME*1^GROUP'
+    counts, seen = Counter(names), Counter()
+    names = list(names)
+    for n, name in enumerate(names):
+        if counts[name] > 1:
+            seen[name] += 1
+            runner, group = name.split('^', 1)
+            names[n] = f'{runner}*{seen[name]}^{group}'
+    return names
+
+
 def points_to_routes(l: list):
     f = lambda x, i: (int(x[i]), int(x[i + 1]))
     l: list = [f(l, i) for i in range(len(l) - 1)]
@@ -56,3 +76,69 @@ def routes_and_splits_dict(routes: list, splits: list):
 def dispersions(d: dict):
     disp = {k: {leg: n for n, leg in enumerate(v)} for k, v in d.items()}
     return pd.DataFrame(disp).T
+
+
+NANOSECONDS_IN_SECOND = 10 ** 9
+NAT = np.iinfo(np.int64).min  # int64 view of pd.NaT
+
+
+class EventBuilder:
+    """
+    Collects runner records of one protocol (legs, integer-second splits and result)
+    and assembles the splits matrix and the course table once, at the end.
+    Non-positive splits and results are treated as missing.
+    """
+
+    def __init__(self):
+        self.names: list = []
+        self.results: list = []
+        self.legs: dict = {}  # leg -> column number
+        self._split_rows, self._split_columns, self._splits = [], [], []
+        self._course_rows, self._course_columns, self._positions = [], [], []
+
+    def __len__(self):
+        return len(self.names)
+
+    def leg_column(self, leg: tuple) -> int:
+        column = self.legs.get(leg)
+        if column is None:
+            column = self.legs[leg] = len(self.legs)
+        return column
+
+    def add_runner(self, name: str, legs: list, splits: list, result: int):
+        row = len(self.names)
+        columns = [self.leg_column(leg) for leg in legs]
+        self._course_rows.extend([row] * len(columns))
+        self._course_columns.extend(columns)
+        self._positions.extend(range(len(columns)))
+        if len(splits) == len(columns):
+            self._split_rows.extend([row] * len(columns))
+            self._split_columns.extend(columns)
+            self._splits.extend(splits)
+        self.names.append(name)
+        self.results.append(result)
+
+    def add_group(self, names: list, points: list, splits, results):
+        for name, legs, runner_splits, result in zip(names, points, splits, results):
+            self.add_runner(name, legs, list(runner_splits), int(result))
+
+    def build(self) -> (DataFrame, DataFrame):
+        """
+        Returns the splits frame (runners x legs + 'RES', timedelta64[ns]) and the
+        course table (runners x legs, position of the leg in the runner's course).
+        """
+        if not self.names:
+            return pd.DataFrame(), pd.DataFrame()
+        legs = pd.Index(list(self.legs), tupleize_cols=False)
+        rows, width = len(self.names), len(legs)
+
+        seconds = np.zeros((rows, width + 1), dtype=np.int64)
+        seconds[self._split_rows, self._split_columns] = self._splits
+        seconds[:, width] = self.results
+        matrix = np.where(seconds > 0, seconds * NANOSECONDS_IN_SECOND, NAT).view('timedelta64[ns]')
+        splits = pd.DataFrame(matrix, index=self.names, columns=legs.append(pd.Index(['RES'])))
+
+        positions = np.full((rows, width), np.nan)
+        positions[self._course_rows, self._course_columns] = self._positions
+        courses = pd.DataFrame(positions, index=self.names, columns=legs)
+        return splits, courses
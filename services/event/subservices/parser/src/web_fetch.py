@@ -0,0 +1,116 @@
+import asyncio
+import codecs
+import re
+from typing import Optional, Dict
+from urllib.parse import urlsplit
+
+import httpx
+from bs4.dammit import UnicodeDammit
+
+from src.config import settings
+from src.services.event.subservices.parser.telemetry import stage, count
+
+SNIFF_SIZE = 4096
+META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w-]+)', re.IGNORECASE)
+HEADER_CHARSET = re.compile(r'charset\s*=\s*["\']?([\w-]+)', re.IGNORECASE)
+FALLBACK_ENCODINGS = ['utf-8', 'windows-1251']
+
+_client: Optional[httpx.AsyncClient] = None
+_host_limits: Dict[str, asyncio.Semaphore] = {}
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Returns the process-wide pooled HTTP client, creating it on first use.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.fetch.timeout, connect=settings.fetch.connect_timeout),
+            limits=httpx.Limits(max_connections=settings.fetch.max_connections),
+            follow_redirects=True,
+        )
+    return _client
+
+
+def host_limit(link: str) -> asyncio.Semaphore:
+    """
+    Returns the semaphore limiting concurrent downloads from the host of the link.
+    """
+    host = urlsplit(link).netloc.lower()
+    if host not in _host_limits:
+        _host_limits[host] = asyncio.Semaphore(settings.fetch.per_host)
+    return _host_limits[host]
+
+
+async def close_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    _host_limits.clear()
+
+
+def known_encoding(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def detect_encoding(content: bytes, content_type: str = None) -> str:
+    """
+    Picks the page encoding from the Content-Type header, then from <meta charset>
+    in the first few KB, and only then falls back to detection over the whole body.
+    """
+    if content_type:
+        match = HEADER_CHARSET.search(content_type)
+        encoding = known_encoding(match.group(1)) if match else None
+        if encoding:
+            return encoding
+    match = META_CHARSET.search(content[:SNIFF_SIZE])
+    encoding = known_encoding(match.group(1).decode('ascii')) if match else None
+    if encoding:
+        return encoding
+    return UnicodeDammit(content, user_encodings=FALLBACK_ENCODINGS).original_encoding or FALLBACK_ENCODINGS[0]
+
+
+def decode(content: bytes, content_type: str = None) -> str:
+    with stage('encoding'):
+        return content.decode(detect_encoding(content, content_type), errors='replace')
+
+
+async def fetch(link: str) -> (bytes, str):
+    """
+    Downloads the page without blocking the event loop.
+
+    Args:
+        link (str): URL of the protocol.
+
+    Returns:
+        (bytes, str): Raw page content and its Content-Type header.
+    """
+    client = get_client()
+    try:
+        with stage('download'):
+            content, content_type = await download(client, link)
+        count('bytes', len(content))
+        return content, content_type
+    except httpx.HTTPError as e:
+        raise ValueError(f"Can't fetch {link}: {e}")
+
+
+async def download(client: httpx.AsyncClient, link: str) -> (bytes, str):
+    async with host_limit(link), client.stream('GET', link) as response:
+        response.raise_for_status()
+        declared = int(response.headers.get('content-length', 0))
+        if declared > settings.fetch.max_size:
+            raise ValueError(f"{link} is too large ({declared} bytes)")
+        content = bytearray()
+        async for chunk in response.aiter_bytes():
+            content.extend(chunk)
+            if len(content) > settings.fetch.max_size:
+                raise ValueError(f"{link} is larger than {settings.fetch.max_size} bytes")
+        return bytes(content), response.headers.get('content-type', '')
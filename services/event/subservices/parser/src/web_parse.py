@@ -1,44 +1,103 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import hashlib
+import os
+import tempfile
+from io import BytesIO
+from typing import BinaryIO, NamedTuple
+
 from fastapi import UploadFile
 from pandas import DataFrame
 
+from src.config import settings
+from src.services.event.subservices.parser.telemetry import stage, count, set_system
+from src.services.event.subservices.parser.src.detect import detect_system, engine_soup, SPORTORG, WINORIENT, \
+    IOF_XML, SNIFF_SIZE
+from src.services.event.subservices.parser.src.punching_systems.IOF_XML_parse import IOF_parsing
 from src.services.event.subservices.parser.src.punching_systems.SFR_parse import SFR_parsing
 from src.services.event.subservices.parser.src.punching_systems.SPORT_ORG_parse import SO_parsing
 from src.services.event.subservices.parser.src.punching_systems.WinOrient_parse import SI_parsing
-from src.services.event.subservices.parser.src.punching_systems.utils import bs
+from src.services.event.subservices.parser.src.web_fetch import fetch, decode
 
 
-def parse_event(page: BeautifulSoup) -> (DataFrame, DataFrame):
-    title = str(page.find('title'))
-    if 'WinOrient' in title:
-        return SI_parsing(page)
-    elif 'SportOrg' in title:
-        return SO_parsing(page)
-    else:
-        return SFR_parsing(page)
+def parse_page(content: bytes, content_type: str = None) -> (DataFrame, DataFrame):
+    """
+    Routes the raw page to the engine of its punching system. SportOrg pages are read
+    from the bytes, IOF XML is streamed, and only SFR and WinOrient pages are decoded and turned into a DOM.
+    """
+    with stage('detect'):
+        system = detect_system(content)
+    set_system(system)
+    if system == IOF_XML:
+        with stage('groups'):
+            return IOF_parsing(BytesIO(content))
+    if system == SPORTORG:
+        with stage('groups'):
+            return SO_parsing(content)
+    markup = decode(content, content_type)
+    with stage('dom'):
+        soup = engine_soup(markup, system)
+    with stage('groups'):
+        return SI_parsing(soup) if system == WINORIENT else SFR_parsing(soup)
 
 
-def web_parse(link: str) -> BeautifulSoup:
-    content = ''
+async def web_parse(link: str) -> (bytes, str):
     if 'http' in link:
-        response = requests.get(link)
-        try:
-            content = response.content.decode(response.apparent_encoding)
-        except UnicodeEncodeError as e:
-            content = ''
-    soup_page = bs(content)
-    return soup_page
+        return await fetch(link)
+    return b'', ''
+
+
+class UploadedSource(NamedTuple):
+    path: str
+    content_type: str
+    content_hash: str
+
+
+def parse_stream(file: BinaryIO, content_type: str = None) -> (DataFrame, DataFrame):
+    """
+    Parses a protocol file: IOF XML is streamed into its engine, other formats are read whole.
+    """
+    system = detect_system(file.read(SNIFF_SIZE))
+    file.seek(0)
+    if system == IOF_XML:
+        set_system(system)
+        with stage('groups'):
+            return IOF_parsing(file)
+    return parse_page(file.read(), content_type)
 
 
-def file_parse(data: bytes) -> BeautifulSoup:
-    pass
+async def file_parse(source_file: UploadFile) -> UploadedSource:
+    """
+    Copies an uploaded protocol chunk by chunk into a temporary file, so the request never holds
+    the whole file in memory. Chunks are written in a thread to keep disk I/O off the event loop.
+    The format is checked on the first chunk. The caller removes the file.
 
+    Args:
+        source_file (UploadFile): Uploaded HTML or IOF XML protocol.
 
-def get_source(source_link: str, source_file: UploadFile) -> BeautifulSoup:
-    if source_link:
-        return web_parse(source_link)
-    else:
-        return file_parse(source_file)
+    Returns:
+        UploadedSource: Path of the temporary file, upload Content-Type and SHA-256 of the content.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    file = tempfile.NamedTemporaryFile(dir=settings.upload.dir, prefix='protocol-', delete=False)
+    try:
+        with file, stage('upload'):
+            while chunk := await source_file.read(settings.upload.chunk_size):
+                if size == 0 and b'<' not in chunk[:SNIFF_SIZE]:
+                    raise ValueError(f"{source_file.filename} is not an HTML or IOF XML protocol")
+                size += len(chunk)
+                if size > settings.upload.max_size:
+                    raise ValueError(f"{source_file.filename} is larger than {settings.upload.max_size} bytes")
+                digest.update(chunk)
+                await asyncio.to_thread(file.write, chunk)
+        if size == 0:
+            raise ValueError(f"{source_file.filename} is empty")
+    except BaseException:
+        os.unlink(file.name)
+        raise
+    count('bytes', size)
+    return UploadedSource(file.name, source_file.content_type or '', digest.hexdigest())
 
 
+async def get_source(source_link: str) -> (bytes, str):
+    return await web_parse(source_link)
@@ -0,0 +1,145 @@
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Callable, Tuple, Any
+
+from src.schemas.event.event_schema import ImportTelemetry
+
+UNKNOWN_SYSTEM = "unknown"
+
+
+class ImportTrace:
+    """
+    Durations of the import stages (seconds) and counters (groups, runners, legs, bytes) of one import.
+    Plain attributes only, so a trace recorded in a parser worker is sent back with the result.
+    """
+
+    def __init__(self):
+        self.system: Optional[str] = None
+        self.stages: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, name: str, value: int):
+        self.counters[name] = self.counters.get(name, 0) + int(value)
+
+    def merge(self, other: "ImportTrace"):
+        self.system = other.system or self.system
+        for name, seconds in other.stages.items():
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+        for name, value in other.counters.items():
+            self.count(name, value)
+
+    def to_schema(self) -> ImportTelemetry:
+        return ImportTelemetry(system=self.system, stages=self.stages, counters=self.counters)
+
+
+_current_trace: ContextVar[Optional[ImportTrace]] = ContextVar("import_trace", default=None)
+
+
+@contextmanager
+def tracing(trace: ImportTrace):
+    """
+    Makes trace the current one for the stages and counters recorded in this context.
+    """
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+@contextmanager
+def stage(name: str):  # Times a stage of the current import, does nothing outside of an import
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    with trace.stage(name):
+        yield
+
+
+def count(name: str, value: int):
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.count(name, value)
+
+
+def set_system(system: str):
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.system = system
+
+
+def merge_trace(other: ImportTrace):
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.merge(other)
+
+
+def traced(func: Callable, *args) -> Tuple[Any, ImportTrace]:
+    """
+    Runs func(*args) with a fresh trace and returns its result with the trace. Used in parser workers.
+    """
+    with tracing(ImportTrace()) as trace:
+        return func(*args), trace
+
+
+class MetricsRegistry:
+    """
+    In-process aggregate of import traces by punching system and stage.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.imports: Counter = Counter()
+        self.stages: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self.counters: Dict[str, Counter] = {}
+
+    def record(self, trace: ImportTrace):
+        system = trace.system or UNKNOWN_SYSTEM
+        with self.lock:
+            self.imports[system] += 1
+            stages = self.stages.setdefault(system, {})
+            for name, seconds in trace.stages.items():
+                total = stages.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+                total["count"] += 1
+                total["total"] += seconds
+                total["max"] = max(total["max"], seconds)
+            self.counters.setdefault(system, Counter()).update(trace.counters)
+
+    def snapshot(self) -> dict:
+        """
+        Returns:
+            dict: {system: {"imports": n, "stages": {stage: {count, total, mean, max}}, "counters": {...}}}
+        """
+        with self.lock:
+            return {
+                system: {
+                    "imports": imports,
+                    "stages": {
+                        name: {**total, "mean": total["total"] / total["count"]}
+                        for name, total in self.stages.get(system, {}).items()
+                    },
+                    "counters": dict(self.counters.get(system, {})),
+                }
+                for system, imports in self.imports.items()
+            }
+
+    def reset(self):
+        with self.lock:
+            self.imports.clear()
+            self.stages.clear()
+            self.counters.clear()
+
+
+metrics_registry = MetricsRegistry()
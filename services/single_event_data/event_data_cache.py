@@ -0,0 +1,93 @@
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+from uuid import UUID
+
+from src.config import settings
+from src.services.single_event_data.single_event_data_service import SingleEventDataService
+
+
+class EventDataCache:
+    """
+    Process-wide LRU of decoded events. Entries are keyed by event ID and checked against the event
+    version, so an event changed by another process is decoded again. The total size of the entries
+    is kept under max_size bytes. Entries grow as they render JSON fragments, their size is taken
+    again on every hit.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.lock = threading.Lock()  # sync dependencies run in the threadpool
+        # event ID -> (version, event data, size counted for it)
+        self.entries: OrderedDict[UUID, Tuple[int, SingleEventDataService, int]] = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, event_id: UUID, version: int) -> Optional[SingleEventDataService]:
+        """
+        Returns:
+            Optional[SingleEventDataService]: The cached event data of that version, None on a miss.
+        """
+        with self.lock:
+            entry = self.entries.get(event_id)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            version, service, size = entry
+            self.entries[event_id] = (version, service, service.nbytes)
+            self.entries.move_to_end(event_id)
+            self.size += service.nbytes - size
+            self._evict()
+            self.hits += 1
+            return service
+
+    def put(self, event_id: UUID, version: int, service: SingleEventDataService):
+        with self.lock:
+            self._remove(event_id)
+            if service.nbytes > self.max_size:
+                return
+            self.entries[event_id] = (version, service, service.nbytes)
+            self.size += service.nbytes
+            self._evict()
+
+    def invalidate(self, event_id: UUID):
+        with self.lock:
+            self._remove(event_id)
+
+    def _remove(self, event_id: UUID):
+        entry = self.entries.pop(event_id, None)
+        if entry is not None:
+            self.size -= entry[2]
+
+    def _evict(self):
+        # The most recently used entry is kept even if it is larger than max_size on its own
+        while self.size > self.max_size and len(self.entries) > 1:
+            _, (_, _, size) = self.entries.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
+
+    def snapshot(self) -> dict:
+        """
+        Returns:
+            dict: Number of entries, their size and the limit in bytes, hits, misses and evictions.
+        """
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "size": self.size,
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+            self.hits = self.misses = self.evictions = 0
+
+
+event_data_cache = EventDataCache(settings.event_cache.max_size)
@@ -0,0 +1,26 @@
+import json
+from typing import Any, Iterable
+
+
+def render(obj: Any) -> bytes:
+    """
+    Encodes obj as compact JSON, the way FastAPI renders a JSONResponse. Bytes values are
+    taken as already encoded JSON and are spliced in as they are.
+
+    Args:
+        obj (Any): JSON compatible dicts, lists and scalars, and encoded fragments.
+
+    Returns:
+        bytes: UTF-8 encoded JSON.
+    """
+    if isinstance(obj, bytes):
+        return obj
+    if isinstance(obj, dict):
+        return b'{' + b','.join(render(str(k)) + b':' + render(v) for k, v in obj.items()) + b'}'
+    if isinstance(obj, (list, tuple)):
+        return render_array(render(i) for i in obj)
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False).encode()
+
+
+def render_array(fragments: Iterable[bytes]) -> bytes:
+    return b'[' + b','.join(fragments) + b']'
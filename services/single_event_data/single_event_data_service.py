@@ -1,17 +1,23 @@
+import base64
 import json
 from io import StringIO
-from typing import List, Dict, Union
+from typing import List, Dict, Union, Tuple, Optional, Type
 import datetime
 from uuid import UUID
 
 import numpy as np
 import pandas as pd
+from fastapi import HTTPException
+from pydantic import BaseModel
 
-from src.schemas.event.event_schema import EventInDB
+from src.database.split_matrix import decode_split_matrix, seconds_frames
+from src.schemas.event.event_schema import EventInDB, EventValidators
 from src.schemas.single_event_data.single_event_data_schema import EventOutput, GroupOutput, CourseOutput, RunnerOutput, \
     LegOutput
+from src.services.single_event_data.json_fragments import render, render_array
 
 NANOSECONDS_TO_SECONDS = 1e9
+JSON_SIZE_FACTOR = 4  # decoded JSON objects take about four times the size of the JSON text
 
 class SingleEventDataService:
     """
@@ -30,12 +36,20 @@ class SingleEventDataService:
         self.title: str = event.title
         self.count: int = event.count
         self.source: str = event.source
-        self.date: datetime.datetime = datetime.datetime.now()
-
-        # Load splits and results as DataFrames, converting them to appropriate time formats.
-        self.splits: pd.DataFrame = pd.read_json(StringIO(event.splits), orient="index").T / NANOSECONDS_TO_SECONDS
-
-        self.results: pd.Series = pd.read_json(StringIO(event.results), orient="index").iloc[:,0] / NANOSECONDS_TO_SECONDS
+        # The stored date, so that the output only changes with the event (see EventValidators)
+        self.date: datetime.datetime = event.date or datetime.datetime.now()
+        self.validators: EventValidators = EventValidators(version=event.version, checksum=event.checksum,
+                                                           updated=event.updated)
+
+        # Load splits and results in nullable Int32 seconds (NA for missing values),
+        # from the split matrix unless the event predates it.
+        if event.split_matrix:
+            self.splits, self.results = seconds_frames(decode_split_matrix(event.split_matrix))
+        else:
+            splits = pd.read_json(StringIO(event.splits), orient="index").T / NANOSECONDS_TO_SECONDS
+            results = pd.read_json(StringIO(event.results), orient="index").iloc[:,0] / NANOSECONDS_TO_SECONDS
+            self.splits: pd.DataFrame = splits.round().astype("Int32")
+            self.results: pd.Series = results.round().astype("Int32")
 
         # Load other JSON-encoded event data.
         self.courses: Dict[str, Dict] = json.loads(event.courses)
@@ -43,6 +57,35 @@ class SingleEventDataService:
         self.runners: Dict[str, Dict] = json.loads(event.runners)
         self.legs: Dict[str, Dict] = json.loads(event.legs)
 
+        # Membership indexes, built once so that lookups cost O(members).
+        self.group_runners: Dict[str, List[str]] = {i: [] for i in self.groups}
+        self.course_group_runners: Dict[Tuple[str, str], List[str]] = {}
+        self.group_courses: Dict[str, List[str]] = {i: [] for i in self.groups}
+        for runner_id, runner in self.runners.items():
+            group, course = runner['group'], runner['course']
+            self.group_runners.setdefault(group, []).append(runner_id)
+            members = self.course_group_runners.setdefault((course, group), [])
+            if not members:
+                self.group_courses.setdefault(group, []).append(course)
+            members.append(runner_id)
+        self.leg_courses: Dict[str, List[str]] = {i: [] for i in self.legs}
+        for course_id, points in self.courses.items():
+            for leg_id in dict.fromkeys(points.values()):
+                self.leg_courses.setdefault(leg_id, []).append(course_id)
+
+        # Rendered JSON of the entities by (kind, ID, nesting level, fields), filled on first use.
+        self.fragments: Dict[Tuple[str, str, int, Optional[Tuple[str, ...]]], bytes] = {}
+        self.fragments_size: int = 0
+        self.positions: Dict[str, Tuple[List[str], Dict[str, int]]] = {}  # IDs in order and their positions by kind
+
+        # Approximate memory taken by the decoded event, see EventDataCache
+        self.data_nbytes: int = int(self.splits.memory_usage(deep=True).sum()) + int(self.results.memory_usage(deep=True)) \
+            + JSON_SIZE_FACTOR * sum(map(len, (event.courses, event.groups, event.runners, event.legs)))
+
+    @property
+    def nbytes(self) -> int:
+        return self.data_nbytes + self.fragments_size
+
     def get_event(self, nesting_level: int = 0) -> EventOutput:
         """
         Retrieves the full event information, including groups, runners, courses, and legs.
@@ -85,8 +128,8 @@ class SingleEventDataService:
         name = group_db['name']
 
         # Get the runners and courses associated with this group.
-        group_runners_id = [i for i, v in self.runners.items() if v['group'] == group_id]
-        group_courses_id = list(set([self.runners[r]['course'] for r in group_runners_id]))
+        group_runners_id = self.group_runners[group_id]
+        group_courses_id = self.group_courses[group_id]
 
         if nesting_level > 0:
             nesting_level -= 1
@@ -173,6 +216,7 @@ class SingleEventDataService:
 
         group = UUID(runner_db['group'])
         result = self.results.loc[runner_id]
+        result = None if pd.isna(result) else int(result)
 
         runner = {
             "id": UUID(runner_id),
@@ -218,3 +262,225 @@ class SingleEventDataService:
             List[LegOutput]: A list of all leg data structures.
         """
         return [self.get_leg(leg_id) for leg_id in self.legs]
+
+    def _fragment(self, kind: str, _id: str, nesting_level: int, fields: Optional[Tuple[str, ...]], build) -> bytes:
+        key = (kind, _id, nesting_level, fields)
+        fragment = self.fragments.get(key)
+        if fragment is None:
+            data = build()
+            if fields is not None:
+                data = {k: v for k, v in data.items() if k in fields}
+            fragment = self.fragments[key] = render(data)
+            self.fragments_size += len(fragment)
+        return fragment
+
+    def get_page(self, kind: str, limit: Optional[int] = None, cursor: Optional[str] = None) \
+            -> Tuple[List[str], Optional[str]]:
+        """
+        Pages through the groups, courses, runners or legs of the event in their stored order.
+
+        Args:
+            kind (str): One of "groups", "courses", "runners" and "legs".
+            limit (int, optional): Page size, all the remaining entities if None.
+            cursor (str, optional): Cursor of the page returned with the previous one.
+
+        Returns:
+            Tuple[List[str], Optional[str]]: IDs of the page and the cursor of the next one, None on the last page.
+        """
+        if kind not in self.positions:
+            ids = list(getattr(self, kind))
+            self.positions[kind] = (ids, {_id: n for n, _id in enumerate(ids)})
+        ids, positions = self.positions[kind]
+        start = 0
+        if cursor:
+            try:
+                start = positions[json.loads(base64.urlsafe_b64decode(cursor.encode()))] + 1
+            except (ValueError, TypeError, KeyError):
+                raise HTTPException(status_code=400, detail=f"Invalid cursor {cursor}")
+        end = len(ids) if limit is None else min(start + limit, len(ids))
+        next_cursor = None
+        if end < len(ids):
+            next_cursor = base64.urlsafe_b64encode(json.dumps(ids[end - 1]).encode()).decode()
+        return ids[start:end], next_cursor
+
+    @staticmethod
+    def parse_fields(model: Type[BaseModel], fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+        """
+        Parses a comma-separated list of fields of model.
+
+        Returns:
+            Optional[Tuple[str, ...]]: The fields in model order, None (all fields) if fields is empty.
+        """
+        if not fields:
+            return None
+        names = {i.strip() for i in fields.split(",")}
+        unknown = names - set(model.model_fields)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+        return tuple(i for i in model.model_fields if i in names)
+
+    def get_event_json(self, nesting_level: int = 0) -> bytes:
+        """
+        Same as get_event, rendered as JSON from the cached fragments of the entities.
+
+        Args:
+            nesting_level (int): The level of detail (nesting) to include in the event's groups, courses, and runners.
+
+        Returns:
+            bytes: The complete event data structure as JSON.
+        """
+        return render({
+            "id": str(self.id),
+            "title": self.title,
+            "count": self.count,
+            "date": self.date.isoformat(),
+            "source": self.source,
+            "groups": self.get_groups_json(nesting_level),
+            "runners": self.get_runners_json(nesting_level),
+            "courses": self.get_courses_json(nesting_level),
+            "legs": self.get_legs_json(),
+        })
+
+    def get_group_json(self, group_id: str, nesting_level: int = 0, fields: Optional[Tuple[str, ...]] = None) -> bytes:
+        """
+        Same as get_group, rendered as JSON once per nesting level.
+
+        Args:
+            group_id (str): The ID of the group to retrieve.
+            nesting_level (int): The level of detail (nesting) to include in the group's runners and courses.
+            fields (Tuple[str, ...], optional): Fields to include, all if None.
+
+        Returns:
+            bytes: The group data structure as JSON.
+        """
+        nesting_level = min(nesting_level, 3)  # deeper levels render the same
+
+        def build():
+            group = self.get_group(group_id).model_dump(mode="json")
+            if nesting_level > 0:
+                if fields is None or "runners" in fields:
+                    group["runners"] = render_array(self.get_runner_json(i, nesting_level - 1)
+                                                    for i in self.group_runners[group_id])
+                if fields is None or "courses" in fields:
+                    group["courses"] = render_array(self.get_course_json(i, nesting_level - 1)
+                                                    for i in self.group_courses[group_id])
+            return group
+
+        return self._fragment("group", group_id, nesting_level, fields, build)
+
+    def get_groups_json(self, nesting_level: int = 0, ids: Optional[List[str]] = None,
+                        fields: Optional[Tuple[str, ...]] = None) -> bytes:
+        """
+        Same as get_groups, rendered as JSON.
+
+        Args:
+            nesting_level (int): The level of detail (nesting) to include in each group's runners and courses.
+            ids (List[str], optional): Groups to include, all if None (see get_page).
+            fields (Tuple[str, ...], optional): Fields to include, all if None.
+
+        Returns:
+            bytes: A JSON array of the groups.
+        """
+        return render_array(self.get_group_json(i, nesting_level, fields) for i in (self.groups if ids is None else ids))
+
+    def get_course_json(self, course_id: str, nesting_level: int = 0, fields: Optional[Tuple[str, ...]] = None) -> bytes:
+        """
+        Same as get_course, rendered as JSON once per nesting level.
+
+        Args:
+            course_id (str): The ID of the course to retrieve.
+            nesting_level (int): The level of detail (nesting) to include in the course's legs.
+            fields (Tuple[str, ...], optional): Fields to include, all if None.
+
+        Returns:
+            bytes: The course data structure as JSON.
+        """
+        nesting_level = min(nesting_level, 1)
+
+        def build():
+            course = self.get_course(course_id).model_dump(mode="json")
+            if nesting_level > 0 and (fields is None or "points" in fields):
+                course["points"] = {n: self.get_leg_json(leg) for n, leg in self.courses[course_id].items()}
+            return course
+
+        return self._fragment("course", course_id, nesting_level, fields, build)
+
+    def get_courses_json(self, nesting_level: int = 0, ids: Optional[List[str]] = None,
+                         fields: Optional[Tuple[str, ...]] = None) -> bytes:
+        """
+        Same as get_courses, rendered as JSON.
+
+        Args:
+            nesting_level (int): The level of detail (nesting) to include in each course's legs.
+            ids (List[str], optional): Courses to include, all if None (see get_page).
+            fields (Tuple[str, ...], optional): Fields to include, all if None.
+
+        Returns:
+            bytes: A JSON array of the courses.
+        """
+        return render_array(self.get_course_json(i, nesting_level, fields)
+                            for i in (self.courses if ids is None else ids))
+
+    def get_runner_json(self, runner_id: str, nesting_level: int = 0, fields: Optional[Tuple[str, ...]] = None) -> bytes:
+        """
+        Same as get_runner, rendered as JSON once per nesting level.
+
+        Args:
+            runner_id (str): The ID of the runner to retrieve.
+            nesting_level (int): The level of detail (nesting) to include in the runner's course.
+            fields (Tuple[str, ...], optional): Fields to include, all if None.
+
+        Returns:
+            bytes: The runner data structure as JSON.
+        """
+        nesting_level = min(nesting_level, 2)
+
+        def build():
+            runner = self.get_runner(runner_id).model_dump(mode="json")
+            if nesting_level > 0 and (fields is None or "course" in fields):
+                runner["course"] = self.get_course_json(self.runners[runner_id]['course'], nesting_level - 1)
+            return runner
+
+        return self._fragment("runner", runner_id, nesting_level, fields, build)
+
+    def get_runners_json(self, nesting_level: int = 0, ids: Optional[List[str]] = None,
+                         fields: Optional[Tuple[str, ...]] = None) -> bytes:
+        """
+        Same as get_runners, rendered as JSON.
+
+        Args:
+            nesting_level (int): The level of detail (nesting) to include in each runner's course.
+            ids (List[str], optional): Runners to include, all if None (see get_page).
+            fields (Tuple[str, ...], optional): Fields to include, all if None.
+
+        Returns:
+            bytes: A JSON array of the runners.
+        """
+        return render_array(self.get_runner_json(i, nesting_level, fields)
+                            for i in (self.runners if ids is None else ids))
+
+    def get_leg_json(self, leg_id: str, fields: Optional[Tuple[str, ...]] = None) -> bytes:
+        """
+        Same as get_leg, rendered as JSON once.
+
+        Args:
+            leg_id (str): The ID of the leg to retrieve.
+            fields (Tuple[str, ...], optional): Fields to include, all if None.
+
+        Returns:
+            bytes: The leg data structure as JSON.
+        """
+        return self._fragment("leg", leg_id, 0, fields, lambda: self.get_leg(leg_id).model_dump(mode="json"))
+
+    def get_legs_json(self, ids: Optional[List[str]] = None, fields: Optional[Tuple[str, ...]] = None) -> bytes:
+        """
+        Same as get_legs, rendered as JSON.
+
+        Args:
+            ids (List[str], optional): Legs to include, all if None (see get_page).
+            fields (Tuple[str, ...], optional): Fields to include, all if None.
+
+        Returns:
+            bytes: A JSON array of the legs.
+        """
+        return render_array(self.get_leg_json(i, fields) for i in (self.legs if ids is None else ids))
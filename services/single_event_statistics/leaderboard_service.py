@@ -0,0 +1,72 @@
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.repositories.course.course_repository import CourseRepository
+from src.repositories.group.group_repository import GroupRepository
+from src.repositories.leg.leg_repository import LegRepository
+from src.schemas.single_event_statistics.single_event_statistics_schema import LeaderBoard
+
+
+class LeaderboardService:
+    """
+    Group, course and leg leaderboards queried from the entity tables,
+    so only the rows of the leaderboard are read instead of the whole event.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.groups = GroupRepository(session)
+        self.courses = CourseRepository(session)
+        self.legs = LegRepository(session)
+
+    @staticmethod
+    def check_entity(entity, event_id: UUID, name: str):
+        if entity is None or entity.event != event_id:
+            raise HTTPException(status_code=404, detail=f"{name} not found")
+
+    async def get_group_leaderboard(self, event_id: UUID, group_id: UUID, limit: int = None) -> LeaderBoard:
+        """
+        Args:
+            event_id (UUID): The event ID.
+            group_id (UUID): The group ID.
+            limit (int, optional): Number of leading runners to return, all if None.
+
+        Returns:
+            LeaderBoard: Results of the group, fastest first.
+        """
+        self.check_entity(await self.groups.get_by_id(group_id), event_id, "Group")
+        leaderboard = await self.groups.get_leaderboard(event_id, group_id, limit)
+        return LeaderBoard(id=group_id, type="group", leaderboard=leaderboard)
+
+    async def get_leg_leaderboard(self, event_id: UUID, leg_id: UUID, group_id: UUID = None,
+                                  limit: int = None) -> LeaderBoard:
+        """
+        Args:
+            event_id (UUID): The event ID.
+            leg_id (UUID): The leg ID.
+            group_id (UUID, optional): Only the runners of this group.
+            limit (int, optional): Number of leading runners to return, all if None.
+
+        Returns:
+            LeaderBoard: Splits of the leg, fastest first.
+        """
+        self.check_entity(await self.legs.get_by_id(leg_id), event_id, "Leg")
+        leaderboard = await self.legs.get_leaderboard(leg_id, group_id, limit)
+        return LeaderBoard(id=leg_id, type="leg", leaderboard=leaderboard)
+
+    async def get_course_leaderboard(self, event_id: UUID, course_id: UUID, group_id: UUID = None,
+                                     limit: int = None) -> LeaderBoard:
+        """
+        Args:
+            event_id (UUID): The event ID.
+            course_id (UUID): The course ID.
+            group_id (UUID, optional): Only the runners of this group.
+            limit (int, optional): Number of leading runners to return, all if None.
+
+        Returns:
+            LeaderBoard: Results on the course, fastest first.
+        """
+        self.check_entity(await self.courses.get_by_id(course_id), event_id, "Course")
+        leaderboard = await self.courses.get_leaderboard(event_id, course_id, group_id, limit)
+        return LeaderBoard(id=course_id, type="course", leaderboard=leaderboard)
@@ -1,3 +1,4 @@
+import pandas as pd
 from matplotlib import pyplot as plt
 from pandas import DataFrame
 import matplotlib
@@ -6,6 +7,7 @@ from pandas import DataFrame
 matplotlib.use('TkAgg')
 from src.schemas.single_event_statistics.single_event_statistics_schema import RunnerLegStatistics, RunnerStatistics, \
     RunnerLegGEOStatistics
+from src.database.track_points import decode_track_points
 from src.schemas.track.track_schema import TrackInDB
 from src.services.track.subservices.gpx_transformer.utils import haversine
 
@@ -18,7 +20,13 @@ class GeoSplitService:
         self.distance: float = track.distance
         self.elevation: float = track.elevation
         self.duration: float = track.duration
-        self.points: DataFrame = DataFrame(track.points).astype({"time": "datetime64[ns, UTC]"})
+        points = decode_track_points(track.points)
+        self.points: DataFrame = DataFrame({
+            "time": pd.DatetimeIndex(points.times(), tz="UTC"),
+            "lat": points.lat,
+            "lon": points.lon,
+            "ele": points.ele,
+        })
 
     def get_runner_leg_stat(self, leg_stat: RunnerLegStatistics) -> RunnerLegGEOStatistics:
         leg_start_point = leg_stat.gen_time - leg_stat.split
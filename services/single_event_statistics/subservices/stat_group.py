@@ -1,14 +1,14 @@
 from typing import List
 from pandas import Series
 
-from src.schemas.event.event_schema import EventInDB
 from src.services.single_event_data.single_event_data_service import SingleEventDataService
 
 
 class StatGroup:
     """
     Class representing a specific group in a certain event.
-    This class provides methods to retrieve group-specific statistics such as the leaderboard.
+    This class provides methods to retrieve group-specific statistics such as the leaderboard,
+    used by the runner statistics (the leaderboard routes read the entity tables, see LeaderboardService).
     """
 
     def __init__(self, group_id: str, service: SingleEventDataService):
@@ -20,7 +20,7 @@ class StatGroup:
             service (SingleEventDataService): The service providing access to event data.
         """
         self.service: SingleEventDataService = service
-        self.data: dict = self.service.get_group(group_id).to_str()  # Group data from the service
+        self.runners: List[str] = self.service.group_runners[group_id]  # IDs of the group's runners
 
     def get_leaderboard(self) -> Series:
         """
@@ -29,7 +29,5 @@ class StatGroup:
         Returns:
             Series: A pandas Series containing the sorted results (times) of the group's runners.
         """
-        # Retrieve the list of runner IDs in the group
-        names: List[str] = self.data['runners']
         # Fetch the results for the runners in the group and sort them to generate the leaderboard
-        return self.service.results.loc[names].sort_values()
+        return self.service.results.loc[self.runners].sort_values()
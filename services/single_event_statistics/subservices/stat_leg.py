@@ -6,7 +6,8 @@ from src.services.single_event_data.single_event_data_service import SingleEvent
 class StatLeg:
     """
     Class representing a specific leg in a certain event.
-    This class provides methods to retrieve leg-specific statistics such as the leaderboard for that leg.
+    This class provides methods to retrieve leg-specific statistics such as the leaderboard for that leg,
+    used by the runner statistics (the leaderboard routes read the entity tables, see LeaderboardService).
     """
 
     def __init__(self, leg_id: str, service: SingleEventDataService):
@@ -33,8 +34,9 @@ class StatLeg:
                     Missing values are dropped.
         """
         if group_id:
-            # If group_id is provided, retrieve runners in that group and get their splits for the leg
-            group_runners = self.service.get_group(group_id).to_str()['runners']
+            # If group_id is provided, retrieve runners of that group whose course has the leg and get their splits
+            group_runners = [runner for course in self.service.leg_courses.get(self.data['id'], [])
+                             for runner in self.service.course_group_runners.get((course, group_id), [])]
             return self.service.splits.loc[group_runners, self.data['id']].sort_values().dropna(how='all')
         else:
             # Otherwise, get splits for all runners in the leg
@@ -80,10 +80,11 @@ class StatRunner:
         Retrieves the runner's split times for their course.
 
         Returns:
-            Series: A pandas Series containing the runner's split times for each leg.
+            Series: A pandas Series containing the runner's split times for each leg, NaN for missing splits.
         """
         course = self.get_course()
-        return self.service.splits.loc[self.data['id'], course.values()]
+        # Only the runner's row is turned into float seconds, the event splits stay nullable Int32
+        return self.service.splits.loc[self.data['id'], course.values()].astype('float64')
 
     def get_place(self) -> int:
         """
@@ -1,15 +1,17 @@
 import json
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Optional, List, Tuple
 
 import numpy as np
 import pandas as pd
 from lxml import etree
 
+from src.database.track_points import encode_track_points
 from src.schemas.track.track_schema import TrackInput, TrackData
 from src.services.track.subservices.gpx_transformer.utils import haversine
 
 METRE_IN_KM = 1000
+POINTS_INTERVAL = 1  # seconds between interpolated points
 
 
 class GPXTransformer:
@@ -220,37 +222,26 @@ class GPXTransformer:
         self._starting_point = (self.coordinates_list[0], self.coordinates_list[1])
         return self._starting_point
 
-    def interp_points(self):
+    def interp_points(self) -> Tuple[datetime, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Interpolates the track to one point per second.
+
+        Returns:
+            Tuple[datetime, np.ndarray, np.ndarray, np.ndarray]: Time of the first point, latitudes,
+                longitudes and elevations.
+        """
         paired_data = self.paired_data
-        points = [
-            {
-                "time": entry[0],
-                "lat": entry[2],
-                "lon": entry[1],
-                "elevation": entry[3]
-            }
-            for entry in paired_data
-        ]
         time_range = int(round(self.total_duration.total_seconds()))
-        start_time = points[0]['time']
+        start_time = paired_data[0][0]
 
-        old_indexes = list(range(len(points)))
-        time_indexes = list(range(time_range))
-        lat_values = [i['lat'] for i in points]
-        lon_values = [i['lon'] for i in points]
-        ele_values = [i['elevation'] for i in points]
+        old_indexes = np.arange(len(paired_data))
+        time_indexes = np.arange(time_range)
+        _, lon_values, lat_values, ele_values = zip(*paired_data)
 
         interp_lat = np.interp(time_indexes, old_indexes, lat_values)
         interp_lon = np.interp(time_indexes, old_indexes, lon_values)
         interp_ele = np.interp(time_indexes, old_indexes, ele_values)
-        interp_time = [(start_time + timedelta(seconds=i)).strftime('%Y-%m-%dT%H:%M:%SZ') for i, v in enumerate(time_indexes)]
-        return [{
-            "time": interp_time[i],
-            "lat": interp_lat[i],
-            "lon":interp_lon[i],
-            "ele": interp_ele[i]
-        } for i in time_indexes]
-
+        return start_time, interp_lat, interp_lon, interp_ele
 
     def to_track_data(self) -> TrackData:
         """
@@ -259,10 +250,10 @@ class GPXTransformer:
         Returns:
             TrackData: A Pydantic model instance with track details.
         """
-        points = self.interp_points()
+        start_time, lat, lon, ele = self.interp_points()
         return TrackData(
             distance=self.total_distance,
             elevation=self.total_elevation,
             duration=self.total_duration.total_seconds(),
-            points=points
+            points=encode_track_points(start_time, POINTS_INTERVAL, lat, lon, ele)
         )
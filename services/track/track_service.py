@@ -1,11 +1,11 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from fastapi import HTTPException, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.repositories.track.track_repository import TrackRepository
-from src.schemas.track.track_schema import TrackInput, TrackInDB, TrackEndpoint
+from src.schemas.track.track_schema import TrackInput, TrackInDB, TrackEndpoint, TrackResponse
 from src.services.track.subservices.gpx_transformer.gpx_transformer_service import GPXTransformer
 
 
@@ -20,8 +20,7 @@ class TrackService:
     async def create(self, data_from_api: TrackEndpoint, gpxfile: UploadFile) -> TrackInDB:
 
         # Check if track already exists for the given event and runner
-        exist = await self.repository.get_by_event(data_from_api.event)
-        if any(track.runner == data_from_api.runner for track in exist):
+        if await self.repository.exists(data_from_api.event, data_from_api.runner):
             raise HTTPException(status_code=400, detail="Track for this runner in the event already exists")
 
         gpxfile_bytes = gpxfile
@@ -34,12 +33,18 @@ class TrackService:
             **track_data.model_dump()
         )
         track_from_db = await self.repository.create(track_input)
+        if track_from_db is None:
+            # Uploaded in the meantime by a concurrent request
+            raise HTTPException(status_code=400, detail="Track for this runner in the event already exists")
         return track_from_db
 
-    async def get_all(self) -> List[TrackInDB]:
+    async def get_all(self) -> List[TrackResponse]:
         return await self.repository.get_all()
 
-    async def get_track(self, _id: UUID) -> TrackInDB:
+    async def get_by_event(self, event_id: UUID) -> List[TrackResponse]:
+        return await self.repository.get_by_event(event_id)
+
+    async def get_track(self, _id: UUID) -> TrackResponse:
         track = await self.repository.get_track(_id)
         if not track:
             raise HTTPException(status_code=404, detail="Track not found")
@@ -51,6 +56,9 @@ class TrackService:
             raise HTTPException(status_code=404, detail="Track not found")
         return track
 
+    async def get_track_id(self, event_id: UUID, runner_id: UUID) -> Optional[UUID]:
+        return await self.repository.get_id(event_id, runner_id)
+
     async def delete(self, _id: UUID) -> bool:
         track = await self.repository.get_by_id(_id)
         if not track:
@@ -0,0 +1,152 @@
+"""
+Parser benchmark: wall time, peak memory and per-stage timings for every protocol format and size.
+
+    python -m src.tests.benchmarks.bench_parser --sizes 100 1000 --output bench.json
+    python -m src.tests.benchmarks.bench_parser --baseline bench.json
+
+Stages are timed in this process. `parse` is the cold Parser.parse call (fetch served from memory,
+parsing in the parser pool) and `memo` is the repeated call answered from the protocol cache.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import httpx
+
+from src.services.event.subservices.parser.parser import Parser, parse_source
+from src.services.event.subservices.parser.parser_pool import parser_pool
+from src.services.event.subservices.parser.protocol_cache import protocol_cache
+from src.services.event.subservices.parser.src import web_fetch
+from src.services.event.subservices.parser.telemetry import traced
+from src.tests.benchmarks.protocols import GENERATORS, SIZES
+
+CONTENT_TYPE = 'text/html'
+
+
+def run_stages(content: bytes) -> dict:
+    """
+    Parses the page in this process and returns the seconds spent in every stage of the import trace.
+    """
+    _, trace = traced(parse_source, content, CONTENT_TYPE, 'benchmark')
+    return trace.stages
+
+
+def peak_memory(content: bytes) -> int:
+    tracemalloc.start()
+    try:
+        run_stages(content)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+async def run_parser(pages: dict) -> dict:
+    """
+    Times Parser.parse for every page, serving the downloads from memory.
+
+    Returns:
+        dict: {url: {'parse': seconds, 'memo': seconds}}
+    """
+    web_fetch._client = httpx.AsyncClient(transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, content=pages[str(request.url)], headers={'content-type': CONTENT_TYPE})
+    ))
+    await parser_pool.start()
+    parser = Parser()
+    timings = {}
+    try:
+        for url in pages:
+            timings[url] = {}
+            for stage in ('parse', 'memo'):
+                start = time.perf_counter()
+                await parser.parse(source_link=url)
+                timings[url][stage] = time.perf_counter() - start
+    finally:
+        parser_pool.shutdown()
+        await web_fetch.close_client()
+    return timings
+
+
+def benchmark(sizes: list, systems: list, repeat: int) -> list:
+    rows = []
+    pages = {}
+    for size in sizes:
+        groups, runners, controls = SIZES[size]
+        for system in systems:
+            content = GENERATORS[system](groups, runners, controls)
+            stages = [run_stages(content) for _ in range(repeat)]
+            best = min(stages, key=lambda i: sum(i.values()))
+            url = f'http://bench.local/{system}/{size}'
+            pages[url] = content
+            rows.append({
+                'system': system,
+                'runners': size,
+                'page_kb': len(content) // 1024,
+                'wall': sum(best.values()),
+                'peak_mb': peak_memory(content) / 2 ** 20,
+                'stages': best,
+                'url': url,
+            })
+
+    # Parse results are memoized by content, so the protocol cache is kept in a scratch directory
+    with tempfile.TemporaryDirectory() as path:
+        protocol_cache.path, protocol_cache._db = Path(path), None
+        parser_timings = asyncio.run(run_parser(pages))
+        protocol_cache._db.close()
+        protocol_cache._db = None
+    for row in rows:
+        row.update(parser_timings[row.pop('url')])
+    return rows
+
+
+def report(rows: list, baseline: dict = None, tolerance: float = 0.2) -> bool:
+    """
+    Prints the benchmark table, with the ratio to the baseline when one is given.
+
+    Returns:
+        bool: True if no wall time exceeds the baseline by more than tolerance.
+    """
+    stages = ['detect', 'encoding', 'dom', 'groups', 'entities']
+    header = f"{'system':<10}{'runners':>8}{'KB':>8}{'wall s':>9}{'peak MB':>9}{'parse s':>9}{'memo s':>9}"
+    header += ''.join(f'{stage:>10}' for stage in stages) + ('    vs base' if baseline else '')
+    print(header)
+    ok = True
+    for row in rows:
+        line = (f"{row['system']:<10}{row['runners']:>8}{row['page_kb']:>8}{row['wall']:>9.3f}"
+                f"{row['peak_mb']:>9.1f}{row['parse']:>9.3f}{row['memo']:>9.3f}")
+        line += ''.join(f"{row['stages'].get(stage, 0):>10.4f}" for stage in stages)
+        base = (baseline or {}).get(f"{row['system']}/{row['runners']}")
+        if base:
+            ratio = row['wall'] / base['wall']
+            line += f'{ratio:>10.2f}x' + (' REGRESSION' if ratio > 1 + tolerance else '')
+            ok = ok and ratio <= 1 + tolerance
+        print(line)
+    return ok
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES), choices=list(SIZES))
+    arg_parser.add_argument('--systems', nargs='+', default=list(GENERATORS), choices=list(GENERATORS))
+    arg_parser.add_argument('--repeat', type=int, default=3, help='stage runs per page, the fastest one is kept')
+    arg_parser.add_argument('--output', type=Path, help='save the results as JSON')
+    arg_parser.add_argument('--baseline', type=Path, help='JSON saved by an earlier run to compare with')
+    arg_parser.add_argument('--tolerance', type=float, default=0.2, help='allowed wall time growth over the baseline')
+    args = arg_parser.parse_args()
+
+    rows = benchmark(args.sizes, args.systems, args.repeat)
+    baseline = None
+    if args.baseline:
+        baseline = {f"{row['system']}/{row['runners']}": row for row in json.loads(args.baseline.read_text())}
+    ok = report(rows, baseline, args.tolerance)
+    if args.output:
+        args.output.write_text(json.dumps(rows, indent=2))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+"""
+Synthetic protocol generators for parser benchmarks.
+
+Every generator renders the same synthetic race, so SFR, WinOrient and SportOrg pages
+of one size carry the same runners, courses and split times.
+"""
+import json
+import random
+from xml.sax.saxutils import escape
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+SURNAMES = ['Иванов', 'Петров', 'Сидоров', 'Кузнецов', 'Смирнов', 'Попов', 'Соколов', 'Лебедев',
+            'Козлов', 'Новиков', 'Морозов', 'Волков', 'Алексеев', 'Егоров', 'Павлов', 'Степанов',
+            'Никитин', 'Захаров', 'Зайцев', 'Соловьёв', 'Борисов', 'Яковлев', 'Григорьев', 'Романов',
+            'Воробьёв', 'Сергеев', 'Фролов', 'Андреев', 'Макаров', 'Орлов', 'Комаров', 'Белов']
+NAMES = ['Иван', 'Пётр', 'Алексей', 'Дмитрий', 'Сергей', 'Андрей', 'Михаил', 'Никита', 'Павел', 'Егор',
+         'Артём', 'Кирилл', 'Максим', 'Илья', 'Роман']
+CLUBS = ['Азимут', 'Сев-Зап', 'Ориента', 'КСО Москва', 'Вертикаль', 'Лидер', 'Компас', 'Невский']
+
+# Benchmark sizes: total runners -> (groups, runners per group, controls per course)
+SIZES = {
+    100: (5, 20, 8),
+    1000: (20, 50, 12),
+    5000: (40, 125, 16),
+    20000: (80, 250, 20),
+}
+
+
+@dataclass
+class Runner:
+    surname: str
+    name: str
+    club: str
+    splits: List[int]  # seconds of every leg including the finish, 0 for a missed control
+    result: Optional[int]  # seconds, None for a disqualified runner
+
+
+@dataclass
+class Group:
+    name: str
+    codes: List[int]
+    runners: List[Runner] = field(default_factory=list)
+
+
+def synthetic_race(groups: int, runners: int, controls: int, seed: int = 0) -> List[Group]:
+    """
+    Builds a race of groups x runners. Neighbouring groups share a course, about 3% of runners
+    miss a control and get no result. Names are unique inside a group and repeat across groups.
+    """
+    rnd = random.Random(seed)
+    courses = {}
+    race = []
+    for g in range(groups):
+        course = g // 2
+        if course not in courses:
+            courses[course] = rnd.sample(range(31, 200), controls)
+        group = Group(name=f"{'МЖ'[g % 2]}{12 + 2 * course}", codes=courses[course])
+        names = rnd.sample([(surname, name) for surname in SURNAMES for name in NAMES], runners)
+        for surname, name in names:
+            pace = rnd.uniform(0.7, 1.6)
+            splits = [max(int(rnd.randint(60, 420) * pace), 1) for _ in range(controls + 1)]
+            result = sum(splits)
+            if rnd.random() < 0.03:
+                splits[rnd.randrange(controls)] = 0
+                result = None
+            group.runners.append(Runner(surname, name, rnd.choice(CLUBS), splits, result))
+        race.append(group)
+    return race
+
+
+def clock(seconds: int) -> str:
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def minutes(seconds: int) -> str:
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+def sfr_protocol(groups: int, runners: int, controls: int, seed: int = 0, header_codes: bool = True) -> bytes:
+    """
+    SFR protocol: an <h2> and a <table> per group, cumulative times in the split cells.
+    Control codes are in the header (header_codes) or in every split cell.
+    """
+    out = ['<html><head><meta http-equiv="Content-Type" content="text/html; charset=windows-1251">',
+           '<title>Протокол результатов</title></head><body>']
+    for group in synthetic_race(groups, runners, controls, seed):
+        head = ''.join(f'<th>#{n}({c})</th>' if header_codes else f'<th>#{n}</th>'
+                       for n, c in enumerate(group.codes, start=1))
+        head += '<th>F(240)</th>' if header_codes else '<th>F</th>'
+        out.append(f'<h2>{group.name}</h2>\n<table class="rezult">')
+        out.append(f'<tr><th>№п/п</th><th>Фамилия, имя</th><th>Коллектив</th><th>Результат</th>'
+                   f'<th>Место</th>{head}</tr>')
+        for n, runner in enumerate(group.runners, start=1):
+            cells, total = [], 0
+            for code, split in zip(group.codes + [240], runner.splits):
+                total += split
+                if not split:
+                    cells.append('<td></td>')
+                    continue
+                mark = f'[{code}]' if not header_codes and code != 240 else ''
+                cells.append(f'<td>{minutes(total)}{mark}</td>')
+            result = clock(runner.result) if runner.result else 'снят'
+            place = n if runner.result else ''
+            out.append(f'<tr><td>{n}</td><td class="cr">{runner.surname} {runner.name}</td>'
+                       f'<td class="cr">{runner.club}</td><td>{result}</td><td>{place}</td>{"".join(cells)}</tr>')
+        out.append('</table>')
+    out.append('</body></html>')
+    return '\n'.join(out).encode('windows-1251')
+
+
+def winorient_protocol(groups: int, runners: int, controls: int, seed: int = 0) -> bytes:
+    """
+    WinOrient protocol: an <h2> and a <pre> block per group, one runner per line
+    with 'hh:mm:ss(code)' split times.
+    """
+    out = ['<html><head><meta http-equiv="Content-Type" content="text/html; charset=windows-1251">',
+           '<title>WinOrient 2011 - протокол результатов</title></head><body>']
+    for group in synthetic_race(groups, runners, controls, seed):
+        codes = ''.join(f'({c})' for c in group.codes)
+        out.append(f'<h2>{group.name} {controls} КП</h2>\n<pre>')
+        out.append(f'<b><u>№п/п Фамилия, имя        Коллектив       Результат Место {codes}</u></b>')
+        for n, runner in enumerate(group.runners, start=1):
+            cells = ' '.join(f'{clock(split)}({code})' for code, split in zip(group.codes, runner.splits) if split)
+            result = clock(runner.result) if runner.result else 'снят    '
+            name = f'{runner.surname} {runner.name}'
+            out.append(f'{n:<4} {name:<20} {runner.club:<15} {result}  {n if runner.result else "":>3}   {cells}')
+        out.append('</pre>')
+    out.append('</body></html>')
+    return '\n'.join(out).encode('windows-1251')
+
+
+def sportorg_protocol(groups: int, runners: int, controls: int, seed: int = 0) -> bytes:
+    """
+    SportOrg protocol: the race object embedded as `var race = {...}` in a <script>, times in milliseconds.
+    """
+    race = {'groups': [], 'courses': [], 'persons': [], 'results': []}
+    for g, group in enumerate(synthetic_race(groups, runners, controls, seed)):
+        race['groups'].append({'id': f'group-{g}', 'name': f'{group.name} Open'})
+        for n, runner in enumerate(group.runners):
+            person_id = f'person-{g}-{n}'
+            race['persons'].append({'id': person_id, 'group_id': f'group-{g}',
+                                    'surname': runner.surname, 'name': runner.name})
+            splits, total = [], 0
+            for code, split in zip(group.codes, runner.splits):
+                total += split * 1000
+                splits.append({'code': str(code), 'leg_time': split * 1000, 'relative_time': total})
+            finish = (runner.result or sum(runner.splits)) * 1000
+            race['results'].append({'person_id': person_id, 'result_msec': finish, 'splits': splits})
+    script = 'var race = ' + json.dumps(race, ensure_ascii=False) + ';'
+    return ('<html><head><meta charset="utf-8"><title>SportOrg - результаты</title></head><body>\n'
+            f'<div id="app"></div>\n<script>\n{script}\n</script>\n</body></html>').encode('utf-8')
+
+
+def iof_protocol(groups: int, runners: int, controls: int, seed: int = 0) -> bytes:
+    """
+    IOF XML 3.0 ResultList: a <ClassResult> per group, control times counted from the start in seconds.
+    """
+    out = ['<?xml version="1.0" encoding="UTF-8"?>',
+           '<ResultList xmlns="http://www.orienteering.org/datastandard/3.0" iofVersion="3.0" status="Complete">',
+           '<Event><Name>Синтетический старт</Name></Event>']
+    for g, group in enumerate(synthetic_race(groups, runners, controls, seed)):
+        out.append(f'<ClassResult><Class><Id>{g + 1}</Id><Name>{group.name}</Name></Class>')
+        for n, runner in enumerate(group.runners, start=1):
+            out.append(f'<PersonResult><Person><Id>{g * runners + n}</Id><Name><Family>{escape(runner.surname)}</Family>'
+                       f'<Given>{escape(runner.name)}</Given></Name></Person>'
+                       f'<Organisation><Name>{escape(runner.club)}</Name></Organisation><Result>')
+            total = sum(runner.splits)
+            if runner.result:
+                out.append(f'<Time>{total}</Time><Position>{n}</Position><Status>OK</Status>')
+            else:
+                out.append('<Status>MissingPunch</Status>')
+            total = 0
+            for code, split in zip(group.codes, runner.splits):
+                total += split
+                if split:
+                    out.append(f'<SplitTime><ControlCode>{code}</ControlCode><Time>{total}</Time></SplitTime>')
+                else:
+                    out.append(f'<SplitTime status="Missing"><ControlCode>{code}</ControlCode></SplitTime>')
+            out.append('</Result></PersonResult>')
+        out.append('</ClassResult>')
+    out.append('</ResultList>')
+    return '\n'.join(out).encode('utf-8')
+
+
+GENERATORS = {
+    'SFR': sfr_protocol,
+    'WinOrient': winorient_protocol,
+    'SportOrg': sportorg_protocol,
+    'IOF': iof_protocol,
+}
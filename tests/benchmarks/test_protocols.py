@@ -0,0 +1,32 @@
+import pytest
+
+from src.services.event.subservices.parser.src.detect import detect_system, SNIFF_SIZE, SPORTORG
+from src.services.event.subservices.parser.src.web_parse import parse_page
+from src.tests.benchmarks.protocols import GENERATORS, sfr_protocol, sportorg_protocol
+
+
+@pytest.mark.parametrize("system", list(GENERATORS))
+def test_protocol_is_parsed(system: str):
+    page = GENERATORS[system](groups=4, runners=10, controls=6)
+
+    assert detect_system(page) == system
+    event_df, courses = parse_page(page)
+
+    # Every runner is found, complete courses have the start, the controls and the finish
+    assert len(event_df) == 40
+    assert courses.notna().sum(axis=1).max() == 7
+
+
+def test_sfr_protocol_with_codes_in_rows():
+    event_df, courses = parse_page(sfr_protocol(groups=4, runners=10, controls=6, header_codes=False))
+
+    assert len(event_df) == 40
+
+
+def test_sportorg_race_after_long_head():
+    # A custom title and a head longer than the sniffed prefix leave only the `var race =` marker
+    page = sportorg_protocol(groups=2, runners=5, controls=4).replace('SportOrg'.encode(), b'Results')
+    page = page.replace(b'<div id="app">', b'<div id="app">' + b' ' * SNIFF_SIZE)
+
+    assert detect_system(page) == SPORTORG
+    assert len(parse_page(page)[0]) == 10
@@ -0,0 +1,20 @@
+from datetime import datetime
+from uuid import uuid4
+
+from src.database.event_checksum import event_checksum
+from src.schemas.event.event_schema import EventInDB, EventValidators
+
+
+def test_event_checksum_follows_content():
+    event = EventInDB(id=uuid4(), title="Event", source="source", count=1, status=True, splits="{}", results="{}",
+                      courses="{}", groups="{}", runners="{}", legs="{}", date=datetime(2024, 9, 15))
+
+    assert event_checksum(event) == event_checksum(event.model_copy(update={"id": uuid4(), "version": 2}))
+    assert event_checksum(event) != event_checksum(event.model_copy(update={"runners": '{"a": {}}'}))
+
+
+def test_event_validators_headers():
+    validators = EventValidators(version=1, checksum="abc", updated=datetime(2024, 9, 15, 12, 30, 5, 120))
+
+    assert validators.headers() == {"ETag": '"abc"', "Last-Modified": "Sun, 15 Sep 2024 12:30:05 GMT"}
+    assert EventValidators(version=1).headers() == {}
@@ -0,0 +1,22 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+from src.services.single_event_data.event_data_cache import EventDataCache
+
+
+def test_event_data_cache_checks_version_and_evicts_least_recently_used():
+    cache = EventDataCache(max_size=100)
+    first, second, third = uuid4(), uuid4(), uuid4()
+    cache.put(first, 1, SimpleNamespace(nbytes=40))
+    cache.put(second, 1, SimpleNamespace(nbytes=40))
+
+    assert cache.get(first, 1) is not None
+    assert cache.get(second, 2) is None  # changed since it was cached
+
+    cache.put(third, 1, SimpleNamespace(nbytes=40))
+
+    assert cache.get(second, 1) is None
+    assert cache.get(first, 1) is not None
+    cache.invalidate(first)
+    assert cache.get(first, 1) is None
+    assert cache.snapshot() == {"entries": 1, "size": 40, "max_size": 100, "hits": 2, "misses": 3, "evictions": 1}
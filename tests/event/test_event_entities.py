@@ -0,0 +1,23 @@
+import json
+from uuid import uuid4
+
+from src.database.event_entities import event_entity_rows
+
+
+def test_event_entity_rows():
+    event_id = uuid4()
+    group, course, runners, legs = str(uuid4()), str(uuid4()), [str(uuid4()) for _ in range(2)], [str(uuid4())]
+    rows = event_entity_rows(
+        event_id,
+        splits=json.dumps({legs[0]: {runners[0]: 65 * 10 ** 9, runners[1]: None}}),
+        results=json.dumps({runners[0]: {"0": 65 * 10 ** 9}, runners[1]: {"0": None}}),
+        courses=json.dumps({course: {"0": legs[0]}}),
+        groups=json.dumps({group: {"name": "М21"}}),
+        runners=json.dumps({r: {"name": "ИВАНОВ ИВАН", "group": group, "course": course} for r in runners}),
+        legs=json.dumps({legs[0]: {"start": 241, "end": 240}}),
+    )
+
+    assert [row["result"] for row in rows["runners"]] == [65, None]
+    assert all(row["event"] == event_id for row in rows["runners"] + rows["groups"] + rows["legs"])
+    # Missing splits get no row
+    assert [(str(row["runner"]), row["time"]) for row in rows["splits"]] == [(runners[0], 65)]
@@ -0,0 +1,146 @@
+import asyncio
+import json
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from src.schemas.event.event_schema import EventInDB
+from src.services.event.subservices.parser import parser as parser_module
+from src.services.event.subservices.parser.parser import Parser, parse_source
+from src.services.event.subservices.parser.protocol_cache import ProtocolCache
+from src.services.event.subservices.parser.src.group_blocks import GroupBlocks
+from src.services.event.subservices.parser.src.merge_entities import merge_event_entities, rekey_event_entities
+from src.tests.benchmarks.protocols import GENERATORS, sfr_protocol
+
+SOURCE = "http://example.com/protocol.html"
+
+
+def edited_protocol(system: str) -> (bytes, bytes, str):
+    """
+    Returns:
+        (bytes, bytes, str): A protocol, the same protocol with the second group taken from another race
+        and the name of that group.
+    """
+    page = GENERATORS[system](groups=4, runners=10, controls=5, seed=1)
+    other = GroupBlocks(GENERATORS[system](groups=4, runners=10, controls=5, seed=2))
+    blocks = GroupBlocks(page)
+    edited = list(blocks.blocks)[1]
+    blocks.blocks[edited] = other.blocks[edited]
+    return page, blocks.page(list(blocks.blocks)), edited
+
+
+def stored_event(page: bytes) -> EventInDB:
+    event = parse_source(page, "", SOURCE)
+    return EventInDB(id=uuid4(), title="Protocol", source=SOURCE, date=datetime(2024, 5, 1),
+                     **event.model_dump(exclude={"title", "source", "date"}))
+
+
+def runner_ids(event) -> dict:
+    groups = json.loads(event.groups)
+    return {(runner["name"], groups[runner["group"]]["name"]): _id for _id, runner in json.loads(event.runners).items()}
+
+
+def stored_view(event) -> dict:  # Runner courses with splits and results by natural keys
+    groups, legs, courses = json.loads(event.groups), json.loads(event.legs), json.loads(event.courses)
+    splits, results = json.loads(event.splits), json.loads(event.results)
+    return {
+        (runner["name"], groups[runner["group"]]["name"]): (
+            [(legs[leg]["start"], legs[leg]["end"], splits.get(leg, {}).get(_id))
+             for _, leg in sorted(courses[runner["course"]].items(), key=lambda item: int(item[0]))],
+            results[_id],
+        )
+        for _id, runner in json.loads(event.runners).items()
+    }
+
+
+def assert_refreshed(stored: EventInDB, merged, edited: str):
+    before, after = runner_ids(stored), runner_ids(merged)
+    # Runners of the untouched groups keep their IDs, the edited group is replaced by name
+    assert {key: _id for key, _id in after.items() if key[1] != edited} == \
+           {key: _id for key, _id in before.items() if key[1] != edited}
+    for key, _id in after.items():
+        if key[1] == edited:
+            assert _id == before[key] if key in before else _id not in before.values()
+    assert not {key for key in before if key[1] == edited} <= set(after)
+    assert merged.count == len(after)
+
+
+@pytest.mark.parametrize("system", list(GENERATORS))
+def test_group_blocks_page(system: str):
+    page = GENERATORS[system](groups=4, runners=10, controls=5)
+    blocks = GroupBlocks(page)
+    names = list(blocks.blocks)
+
+    assert blocks.system == system
+    assert len(names) == 4 and blocks.hashes() == GroupBlocks(page).hashes()
+    # A page with some of the groups is parsed as usual
+    part = stored_event(blocks.page(names[:2]))
+    assert {group["name"] for group in json.loads(part.groups).values()} == set(names[:2])
+    assert part.count == 20
+
+
+@pytest.mark.parametrize("system", list(GENERATORS))
+def test_merge_event_entities(system: str):
+    page, edited_page, edited = edited_protocol(system)
+    stored = stored_event(page)
+    blocks, old_hashes = GroupBlocks(edited_page), GroupBlocks(page).hashes()
+    changed = [name for name, content_hash in blocks.hashes().items() if old_hashes[name] != content_hash]
+    assert changed == [edited]
+
+    merged = merge_event_entities(stored, parse_source(blocks.page(changed), "", SOURCE), changed)
+
+    assert_refreshed(stored, merged, edited)
+    # The merged event carries the same results as a full parse of the new page
+    full = parse_source(edited_page, "", SOURCE)
+    results = {key: json.loads(merged.results)[_id] for key, _id in runner_ids(merged).items()}
+    assert results == {key: json.loads(full.results)[_id] for key, _id in runner_ids(full).items()}
+    used_legs = {leg for points in json.loads(merged.courses).values() for leg in points.values()}
+    assert set(json.loads(merged.legs)) == used_legs
+
+
+def test_merge_removed_group():
+    stored = stored_event(sfr_protocol(groups=4, runners=10, controls=5))
+    removed = json.loads(stored.groups)[json.loads(stored.runners)[next(iter(json.loads(stored.runners)))]["group"]]
+
+    merged = merge_event_entities(stored, None, [removed["name"]])
+
+    assert {key[1] for key in runner_ids(merged)} == {key[1] for key in runner_ids(stored)} - {removed["name"]}
+    assert merged.count == 30
+
+
+def test_rekey_event_entities():
+    event = parse_source(sfr_protocol(groups=4, runners=10, controls=5), "", SOURCE)
+
+    rekeyed = rekey_event_entities(event)
+
+    ids = {key: set(json.loads(getattr(event, key))) for key in ("groups", "runners", "courses", "legs")}
+    new_ids = {key: set(json.loads(getattr(rekeyed, key))) for key in ids}
+    assert all(len(new_ids[key]) == len(ids[key]) and not new_ids[key] & ids[key] for key in ids)
+    # The same runners, courses and splits under the new IDs
+    assert stored_view(rekeyed) == stored_view(event)
+
+
+def test_parser_refresh(monkeypatch, tmp_path):
+    page, edited_page, edited = edited_protocol("SFR")
+    cache = ProtocolCache(tmp_path, max_size=10 ** 8)
+    cache.store_page(SOURCE, page, "text/html")
+    pages = iter([edited_page, edited_page])
+
+    async def get_source(link: str):
+        return next(pages), "text/html"
+
+    async def run_in_pool(func, *args):
+        return func(*args)
+
+    monkeypatch.setattr(parser_module, "protocol_cache", cache)
+    monkeypatch.setattr(parser_module, "get_source", get_source)
+    monkeypatch.setattr(Parser, "run_in_pool", staticmethod(run_in_pool))
+    stored = stored_event(page)
+
+    merged = asyncio.run(Parser().refresh(stored))
+
+    assert_refreshed(stored, merged, edited)
+    # The fetched page is the base of the next refresh, so the same page is not merged again
+    assert cache.load_page(SOURCE)[2] == cache.content_hash(edited_page)
+    assert asyncio.run(Parser().refresh(EventInDB(id=stored.id, **merged.model_dump()))) is None
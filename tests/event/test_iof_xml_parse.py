@@ -0,0 +1,60 @@
+import logging
+
+import pandas as pd
+
+from src.services.event.subservices.parser.src.punching_systems.IOF_XML_parse import IOF_parsing, MISSING_RESULT
+
+RESULT_LIST = '''<?xml version="1.0" encoding="UTF-8"?>
+<ResultList xmlns="http://www.orienteering.org/datastandard/3.0" iofVersion="3.0" status="Complete">
+  <Event><Name>Test</Name></Event>
+  <ClassResult>
+    <Class><Name>M21  Elite</Name></Class>
+    <PersonResult>
+      <Person><Name><Family>Иванов</Family><Given>Иван</Given></Name></Person>
+      <Result>
+        <Time>400</Time><Status>OK</Status>
+        <SplitTime><ControlCode>31</ControlCode><Time>100</Time></SplitTime>
+        <SplitTime status="Additional"><ControlCode>99</ControlCode><Time>180</Time></SplitTime>
+        <SplitTime><ControlCode>32</ControlCode><Time>250</Time></SplitTime>
+      </Result>
+    </PersonResult>
+    <PersonResult>
+      <Person><Name><Family>Петров</Family><Given>Пётр</Given></Name></Person>
+      <Result>
+        <Status>MissingPunch</Status>
+        <SplitTime status="Missing"><ControlCode>31</ControlCode></SplitTime>
+        <SplitTime><ControlCode>32</ControlCode><Time>300</Time></SplitTime>
+      </Result>
+    </PersonResult>
+    <PersonResult>
+      <Person><Name><Family>Сидоров</Family><Given>Олег</Given></Name></Person>
+      <Result><Status>DidNotStart</Status></Result>
+    </PersonResult>
+    <PersonResult>
+      <Person><Name><Family>Козлов</Family><Given>Илья</Given></Name></Person>
+      <Result>
+        <Time>500</Time><Status>OK</Status>
+        <SplitTime><ControlCode>K1</ControlCode><Time>100</Time></SplitTime>
+      </Result>
+    </PersonResult>
+  </ClassResult>
+</ResultList>'''.encode()
+
+
+def test_iof_result_list(caplog):
+    with caplog.at_level(logging.WARNING):
+        event_df, courses = IOF_parsing(RESULT_LIST)
+
+    # Non-started runners are skipped, a runner with a broken control code is logged and skipped
+    assert list(event_df.index) == ['ИВАНОВ ИВАН^M21 ELITE', 'ПЕТРОВ ПЁТР^M21 ELITE']
+    assert 'M21 Elite' in caplog.text
+
+    # Additional punches are not legs of the course
+    legs = [(241, 31), (31, 32), (32, 240)]
+    assert courses.loc['ИВАНОВ ИВАН^M21 ELITE', legs].tolist() == [0, 1, 2]
+    assert event_df.loc['ИВАНОВ ИВАН^M21 ELITE', legs + ['RES']].tolist() == \
+           [pd.Timedelta(seconds=s) for s in (100, 150, 150, 400)]
+
+    # Legs around a missing punch and the finish leg of a runner without a result are missing
+    assert event_df.loc['ПЕТРОВ ПЁТР^M21 ELITE', legs].isna().all()
+    assert event_df.loc['ПЕТРОВ ПЁТР^M21 ELITE', 'RES'] == pd.Timedelta(seconds=MISSING_RESULT)
@@ -0,0 +1,65 @@
+import json
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from pydantic import TypeAdapter
+
+from src.database.split_matrix import encode_split_matrix
+from src.schemas.event.event_schema import EventInDB
+from src.schemas.single_event_data.single_event_data_schema import EventOutput, RunnerOutput
+from src.services.single_event_data.single_event_data_service import SingleEventDataService
+
+
+def make_event():
+    groups = {str(uuid4()): {"name": name} for name in ("M21", "W21")}
+    legs = {str(uuid4()): {"start": 0, "end": n} for n in (31, 32)}
+    leg_ids, group_ids = list(legs), list(groups)
+    courses = {str(uuid4()): {"1": leg_ids[0], "2": leg_ids[1]}, str(uuid4()): {"1": leg_ids[1]}}
+    course_ids = list(courses)
+    members = [(group_ids[0], course_ids[0]), (group_ids[0], course_ids[1]), (group_ids[1], course_ids[0])]
+    runners = {str(uuid4()): {"name": "Ivanov Ivan", "group": group, "course": course} for group, course in members}
+    runner_ids = list(runners)
+    splits = {leg: {runner: 60 * 10 ** 9 for runner in runners} for leg in legs}
+    results = {runner: {"0": 120 * 10 ** 9} for runner in runners}
+    event = EventInDB(id=uuid4(), title="Event", source="source", count=3, status=True,
+                      splits=json.dumps(splits), results=json.dumps(results), courses=json.dumps(courses),
+                      groups=json.dumps(groups), runners=json.dumps(runners), legs=json.dumps(legs),
+                      split_matrix=encode_split_matrix(splits, results))
+    return event, group_ids, course_ids, runner_ids, leg_ids
+
+
+def test_membership_indexes():
+    event, group_ids, course_ids, runner_ids, leg_ids = make_event()
+
+    service = SingleEventDataService(event)
+
+    assert service.group_runners == {group_ids[0]: runner_ids[:2], group_ids[1]: runner_ids[2:]}
+    assert service.course_group_runners[(course_ids[1], group_ids[0])] == [runner_ids[1]]
+    assert service.group_courses == {group_ids[0]: course_ids, group_ids[1]: course_ids[:1]}
+    assert service.leg_courses == {leg_ids[0]: course_ids[:1], leg_ids[1]: course_ids}
+    assert [str(i) for i in service.get_group(group_ids[0]).runners] == runner_ids[:2]
+
+
+def test_json_fragments_match_the_models():
+    service = SingleEventDataService(make_event()[0])
+
+    for nesting_level in range(4):
+        expected = TypeAdapter(EventOutput).dump_json(service.get_event(nesting_level))
+        assert service.get_event_json(nesting_level) == expected
+        assert service.get_event_json(nesting_level) == expected  # from the cached fragments
+    assert service.fragments_size == sum(map(len, service.fragments.values()))
+
+
+def test_pages_and_fields():
+    event, group_ids, course_ids, runner_ids, leg_ids = make_event()
+    service = SingleEventDataService(event)
+
+    first, cursor = service.get_page("runners", limit=2)
+    last, next_cursor = service.get_page("runners", limit=2, cursor=cursor)
+    fields = service.parse_fields(RunnerOutput, "name,id")
+
+    assert first + last == runner_ids and next_cursor is None
+    assert json.loads(service.get_runners_json(1, last, fields)) == [{"id": runner_ids[2], "name": "Ivan"}]
+    with pytest.raises(HTTPException):
+        service.parse_fields(RunnerOutput, "id,points")
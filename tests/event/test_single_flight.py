@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from src.services.event.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_run():
+    flights, calls = SingleFlight(), []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    async def main():
+        return await asyncio.gather(*[flights.run("link", work) for _ in range(5)])
+
+    assert asyncio.run(main()) == [1] * 5
+    assert not flights.calls
+
+
+def test_waiters_get_the_exception():
+    flights = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("Can't parse")
+
+    async def main():
+        return await asyncio.gather(*[flights.run("link", work) for _ in range(3)], return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in asyncio.run(main()))
+
+
+def test_waiter_takes_over_a_cancelled_call():
+    flights = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.01)
+        return "done"
+
+    async def main():
+        first = asyncio.create_task(flights.run("link", work))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(flights.run("link", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "done"
@@ -0,0 +1,38 @@
+import json
+from uuid import uuid4
+
+import numpy as np
+import pandas as pd
+
+from src.database.split_matrix import encode_split_matrix, decode_split_matrix, seconds_frames, \
+    MISSING
+
+
+def test_split_matrix_round_trip():
+    runners = [str(uuid4()) for _ in range(3)]
+    legs = [str(uuid4()) for _ in range(2)]
+    splits = {
+        legs[0]: {runners[0]: 65 * 10 ** 9, runners[1]: 70 * 10 ** 9, runners[2]: None},
+        legs[1]: {runners[0]: 120 * 10 ** 9},
+    }
+    results = {runners[0]: {"0": 185 * 10 ** 9}, runners[1]: {"0": None}, runners[2]: {"0": None}}
+
+    matrix = decode_split_matrix(encode_split_matrix(json.dumps(splits), json.dumps(results)))
+
+    assert matrix.runners == runners
+    assert matrix.legs == legs
+    assert matrix.splits.tolist() == [[65, 120], [70, MISSING], [MISSING, MISSING]]
+    assert matrix.results.tolist() == [185, MISSING, MISSING]
+    # Decoded arrays are views of the stored bytes
+    assert not matrix.splits.flags.owndata
+    # Statistics frames mask missing values over the same memory
+    splits, results = seconds_frames(matrix)
+    assert splits.loc[runners[1], legs[1]] is pd.NA and results.isna().tolist() == [False, True, True]
+    assert np.shares_memory(splits[legs[0]].array._data, matrix.splits)
+
+
+def test_empty_split_matrix():
+    matrix = decode_split_matrix(encode_split_matrix("{}", "{}"))
+
+    assert matrix.runners == [] and matrix.legs == []
+    assert matrix.splits.shape == (0, 0)
@@ -0,0 +1,10 @@
+from sqlalchemy import select
+from sqlalchemy.orm import undefer
+
+from src.database.models.track.track import Track
+
+
+def test_track_points_are_deferred():
+    assert 'tracks.points,' not in str(select(Track))
+    assert 'tracks.points_count' in str(select(Track))
+    assert 'tracks.points,' in str(select(Track).options(undefer(Track.points)))
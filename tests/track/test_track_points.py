@@ -0,0 +1,20 @@
+from datetime import datetime, timezone
+
+import numpy as np
+
+from src.database.track_points import encode_track_points, decode_track_points, track_points_count
+
+
+def test_track_points_round_trip():
+    lat = np.array([55.7512345, 55.7512401, 55.7512999])
+    lon = np.array([37.6171234, 37.6170001, 37.6169876])
+    ele = np.array([151.2, 151.25, 150.0])
+    data = encode_track_points(datetime(2024, 9, 15, 9, 50), 1, lat, lon, ele)
+
+    points = decode_track_points(data)
+
+    assert track_points_count(data) == 3
+    assert points.start == datetime(2024, 9, 15, 9, 50, tzinfo=timezone.utc)
+    assert points.times()[-1] == np.datetime64('2024-09-15T09:50:02')
+    assert np.allclose(points.lat, lat, atol=1e-7) and np.allclose(points.lon, lon, atol=1e-7)
+    assert np.allclose(points.ele, ele, atol=1e-2)